@@ -0,0 +1,315 @@
+"""
+Benchmark the dqcheck checks, fixers and report rendering.
+
+Each check, run_all_checks, every fixer method and both report writers
+are timed on synthetic datasets along two scaling curves -- rows at a
+fixed width and columns at a fixed height -- and the timings are written
+as JSON, so runs from different commits can be compared:
+
+    python benchmarks/run.py --preset quick --output before.json
+    python benchmarks/run.py --preset quick --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from dqcheck import checks  # noqa: E402
+from dqcheck.analyzer import run_all_checks  # noqa: E402
+from dqcheck.pipeline import METHODS, apply_step  # noqa: E402
+from dqcheck.report import save_html_report, save_json_report  # noqa: E402
+from synthetic import DatasetSpec, make_dataset  # noqa: E402
+
+SUITES = ("checks", "analysis", "fixers", "reports")
+
+# (rows curve at `width` columns, columns curve at `height` rows)
+PRESETS = {
+    "quick": {"rows": [1_000, 10_000, 100_000], "width": 10,
+              "columns": [10, 100], "height": 10_000},
+    "standard": {"rows": [10_000, 100_000, 1_000_000], "width": 20,
+                 "columns": [10, 100, 1_000], "height": 10_000},
+    # Needs a large machine: the 100M-row frame alone is tens of GB.
+    "full": {"rows": [1_000_000, 10_000_000, 100_000_000], "width": 20,
+             "columns": [100, 1_000, 10_000], "height": 100_000},
+}
+
+
+# -----------------------------
+# TIMING
+# -----------------------------
+
+def _time(fn, repeat):
+    """Wall-clock seconds of each of `repeat` calls to fn()."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _result(suite, name, df, times):
+    best = min(times)
+    return {
+        "suite": suite,
+        "name": name,
+        "rows": len(df),
+        "columns": df.shape[1],
+        "best": round(best, 6),
+        "median": round(statistics.median(times), 6),
+        "repeat": len(times),
+        "rows_per_sec": round(len(df) / best) if best else None,
+    }
+
+
+def _columns_of(df, prefix):
+    return [col for col in df.columns if col.startswith(prefix)]
+
+
+def fix_cases(df):
+    """(issue, method, value) for every fixer method, with values that fit df."""
+    floats = _columns_of(df, "float_") or list(df.select_dtypes(include=np.number).columns)
+    ints = _columns_of(df, "int_")
+    cats = _columns_of(df, "category_") or list(df.select_dtypes(include="object").columns)
+    values = {
+        ("missing_values", "constant"): 0,
+        ("outliers", "clip_percentile"): "0.01,0.99",
+        ("high_cardinality", "group_rare"): 20,
+        ("high_cardinality", "hashing"): 16,
+        ("high_cardinality", "hashing_sparse"): 16,
+    }
+    if floats:
+        col = floats[0]
+        values.update({
+            ("errors", "range_clip"): f"{col}:50:150",
+            ("errors", "drop_invalid"): f"{col}:0",
+        })
+    if ints:
+        values[("errors", "cast_type")] = f"{ints[0]}:int"
+    if cats:
+        col = cats[0]
+        values.update({
+            ("errors", "standardize_text"): col,
+            ("errors", "replace_map"): f"{col}:cat_0=zero,cat_1=one",
+            ("errors", "regex_clean"): f"{col}:_",
+        })
+
+    cases = []
+    for issue, methods in METHODS.items():
+        for method in methods:
+            if issue == "errors" and (issue, method) not in values:
+                continue
+            cases.append((issue, method, values.get((issue, method))))
+    return cases
+
+
+# -----------------------------
+# SUITES
+# -----------------------------
+
+def bench_checks(df, target, repeat):
+    cases = {
+        "check_missing_values": lambda: checks.check_missing_values(df),
+        "check_duplicate_rows": lambda: checks.check_duplicate_rows(df),
+        "check_constant_columns": lambda: checks.check_constant_columns(df),
+        "check_outliers_iqr": lambda: checks.check_outliers_iqr(df),
+        "check_high_cardinality": lambda: checks.check_high_cardinality(df),
+        "check_class_imbalance": lambda: checks.check_class_imbalance(df, target),
+    }
+    return [_result("checks", name, df, _time(fn, repeat)) for name, fn in cases.items()]
+
+
+def bench_analysis(df, target, repeat):
+    return [_result("analysis", "run_all_checks", df,
+                    _time(lambda: run_all_checks(df, target=target), repeat))]
+
+
+def bench_fixers(df, target, repeat):
+    results = []
+    for issue, method, value in fix_cases(df):
+        step = {"issue": issue, "method": method, "value": value}
+        name = f"{issue}.{method}"
+        try:
+            times = _time(lambda: apply_step(df, step, target=target), repeat)
+        except Exception as e:
+            results.append({"suite": "fixers", "name": name, "rows": len(df),
+                            "columns": df.shape[1], "error": f"{type(e).__name__}: {e}"})
+            continue
+        results.append(_result("fixers", name, df, times))
+    return results
+
+
+def bench_reports(df, target, repeat):
+    report = run_all_checks(df, target=target)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "report.json")
+        html_path = os.path.join(tmp, "report.html")
+        return [
+            _result("reports", "save_json_report", df,
+                    _time(lambda: save_json_report(report, json_path), repeat)),
+            _result("reports", "save_html_report", df,
+                    _time(lambda: save_html_report(report, html_path), repeat)),
+        ]
+
+
+BENCHES = {
+    "checks": bench_checks,
+    "analysis": bench_analysis,
+    "fixers": bench_fixers,
+    "reports": bench_reports,
+}
+
+
+# -----------------------------
+# RUNNER
+# -----------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def points(preset, rows=None, columns=None):
+    """(curve, rows, columns) for each dataset to benchmark, deduplicated."""
+    grid = PRESETS[preset]
+    seen = []
+    for n in rows or grid["rows"]:
+        seen.append(("rows", n, grid["width"]))
+    for c in columns or grid["columns"]:
+        seen.append(("columns", grid["height"], c))
+    unique = []
+    for point in seen:
+        if point[1:] not in [p[1:] for p in unique]:
+            unique.append(point)
+    return unique
+
+
+def run(args):
+    suites = SUITES if args.suites == "all" else args.suites.split(",")
+    results = []
+    for curve, n_rows, n_cols in points(args.preset, args.rows, args.columns):
+        spec = DatasetSpec(
+            rows=n_rows, columns=n_cols, missing_rate=args.missing_rate,
+            outlier_rate=args.outlier_rate, cardinality=args.cardinality,
+            duplicate_rate=args.duplicate_rate, seed=args.seed,
+        )
+        start = time.perf_counter()
+        df = make_dataset(spec)
+        print(f"{curve:>7} curve: {n_rows:,} rows x {df.shape[1]:,} columns "
+              f"(generated in {time.perf_counter() - start:.1f}s)", file=sys.stderr)
+        for suite in suites:
+            for result in BENCHES[suite](df, "label", args.repeat):
+                result["curve"] = curve
+                results.append(result)
+                if "error" in result:
+                    print(f"    {result['name']}: {result['error']}", file=sys.stderr)
+                else:
+                    print(f"    {result['name']:<40} {result['best']:>10.4f}s", file=sys.stderr)
+        del df
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "preset": args.preset,
+            "repeat": args.repeat,
+            "dataset": {
+                "missing_rate": args.missing_rate,
+                "outlier_rate": args.outlier_rate,
+                "cardinality": args.cardinality,
+                "duplicate_rate": args.duplicate_rate,
+                "seed": args.seed,
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print best-time ratios against a baseline run; returns the regressions."""
+    def key(r):
+        return r["suite"], r["name"], r["rows"], r["columns"]
+
+    before = {key(r): r for r in baseline["results"] if "best" in r}
+    regressions = []
+    for r in current["results"]:
+        old = before.get(key(r))
+        if old is None or "best" not in r or not old["best"]:
+            continue
+        ratio = r["best"] / old["best"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{r['name']:<40} {r['rows']:>11,} x {r['columns']:<6,} "
+              f"{old['best']:>9.4f}s -> {r['best']:>9.4f}s  x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+
+def _int_list(value):
+    return [int(float(v)) for v in value.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=PRESETS, default="quick")
+    parser.add_argument("--rows", type=_int_list, help="Row counts for the rows curve, e.g. 1e4,1e5")
+    parser.add_argument("--columns", type=_int_list, help="Column counts for the columns curve")
+    parser.add_argument("--suites", default="all", help=f"Comma-separated subset of {', '.join(SUITES)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--outlier-rate", type=float, default=0.01)
+    parser.add_argument("--cardinality", type=int, default=100)
+    parser.add_argument("--duplicate-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio reported as a regression (with --compare)")
+    args = parser.parse_args(argv)
+
+    if args.suites != "all":
+        unknown = set(args.suites.split(",")) - set(SUITES)
+        if unknown:
+            parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = run(args)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Benchmark dqcheck command startup.
+
+Each case runs the CLI in a fresh interpreter, as a batch job does, and
+records its wall time and the heavy modules (pandas, numpy, pyarrow,
+jinja2, yaml) it imported.  A case importing a module it must not --
+pandas for `dqcheck -h`, jinja2 for a JSON-only analyze -- fails the run,
+and so does a slowdown against an earlier run:
+
+    python benchmarks/startup.py --output before.json
+    python benchmarks/startup.py --output after.json --compare before.json
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("pandas", "numpy", "pyarrow", "jinja2", "yaml")
+
+# (name, dqcheck arguments, heavy modules the case must not import);
+# {data} is a small CSV written for the run.
+CASES = [
+    ("help", ["-h"], HEAVY),
+    ("analyze_help", ["analyze", "-h"], HEAVY),
+    ("fix_help", ["fix", "-h"], HEAVY),
+    ("serve_help", ["serve", "-h"], HEAVY),
+    ("usage_error", ["fix", "{data}"], HEAVY),
+    ("analyze_json", ["analyze", "{data}", "--no-cache"], ("jinja2", "yaml")),
+    ("fix", ["fix", "{data}", "--issue=missing_values", "--method=median", "--no-cache"],
+     ("jinja2", "yaml")),
+]
+
+LAUNCHER = "import sys; from dqcheck.cli import cli; sys.argv[0] = 'dqcheck'; cli()"
+
+
+# -----------------------------
+# MEASUREMENT
+# -----------------------------
+
+def _write_data(path, rows=100):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "amount", "label"])
+        for i in range(rows):
+            writer.writerow([i, "" if i % 10 == 0 else i * 1.5, i % 2])
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    return env
+
+
+def _time(argv, cwd, repeat):
+    """Wall-clock seconds of each of `repeat` runs of argv."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=cwd, env=_env(),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _imported(args, cwd):
+    """Top-level packages one run imports, from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LAUNCHER, *args], cwd=cwd, env=_env(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    names = re.findall(r"^import time:\s+\d+ \|\s+\d+ \|\s*([\w.]+)", proc.stderr, re.M)
+    return {name.split(".")[0] for name in names}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data = os.path.join(tmp, "data.csv")
+        _write_data(data)
+        # The floor every case pays: a bare interpreter.
+        interpreter = min(_time([sys.executable, "-c", "pass"], tmp, repeat))
+
+        for name, args, forbidden in CASES:
+            args = [arg.format(data=data) for arg in args]
+            times = _time([sys.executable, "-c", LAUNCHER, *args], tmp, repeat)
+            heavy = sorted(_imported(args, tmp) & set(HEAVY))
+            unexpected = [module for module in heavy if module in forbidden]
+            results.append({
+                "name": name,
+                "best_ms": round(min(times) * 1000, 1),
+                "median_ms": round(statistics.median(times) * 1000, 1),
+                "repeat": repeat,
+                "heavy_imports": heavy,
+                "unexpected_imports": unexpected,
+            })
+            flag = f"  imports {', '.join(unexpected)}" if unexpected else ""
+            print(f"    {name:<16} {min(times) * 1000:>8.1f} ms{flag}", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "interpreter_ms": round(interpreter * 1000, 1),
+        },
+        "results": results,
+    }
+
+
+# -----------------------------
+# RUNNER
+# -----------------------------
+
+def compare(current, baseline, threshold):
+    """Print best-time ratios against a baseline run; returns the regressions."""
+    before = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = before.get(r["name"])
+        if old is None or not old["best_ms"]:
+            continue
+        ratio = r["best_ms"] / old["best_ms"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{r['name']:<16} {old['best_ms']:>8.1f} ms -> {r['best_ms']:>8.1f} ms  "
+              f"x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", default="startup_results.json")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio reported as a regression (with --compare)")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    failed = any(r["unexpected_imports"] for r in results["results"])
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Synthetic datasets for the dqcheck benchmarks.
+
+Every property the checks and fixers are sensitive to is a parameter:
+size, dtype mix, missing and outlier rates, categorical cardinality and
+the share of duplicated rows.  Generation is vectorized and seeded, so
+the same spec always yields the same frame.
+"""
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import pandas as pd
+
+DTYPES = ("float", "int", "category", "id", "bool")
+
+
+@dataclass
+class DatasetSpec:
+    rows: int = 10_000
+    columns: int = 10
+    # Relative weights of each column kind; ids are unique text ("...id")
+    # and category columns draw from `cardinality` distinct strings.
+    dtype_mix: dict = field(default_factory=lambda: {
+        "float": 0.4, "int": 0.2, "category": 0.3, "id": 0.05, "bool": 0.05,
+    })
+    missing_rate: float = 0.05
+    outlier_rate: float = 0.01
+    cardinality: int = 100
+    duplicate_rate: float = 0.02
+    target: bool = True
+    seed: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _column_kinds(spec):
+    kinds = [kind for kind in DTYPES if spec.dtype_mix.get(kind, 0) > 0]
+    weights = np.array([spec.dtype_mix[kind] for kind in kinds], dtype="float64")
+    counts = np.floor(weights / weights.sum() * spec.columns).astype(int)
+    # hand out the rounding remainder to the largest weights
+    for i in np.argsort(-weights)[:spec.columns - counts.sum()]:
+        counts[i] += 1
+    return [kind for kind, n in zip(kinds, counts) for _ in range(n)]
+
+
+def _column(kind, n, spec, rng):
+    if kind == "float":
+        values = rng.normal(100, 15, n)
+        outliers = rng.random(n) < spec.outlier_rate
+        values[outliers] += rng.choice([-1, 1], outliers.sum()) * rng.uniform(10, 50, outliers.sum()) * 15
+        return values
+    if kind == "int":
+        values = rng.integers(0, 1000, n)
+        outliers = rng.random(n) < spec.outlier_rate
+        values[outliers] = rng.integers(10_000, 100_000, outliers.sum())
+        return values
+    if kind == "category":
+        labels = np.array([f"cat_{i}" for i in range(spec.cardinality)], dtype=object)
+        return labels[rng.integers(0, spec.cardinality, n)]
+    if kind == "id":
+        return np.array([f"row_{i}" for i in rng.permutation(n)], dtype=object)
+    return rng.random(n) < 0.5
+
+
+def make_dataset(spec: DatasetSpec) -> pd.DataFrame:
+    rng = np.random.default_rng(spec.seed)
+    n_dup = int(spec.rows * spec.duplicate_rate)
+    n = spec.rows - n_dup
+
+    data = {}
+    for i, kind in enumerate(_column_kinds(spec)):
+        name = f"{kind}_{i}id" if kind == "id" else f"{kind}_{i}"
+        values = _column(kind, n, spec, rng)
+        if spec.missing_rate and kind not in ("bool", "id"):
+            missing = rng.random(n) < spec.missing_rate
+            values = values.astype("float64" if kind == "int" else values.dtype)
+            values[missing] = np.nan if kind != "category" else None
+        data[name] = values
+    if spec.target:
+        data["label"] = (rng.random(n) < 0.3).astype("int64")
+    df = pd.DataFrame(data)
+
+    if n_dup:
+        df = pd.concat([df, df.iloc[rng.integers(0, n, n_dup)]], ignore_index=True)
+    return df
@@ -0,0 +1,487 @@
+from collections import Counter
+
+import pandas as pd
+import numpy as np
+
+from dqcheck import checks
+from dqcheck.blanks import missing_mask
+from dqcheck.duplicates import FingerprintCounter
+from dqcheck.sketches import HyperLogLog, QuantileSketch, weighted_quantile
+
+# -----------------------------
+# CHUNK ACCUMULATORS
+# -----------------------------
+# Every check in dqcheck.checks has a mergeable counterpart here.  An
+# accumulator is fed one chunk at a time with update(), two accumulators
+# built over different partitions combine with merge(), and issues()
+# returns exactly what the in-memory check would return for the
+# concatenated data.
+#
+# Exact state is bounded per column: once a column holds more than
+# EXACT_LIMIT distinct values, its value counts are folded into a
+# QuantileSketch and its distinct values into a HyperLogLog sketch, and
+# the issues built from them are labelled approximate.  Pass
+# exact_limit=None to keep everything exact whatever it costs.
+
+EXACT_LIMIT = 1 << 20
+FALLBACK_QUANTILE_ERROR = 0.01
+FALLBACK_HLL_PRECISION = 14
+
+
+def _is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+class _CompactingBuffer:
+    """
+    Holds per-chunk partial states and folds them together once the
+    backlog grows past the size of the last compacted state, so merging
+    stays amortized linear in the number of distinct values.
+    """
+
+    def __init__(self, fold):
+        self.fold = fold
+        self.state = None
+        self.pending = []
+        self.pending_size = 0
+
+    def add(self, part):
+        self.pending.append(part)
+        self.pending_size += len(part)
+        base = len(self.state) if self.state is not None else 0
+        if self.pending_size > max(base, 1 << 16):
+            self.compact()
+
+    def size_bound(self):
+        """Upper bound on the compacted size."""
+        return (len(self.state) if self.state is not None else 0) + self.pending_size
+
+    def compact(self):
+        parts = self.pending if self.state is None else [self.state] + self.pending
+        if parts:
+            self.state = self.fold(parts)
+        self.pending = []
+        self.pending_size = 0
+        return self.state
+
+
+def _fold_counts(parts):
+    return pd.concat(parts).groupby(level=0, sort=False).sum()
+
+
+def _fold_uniques(parts):
+    return pd.unique(np.concatenate([np.asarray(p, dtype=object) for p in parts]))
+
+
+class MissingAccumulator:
+    """Null and blank-string counts per column."""
+
+    def __init__(self):
+        self.rows = 0
+        self.missing = {}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            count = int(missing_mask(chunk[col]).sum())
+            self.missing[col] = self.missing.get(col, 0) + count
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        for col, count in other.missing.items():
+            self.missing[col] = self.missing.get(col, 0) + count
+        return self
+
+    def issues(self):
+        results = []
+        for col, count in self.missing.items():
+            missing_pct = count / self.rows * 100 if self.rows else 0
+            issue = checks.missing_issue(col, missing_pct)
+            if issue:
+                results.append(issue)
+        return results
+
+
+class DuplicateAccumulator:
+    """
+    Distinct row fingerprints; duplicates = rows - distinct.  With a
+    spill_dir, fingerprints are partitioned to disk instead of memory.
+    """
+
+    def __init__(self, spill_dir=None, top=0):
+        self.top = top
+        self.counter = FingerprintCounter(spill_dir=spill_dir)
+
+    @property
+    def rows(self):
+        return self.counter.rows
+
+    def update(self, chunk):
+        self.counter.update(chunk)
+        return self
+
+    def merge(self, other):
+        self.counter.merge(other.counter)
+        return self
+
+    def issues(self):
+        dup_count, top_duplicates = self.counter.result(top=self.top)
+        return checks.duplicate_issue(dup_count, top_duplicates=top_duplicates)
+
+    def close(self):
+        self.counter.close()
+
+
+class DistinctAccumulator:
+    """
+    Distinct values per column.  With a limit, a column stops tracking
+    values once it has seen more than `limit` of them, which is all the
+    constant-column check needs to know.
+
+    With hll_precision set as well, every value also feeds a HyperLogLog
+    sketch, so a column past the limit still has a (bounded-memory)
+    estimate of its distinct count.  A column past exact_limit likewise
+    switches to a sketch, seeded with the values it held.
+    """
+
+    def __init__(self, dropna=True, limit=None, hll_precision=None, exact_limit=EXACT_LIMIT):
+        self.dropna = dropna
+        self.limit = limit
+        self.hll_precision = hll_precision
+        self.exact_limit = exact_limit
+        self.values = {}
+        self.sketches = {}
+        self.saturated = set()
+
+    def _cutoff(self):
+        bounds = [bound for bound in (self.limit, self.exact_limit) if bound is not None]
+        return min(bounds) if bounds else None
+
+    def saturate(self, col, sketch=False):
+        buf = self.values.get(col)
+        if sketch and col not in self.sketches:
+            self.sketches[col] = HyperLogLog(self.hll_precision or FALLBACK_HLL_PRECISION)
+            state = buf.compact() if buf is not None else None
+            if state is not None:
+                self.sketches[col].update(state)
+        self.saturated.add(col)
+        self.values[col] = None
+
+    def track(self, col, values):
+        if self.hll_precision and col not in self.sketches:
+            self.sketches[col] = HyperLogLog(self.hll_precision)
+        if col in self.sketches:
+            self.sketches[col].update(values)
+        if col in self.saturated:
+            return
+        if col not in self.values:
+            self.values[col] = _CompactingBuffer(_fold_uniques)
+        self.values[col].add(values)
+        cutoff = self._cutoff()
+        if cutoff is not None and self.values[col].size_bound() > cutoff:
+            state = self.values[col].compact()
+            if len(state) > cutoff:
+                # Past `limit` only a sketch the caller asked for is kept;
+                # past exact_limit alone the count must come from a sketch.
+                past_limit = self.limit is not None and len(state) > self.limit
+                self.saturate(col, sketch=bool(self.hll_precision) or not past_limit)
+
+    def update(self, chunk, columns=None):
+        for col in (chunk.columns if columns is None else columns):
+            series = chunk[col]
+            if self.dropna:
+                series = series.dropna()
+            self.track(col, series.unique())
+        return self
+
+    def merge(self, other):
+        for col, buf in other.values.items():
+            sketch = other.sketches.get(col)
+            if col in other.saturated:
+                self.saturate(col, sketch=sketch is not None)
+            if sketch is not None:
+                if col in self.sketches:
+                    self.sketches[col].merge(sketch)
+                else:
+                    self.sketches[col] = HyperLogLog(sketch.precision).merge(sketch)
+            state = buf.compact() if buf is not None else None
+            if state is not None:
+                # Re-adding values other's sketch already holds is harmless.
+                self.track(col, state)
+        return self
+
+    def is_estimate(self, col):
+        """True when count(col) is a sketch estimate or lower bound, not exact."""
+        return col in self.saturated
+
+    def count(self, col):
+        if col in self.saturated:
+            floor = self._cutoff() + 1
+            if col in self.sketches:
+                return max(int(round(self.sketches[col].estimate())), floor)
+            return floor
+        buf = self.values.get(col)
+        if buf is None:
+            return 0
+        values = buf.compact()
+        return 0 if values is None else len(values)
+
+
+class ConstantAccumulator:
+    """Columns with at most one distinct value, NaN included."""
+
+    def __init__(self):
+        self.distinct = DistinctAccumulator(dropna=False, limit=1)
+        self.columns = []
+
+    def update(self, chunk):
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+        self.distinct.update(chunk)
+        return self
+
+    def merge(self, other):
+        for col in other.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def issues(self):
+        results = []
+        for col in self.columns:
+            issue = checks.constant_issue(col, self.distinct.count(col))
+            if issue:
+                results.append(issue)
+        return results
+
+
+class QuantileAccumulator:
+    """
+    Exact value counts for numeric columns.  Quartiles are read off the
+    merged counts with the same linear interpolation np.percentile uses,
+    and the fences are then applied to the counts themselves, so no second
+    pass over the data is needed.
+
+    With quantile_error set, each column keeps a QuantileSketch instead:
+    memory stays bounded regardless of cardinality, and the outlier share
+    is estimated from the sketch's ranks at the fences.  A column whose
+    counts grow past exact_limit distinct values moves to such a sketch
+    on its own.
+    """
+
+    def __init__(self, quantile_error=None, exact_limit=EXACT_LIMIT):
+        self.quantile_error = quantile_error
+        self.exact_limit = exact_limit
+        self.rows = 0
+        self.counts = {}
+        self.sketches = {}
+        self.non_numeric = set()
+        self.columns = []
+
+    def _sketch(self, col):
+        """The column's sketch, made from its exact counts if it has none yet."""
+        if col not in self.sketches:
+            sketch = QuantileSketch(self.quantile_error or FALLBACK_QUANTILE_ERROR)
+            buf = self.counts.pop(col, None)
+            state = buf.compact() if buf is not None else None
+            if state is not None:
+                sketch.update_counts(state.index.to_numpy(dtype="float64"), state.to_numpy())
+            self.sketches[col] = sketch
+        return self.sketches[col]
+
+    def _add_counts(self, col, part):
+        if col in self.sketches:
+            self.sketches[col].update_counts(part.index.to_numpy(dtype="float64"), part.to_numpy())
+            return
+        if col not in self.counts:
+            self.counts[col] = _CompactingBuffer(_fold_counts)
+        buf = self.counts[col]
+        buf.add(part)
+        if self.exact_limit is not None and buf.size_bound() > self.exact_limit:
+            if len(buf.compact()) > self.exact_limit:
+                self._sketch(col)
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+            if col in self.non_numeric:
+                continue
+            series = chunk[col]
+            if not _is_numeric(series):
+                self.non_numeric.add(col)
+                self.counts.pop(col, None)
+                self.sketches.pop(col, None)
+                continue
+            if self.quantile_error:
+                self._sketch(col).update(series.to_numpy(dtype="float64", na_value=np.nan))
+                continue
+            self._add_counts(col, series.dropna().astype("float64").value_counts(sort=False))
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        for col in other.columns:
+            if col not in self.columns:
+                self.columns.append(col)
+        self.non_numeric |= other.non_numeric
+        for col in self.non_numeric:
+            self.counts.pop(col, None)
+            self.sketches.pop(col, None)
+        for col, buf in other.counts.items():
+            if col in self.non_numeric:
+                continue
+            state = buf.compact()
+            if state is not None:
+                self._add_counts(col, state)
+        for col, sketch in other.sketches.items():
+            if col in self.non_numeric:
+                continue
+            self._sketch(col).merge(sketch)
+        return self
+
+    def sorted_counts(self, col):
+        buf = self.counts.get(col)
+        state = buf.compact() if buf is not None else None
+        if state is None or state.empty:
+            return np.array([], dtype="float64"), np.array([], dtype="int64")
+        state = state.sort_index()
+        return state.index.to_numpy(dtype="float64"), state.to_numpy(dtype="int64")
+
+    def quantile(self, col, q):
+        if self.quantile_error or col in self.sketches:
+            sketch = self.sketches.get(col)
+            return sketch.quantile(q) if sketch is not None else np.nan
+        values, counts = self.sorted_counts(col)
+        return weighted_quantile(values, counts, q)
+
+    def fences(self, col):
+        q1 = self.quantile(col, 0.25)
+        q3 = self.quantile(col, 0.75)
+        iqr = q3 - q1
+        return q1 - 1.5 * iqr, q3 + 1.5 * iqr, iqr
+
+    def outlier_count(self, col, lower, upper):
+        if self.quantile_error or col in self.sketches:
+            sketch = self.sketches.get(col)
+            if sketch is None or sketch.count == 0:
+                return 0
+            share = sketch.rank(lower) + 1 - sketch.rank(upper, inclusive=True)
+            return share * sketch.count
+        values, counts = self.sorted_counts(col)
+        return counts[(values < lower) | (values > upper)].sum()
+
+    def issues(self):
+        results = []
+        for col in self.columns:
+            if col in self.non_numeric:
+                continue
+            lower, upper, iqr = self.fences(col)
+            if iqr == 0:
+                continue
+            outliers = self.outlier_count(col, lower, upper)
+            outlier_pct = outliers / self.rows * 100 if self.rows else 0
+            if col in self.sketches:
+                issue = checks.outlier_issue(
+                    col, outlier_pct, fences=(lower, upper),
+                    quantile_error=self.sketches[col].error
+                )
+            else:
+                issue = checks.outlier_issue(col, outlier_pct)
+            if issue:
+                results.append(issue)
+        return results
+
+
+class CardinalityAccumulator:
+    """
+    Distinct non-null values for object columns not named like an id.
+
+    With hll_precision set, exact values are only kept until a column is
+    clearly past the threshold (beyond the sketch's error band); after
+    that only its HyperLogLog sketch is kept and the reported count is an
+    estimate.  Without it the same happens past exact_limit values.
+    """
+
+    def __init__(self, threshold=50, hll_precision=None, exact_limit=EXACT_LIMIT):
+        self.threshold = threshold
+        limit = None
+        if hll_precision:
+            relative_error = HyperLogLog(hll_precision).relative_error
+            limit = int(threshold * (1 + 3 * relative_error)) + 1
+        self.distinct = DistinctAccumulator(
+            dropna=True, limit=limit, hll_precision=hll_precision, exact_limit=exact_limit
+        )
+        self.object_columns = []
+
+    def update(self, chunk, numeric_seed=None):
+        for col in chunk.select_dtypes(include=checks.TEXT_DTYPES).columns:
+            if col.lower().endswith("id") or col in self.object_columns:
+                continue
+            self.object_columns.append(col)
+            # A column that only turns textual in a later chunk still owes
+            # the values seen while it looked numeric.
+            if numeric_seed is not None and col in numeric_seed.counts:
+                values, _ = numeric_seed.sorted_counts(col)
+                self.distinct.track(col, values)
+            elif (numeric_seed is not None and col in numeric_seed.sketches
+                  and not numeric_seed.quantile_error):
+                # Too many to have been kept: the count is a lower bound.
+                self.distinct.saturate(col)
+        self.distinct.update(chunk, columns=[
+            col for col in self.object_columns if col in chunk.columns
+        ])
+        return self
+
+    def merge(self, other):
+        for col in other.object_columns:
+            if col not in self.object_columns:
+                self.object_columns.append(col)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def issues(self, columns=None):
+        results = []
+        order = columns if columns is not None else self.object_columns
+        for col in order:
+            if col not in self.object_columns:
+                continue
+            issue = checks.cardinality_issue(
+                col, self.distinct.count(col), self.threshold,
+                approximate=self.distinct.is_estimate(col)
+            )
+            if issue:
+                results.append(issue)
+        return results
+
+
+class ClassCountAccumulator:
+    """Value counts of the target column."""
+
+    def __init__(self, target):
+        self.target = target
+        self.counts = Counter()
+        self.seen = False
+
+    def update(self, chunk):
+        if self.target is None or self.target not in chunk.columns:
+            return self
+        self.seen = True
+        self.counts.update(chunk[self.target].value_counts().to_dict())
+        return self
+
+    def merge(self, other):
+        self.seen = self.seen or other.seen
+        self.counts.update(other.counts)
+        return self
+
+    def issues(self):
+        if not self.seen:
+            return None
+        total = sum(self.counts.values())
+        max_ratio = max(self.counts.values()) / total if total else np.nan
+        return checks.imbalance_issue(self.target, max_ratio)
@@ -1,39 +1,303 @@
 import pandas as pd
 from dqcheck import checks
+from dqcheck import accumulators
+from dqcheck import readers
+from dqcheck import tracing
+from dqcheck.issues import IssueStore
+from dqcheck.duplicates import FingerprintCounter, RowHasher, column_hash
+from dqcheck.parallel import run_sharded_checks
+from dqcheck.profile import DatasetProfile, profile_dataframe, profile_from_stats
 from dqcheck.scoring import score_dataset
 
-def run_all_checks(df: pd.DataFrame, target: str | None = None):
+def run_all_checks(
+    df: pd.DataFrame,
+    target: str | None = None,
+    quantile_error: float | None = None,
+    hll_precision: int | None = None,
+    top_duplicates: int = 0,
+    workers: int | None = None,
+    profile=None,
+    profiler=None,
+    duplicates: bool = True,
+):
+    """
+    Run every check on an in-memory DataFrame.  A DatasetProfile may be
+    passed in to read back the column statistics afterwards.  Each check
+    runs as a span (see dqcheck.tracing): measured by profiler when one
+    is given, and reported to any registered span hooks.  With
+    duplicates=False the whole-row duplicate check is skipped.
+    """
+    tracer = tracing.tracer_for(profiler)
+    with tracing.span(tracer, "run_all_checks", kind="analysis", rows=len(df)):
+        return _run_all_checks(
+            df, target, quantile_error, hll_precision, top_duplicates, workers, profile, tracer,
+            duplicates
+        )
+
+
+def _run_all_checks(df, target, quantile_error, hll_precision, top_duplicates, workers,
+                    profile, tracer, duplicates=True):
     report = {
         "dataset": {
             "rows": df.shape[0],
             "columns": df.shape[1]
         },
-        "issues": []
+        "issues": IssueStore()
     }
 
-    # Structural checks
-    report["issues"].extend(checks.check_missing_values(df))
-    dup = checks.check_duplicate_rows(df)
-    if dup:
-        report["issues"].append(dup)
-    report["issues"].extend(checks.check_constant_columns(df))
+    if workers and workers > 1:
+        # Columns and row ranges sharded across a process pool
+        with tracing.span(tracer, "run_sharded_checks", df=df):
+            report["issues"].extend(run_sharded_checks(
+                df, workers, quantile_error=quantile_error,
+                hll_precision=hll_precision, top_duplicates=top_duplicates,
+                duplicates=duplicates, profile=profile
+            ))
+    else:
+        # One pass per column, shared by every per-column check below
+        if profile is None:
+            profile = profile_dataframe(df, hll_precision=hll_precision)
+        pending = [col for col in df.columns if col not in profile.columns]
+        with tracing.span(tracer, "profile_columns", kind="profile", df=df, columns=pending):
+            profile.compute()
 
-    # Statistical checks
-    report["issues"].extend(checks.check_outliers_iqr(df))
+        numeric = df.select_dtypes(include="number").columns
 
-    report["issues"].extend(checks.check_high_cardinality(df))
+        # Structural checks (the profiled ones read no data themselves)
+        with tracing.span(tracer, "check_missing_values", rows=len(df), nbytes=0):
+            report["issues"].extend(checks.check_missing_values(df, profile=profile))
+        if duplicates:
+            with tracing.span(tracer, "check_duplicate_rows", df=df):
+                dup = checks.check_duplicate_rows(df, top=top_duplicates)
+            if dup:
+                report["issues"].append(dup)
+        with tracing.span(tracer, "check_constant_columns", rows=len(df), nbytes=0):
+            report["issues"].extend(checks.check_constant_columns(df, profile=profile))
+
+        # Statistical checks
+        with tracing.span(tracer, "check_outliers_iqr", df=df,
+                          columns=numeric if quantile_error else []):
+            report["issues"].extend(checks.check_outliers_iqr(
+                df, profile=profile, quantile_error=quantile_error
+            ))
+
+        with tracing.span(tracer, "check_high_cardinality", rows=len(df), nbytes=0):
+            report["issues"].extend(checks.check_high_cardinality(df, profile=profile))
 
 
     # Target-related checks (placeholder for later)
     if target and target in df.columns:
         report["target"] = target
 
-    scores = score_dataset(df, report["issues"])
+    with tracing.span(tracer, "score_dataset", kind="score"):
+        scores = score_dataset(df, report["issues"])
     report["scores"] = scores
 
-    imbalance = checks.check_class_imbalance(df, target)
+    with tracing.span(tracer, "check_class_imbalance", df=df,
+                      columns=[target] if target in df.columns else []):
+        imbalance = checks.check_class_imbalance(df, target)
     if imbalance:
         report["issues"].append(imbalance)
 
     return report
 
+
+
+class StreamingChecks:
+    """
+    The accumulators behind run_streaming_checks.  Chunks are fed with
+    update() and report() may be called at any point without consuming
+    the state, so the same object can keep absorbing new data afterwards
+    (see dqcheck.incremental).
+    """
+
+    def __init__(
+        self,
+        target: str | None = None,
+        quantile_error: float | None = None,
+        hll_precision: int | None = None,
+        top_duplicates: int = 0,
+        spill_dir: str | None = None,
+        duplicates: bool = True,
+    ):
+        self.target = target
+        self.missing = accumulators.MissingAccumulator()
+        self.duplicates = None
+        if duplicates:
+            self.duplicates = accumulators.DuplicateAccumulator(
+                spill_dir=spill_dir, top=top_duplicates
+            )
+        self.constant = accumulators.ConstantAccumulator()
+        self.quantiles = accumulators.QuantileAccumulator(quantile_error=quantile_error)
+        self.cardinality = accumulators.CardinalityAccumulator(hll_precision=hll_precision)
+        self.classes = accumulators.ClassCountAccumulator(target)
+        self.schema = None
+
+    @property
+    def rows(self):
+        return self.missing.rows
+
+    def update(self, chunk):
+        if self.schema is None:
+            self.schema = chunk.iloc[:0]
+        self.missing.update(chunk)
+        if self.duplicates is not None:
+            self.duplicates.update(chunk)
+        self.constant.update(chunk)
+        # Cardinality first: it may seed from numeric counts that the
+        # quantile accumulator drops once a column turns textual.
+        self.cardinality.update(chunk, numeric_seed=self.quantiles)
+        self.quantiles.update(chunk)
+        self.classes.update(chunk)
+        return self
+
+    def report(self):
+        if self.schema is None:
+            raise ValueError("No data to analyze")
+
+        report = {
+            "dataset": {
+                "rows": self.missing.rows,
+                "columns": self.schema.shape[1]
+            },
+            "issues": IssueStore()
+        }
+
+        report["issues"].extend(self.missing.issues())
+        dup = self.duplicates.issues() if self.duplicates is not None else None
+        if dup:
+            report["issues"].append(dup)
+        report["issues"].extend(self.constant.issues())
+
+        report["issues"].extend(self.quantiles.issues())
+
+        report["issues"].extend(self.cardinality.issues(columns=list(self.schema.columns)))
+
+        if self.target and self.target in self.schema.columns:
+            report["target"] = self.target
+
+        scores = score_dataset(self.schema, report["issues"])
+        report["scores"] = scores
+
+        imbalance = self.classes.issues()
+        if imbalance:
+            report["issues"].append(imbalance)
+
+        return report
+
+    def close(self):
+        if self.duplicates is not None:
+            self.duplicates.close()
+
+
+def run_streaming_checks(
+    chunks,
+    target: str | None = None,
+    quantile_error: float | None = None,
+    hll_precision: int | None = None,
+    top_duplicates: int = 0,
+    spill_dir: str | None = None,
+    duplicates: bool = True,
+):
+    """
+    Same report as run_all_checks, built from an iterable of DataFrame
+    chunks (e.g. pd.read_csv(..., chunksize=N)) without holding the whole
+    dataset in memory.
+    """
+    state = StreamingChecks(
+        target=target, quantile_error=quantile_error, hll_precision=hll_precision,
+        top_duplicates=top_duplicates, spill_dir=spill_dir, duplicates=duplicates
+    )
+    try:
+        for chunk in chunks:
+            state.update(chunk)
+        return state.report()
+    finally:
+        state.close()
+
+
+def run_columnar_checks(
+    path,
+    target: str | None = None,
+    quantile_error: float | None = None,
+    hll_precision: int | None = None,
+    top_duplicates: int = 0,
+    duplicates: bool = True,
+):
+    """
+    Same report as run_all_checks for a Parquet or Feather/Arrow file,
+    reading one column at a time.  Per-column checks are answered from
+    Parquet footer statistics where those suffice.  Duplicate detection
+    needs every column folded into the row fingerprints, so with
+    duplicates=False (no duplicate check) a column the statistics answer
+    is never read at all.
+    """
+    source = readers.open_columnar(path)
+    rows = source.num_rows
+    schema = source.empty_frame()
+
+    found = {"missing": [], "constant": [], "outliers": [], "cardinality": []}
+    hasher = RowHasher(len(source.columns)) if duplicates else None
+    target_frame = None
+
+    for col in source.columns:
+        stats_profile = profile_from_stats(col, rows, source.column_stats(col))
+        series = None
+        if stats_profile is None or hasher is not None or col == target:
+            series = source.read_column(col)
+        if hasher is not None:
+            hasher.add(column_hash(series))
+        if col == target:
+            target_frame = series.to_frame()
+
+        if stats_profile is not None:
+            frame = source.empty_frame([col])
+            profile = DatasetProfile(frame, hll_precision=hll_precision)
+            profile.columns[col] = stats_profile
+        else:
+            frame = series.to_frame()
+            profile = DatasetProfile(frame, hll_precision=hll_precision)
+
+        found["missing"].extend(checks.check_missing_values(frame, profile=profile))
+        found["constant"].extend(checks.check_constant_columns(frame, profile=profile))
+        found["outliers"].extend(checks.check_outliers_iqr(
+            frame, profile=profile, quantile_error=quantile_error
+        ))
+        found["cardinality"].extend(checks.check_high_cardinality(frame, profile=profile))
+
+    dup_count, top = 0, None
+    if hasher is not None:
+        counter = FingerprintCounter()
+        if source.columns:
+            counter.add_fingerprints(hasher.result())
+        dup_count, top = counter.result(top=top_duplicates)
+
+    report = {
+        "dataset": {
+            "rows": rows,
+            "columns": len(source.columns)
+        },
+        "issues": IssueStore()
+    }
+
+    report["issues"].extend(found["missing"])
+    dup = checks.duplicate_issue(dup_count, top_duplicates=top)
+    if dup:
+        report["issues"].append(dup)
+    report["issues"].extend(found["constant"])
+
+    report["issues"].extend(found["outliers"])
+
+    report["issues"].extend(found["cardinality"])
+
+    if target and target in schema.columns:
+        report["target"] = target
+
+    scores = score_dataset(schema, report["issues"])
+    report["scores"] = scores
+
+    imbalance = checks.check_class_imbalance(target_frame, target) if target_frame is not None else None
+    if imbalance:
+        report["issues"].append(imbalance)
+
+    return report
@@ -0,0 +1,228 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from dqcheck.analyzer import run_all_checks, run_columnar_checks, run_streaming_checks
+from dqcheck.cache import StatsCache, options_key
+from dqcheck.profile import profile_dataframe
+from dqcheck.readers import (
+    ARROW_SUFFIXES, PARQUET_SUFFIXES, detect_format, iter_chunks, load_schema, read_dataset
+)
+from dqcheck.report import save_html_report, save_json_report
+from dqcheck.serialize import write_json
+
+# -----------------------------
+# BATCH ANALYSIS
+# -----------------------------
+# Many files are analyzed in one command on a bounded process pool, so
+# the interpreter and imports are paid once per worker rather than once
+# per file.  Results are taken as they complete: a fast file's report is
+# written as soon as it is done, however many slow files are still
+# running, and files are submitted largest first so a big one does not
+# start last and stretch the whole batch.  A file that fails is recorded
+# in the summary and does not stop the others -- nor does a worker that
+# dies outright (killed for running out of memory, say), which breaks the
+# pool: the files it left unfinished are retried on a fresh pool, and
+# any still unfinished then run one per pool so the crash is charged to
+# the file that caused it.  Each worker uses the stats cache like analyze
+# does, so a re-run over unchanged partitions only reads the cached
+# reports.
+
+# Only formats the readers parse; .tsv/.txt would be read as comma-separated.
+DATA_SUFFIXES = (".csv",) + PARQUET_SUFFIXES + ARROW_SUFFIXES
+SUMMARY_NAME = "batch_summary.json"
+
+
+def report_key(target=None, chunksize=None, quantile_error=None, hll_precision=None,
+               top_duplicates=0, schema=None, duplicates=True):
+    """Stats cache entry for an analyze report made with these options."""
+    options = dict(
+        target=target, chunksize=chunksize, quantile_error=quantile_error,
+        hll_precision=hll_precision, top_duplicates=top_duplicates, schema=load_schema(schema)
+    )
+    if not duplicates:
+        # Only when off, so reports cached before the option existed still match.
+        options["duplicates"] = False
+    return options_key("report", **options)
+
+
+def find_files(source):
+    """
+    Data files under a directory (recursively, by suffix) or matching a
+    glob pattern, and the root report names are made relative to.
+    """
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(base, name)
+            for base, _, names in os.walk(source)
+            for name in names
+            if name.lower().endswith(DATA_SUFFIXES)
+        ]
+        root = source
+    else:
+        paths = [path for path in glob.glob(source, recursive=True) if os.path.isfile(path)]
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths]) if paths else ""
+    return sorted(paths), root
+
+
+def report_name(path, root):
+    """Flat report file stem for path: 2024/01/part-0.csv -> 2024__01__part-0.csv"""
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(root)).replace(os.sep, "__")
+
+
+def _run_checks(path, options, cache):
+    key = report_key(
+        options.get("target"), options.get("chunksize"), options.get("quantile_error"),
+        options.get("hll_precision"), options.get("top_duplicates", 0), options.get("schema")
+    )
+    results = cache.get(path, key) if cache else None
+    if results is not None:
+        return results, True
+
+    check_options = dict(
+        target=options.get("target"), quantile_error=options.get("quantile_error"),
+        hll_precision=options.get("hll_precision"),
+        top_duplicates=options.get("top_duplicates", 0),
+    )
+    if options.get("chunksize"):
+        chunks = iter_chunks(path, options["chunksize"], schema=load_schema(options.get("schema")))
+        results = run_streaming_checks(chunks, **check_options)
+    elif detect_format(path) != "csv":
+        results = run_columnar_checks(path, **check_options)
+    else:
+        df = read_dataset(path, engine=options.get("engine"), schema=options.get("schema"),
+                          compact=options.get("compact", False))
+        profile = profile_dataframe(df, hll_precision=check_options["hll_precision"])
+        results = run_all_checks(df, profile=profile, **check_options)
+        if cache is not None and not check_options["hll_precision"]:
+            profiles = options_key("profiles", schema=load_schema(options.get("schema")))
+            cache.put(path, profiles, profile.to_records())
+
+    if cache is not None:
+        cache.put(path, key, results)
+    return results, False
+
+
+def analyze_file(path, report_base, report_format="json", options=None, use_cache=True,
+                 html_gzip=False):
+    """
+    Analyze one file and write its report(s) to report_base + .json/.html
+    (.html.gz with html_gzip).
+    Returns its summary entry; failures are returned, not raised.
+    """
+    options = options or {}
+    start = time.perf_counter()
+    entry = {"file": path}
+    try:
+        cache = None
+        if use_cache:
+            try:
+                cache = StatsCache()
+            except OSError:
+                pass
+        results, cached = _run_checks(path, options, cache)
+
+        if report_format in ("json", "both"):
+            save_json_report(results, report_base + ".json")
+            entry["report"] = report_base + ".json"
+        if report_format in ("html", "both"):
+            html_path = report_base + (".html.gz" if html_gzip else ".html")
+            save_html_report(results, html_path)
+            entry.setdefault("report", html_path)
+
+        entry.update({
+            "dataset_score": results["scores"]["dataset_score"],
+            "rows": results["dataset"]["rows"],
+            "columns": results["dataset"]["columns"],
+            "issues": len(results["issues"]),
+            "high_severity": sum(1 for i in results["issues"] if i.get("severity") == "high"),
+            "cached": cached,
+        })
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["seconds"] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _run_pool(jobs, workers, args, record):
+    """
+    Run jobs on one process pool, recording each entry as it completes.
+    Returns the jobs left unfinished because a worker died and broke the
+    pool.
+    """
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(analyze_file, path, base, *args): (path, base)
+                   for path, base in jobs}
+        for future in as_completed(futures):
+            try:
+                entry = future.result()
+            except BrokenProcessPool:
+                unfinished.append(futures[future])
+                continue
+            except Exception as e:
+                entry = {"file": futures[future][0], "error": f"{type(e).__name__}: {e}"}
+            record(entry)
+    return unfinished
+
+
+def run_batch(paths, output_dir, root="", workers=None, report_format="json",
+              options=None, use_cache=True, on_result=None, html_gzip=False):
+    """
+    Analyze every path on up to `workers` processes, writing reports under
+    output_dir.  on_result(entry, done, total) is called as each file
+    finishes.  Returns the summary, which is also saved as
+    output_dir/batch_summary.json: files ranked by dataset_score, worst
+    first, followed by the failures.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    jobs = [(path, os.path.join(output_dir, report_name(path, root)))
+            for path in sorted(paths, key=_size, reverse=True)]
+
+    entries = []
+
+    def record(entry):
+        entries.append(entry)
+        if on_result is not None:
+            on_result(entry, len(entries), len(jobs))
+
+    if workers == 1 or len(jobs) <= 1:
+        for path, base in jobs:
+            record(analyze_file(path, base, report_format, options, use_cache, html_gzip))
+    else:
+        args = (report_format, options, use_cache, html_gzip)
+        pending = _run_pool(jobs, workers, args, record)
+        if pending:
+            pending = _run_pool(pending, workers, args, record)
+        for path, base in pending:
+            if _run_pool([(path, base)], 1, args, record):
+                record({"file": path, "error": "BrokenProcessPool: the worker process "
+                                               "died while analyzing this file"})
+
+    ranked = sorted((e for e in entries if "error" not in e),
+                    key=lambda e: (e["dataset_score"], e["file"]))
+    failed = sorted((e for e in entries if "error" in e), key=lambda e: e["file"])
+    scores = [e["dataset_score"] for e in ranked]
+    summary = {
+        "files": len(entries),
+        "analyzed": len(ranked),
+        "failed": len(failed),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - start, 3),
+        "mean_score": round(sum(scores) / len(scores), 2) if scores else None,
+        "ranking": ranked,
+        "errors": failed,
+    }
+    write_json(summary, os.path.join(output_dir, SUMMARY_NAME))
+    return summary
@@ -0,0 +1,69 @@
+import pandas as pd
+import numpy as np
+
+# -----------------------------
+# BLANK DETECTION
+# -----------------------------
+# Whitespace-only strings count as missing everywhere in dqcheck.  Rather
+# than running a regex over every cell of every column, only columns that
+# can hold strings are inspected, and only through their distinct values:
+# numeric, bool and datetime columns never contain blanks.
+
+
+def can_hold_blanks(series: pd.Series) -> bool:
+    dtype = series.dtype
+    return not (
+        pd.api.types.is_numeric_dtype(dtype)
+        or pd.api.types.is_bool_dtype(dtype)
+        or pd.api.types.is_datetime64_any_dtype(dtype)
+        or pd.api.types.is_timedelta64_dtype(dtype)
+        or isinstance(dtype, pd.PeriodDtype)
+    )
+
+
+def blank_values(values) -> np.ndarray:
+    """Boolean mask over an array of distinct values: True for blank strings."""
+    return np.fromiter(
+        (isinstance(v, str) and v.strip() == "" for v in values),
+        dtype=bool, count=len(values)
+    )
+
+
+def blank_mask(series: pd.Series) -> np.ndarray:
+    """True where the cell is a whitespace-only string."""
+    if not can_hold_blanks(series):
+        return np.zeros(len(series), dtype=bool)
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    elif isinstance(series.dtype, pd.StringDtype):
+        return series.str.strip().eq("").fillna(False).to_numpy(dtype=bool)
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+
+    blank = blank_values(uniques)
+    if not blank.any():
+        return np.zeros(len(series), dtype=bool)
+    return np.where(codes >= 0, blank[codes], False)
+
+
+def missing_mask(series: pd.Series) -> np.ndarray:
+    """Nulls plus whitespace-only strings."""
+    return series.isnull().to_numpy() | blank_mask(series)
+
+
+def normalize_blanks(df: pd.DataFrame, columns=None) -> pd.DataFrame:
+    """
+    Return df with blank strings replaced by NaN.  Only columns that
+    actually contain blanks are replaced; df itself is not modified.
+    `columns` limits the scan to columns known to hold blanks.
+    """
+    result = df
+    for col in df.columns if columns is None else columns:
+        mask = blank_mask(df[col])
+        if not mask.any():
+            continue
+        if result is df:
+            result = df.copy(deep=False)
+        result[col] = df[col].mask(mask, np.nan)
+    return result
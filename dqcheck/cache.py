@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from dqcheck.serialize import plain
+
+# -----------------------------
+# STATS CACHE
+# -----------------------------
+# Running analyze and then fix on the same file would parse and profile it
+# twice.  Reports and column profiles are stored on disk under the file's
+# content hash, so any command on unchanged data can reuse them.  Hashing
+# still reads the file, so an index remembers the digest for each path
+# together with its size and mtime and the file is only re-hashed when
+# those change.  Old entries are evicted by age and then, least recently
+# used first, until the cache fits its size budget.
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+HASH_BLOCK = 1 << 20
+
+
+def default_cache_dir():
+    if os.environ.get("DQCHECK_CACHE_DIR"):
+        return os.environ["DQCHECK_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "dqcheck")
+
+
+def options_key(name: str, **options) -> str:
+    """Entry name for a result that depends on the given options."""
+    blob = json.dumps(options, sort_keys=True, default=str)
+    return f"{name}-{hashlib.blake2b(blob.encode(), digest_size=8).hexdigest()}"
+
+
+def file_digest(path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_json(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f, default=plain)
+    os.replace(tmp, path)
+
+
+class StatsCache:
+    """On-disk cache of per-file results, keyed by content hash."""
+
+    INDEX = "index.json"
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(self.directory, exist_ok=True)
+
+    # ---------- KEYS ----------
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.directory, self.INDEX)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def key(self, path) -> str:
+        """Content digest of path, re-hashed only when its size or mtime changed."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        index = self._load_index()
+        known = index.get(path)
+        if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            return known["digest"]
+        digest = file_digest(path)
+        index[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest}
+        _write_json(os.path.join(self.directory, self.INDEX), index)
+        return digest
+
+    def _entry_path(self, path, name):
+        return os.path.join(self.directory, f"{self.key(path)}-{name}.json")
+
+    # ---------- ENTRIES ----------
+
+    def get(self, path, name):
+        """Cached data for (path, name), or None."""
+        entry = self._entry_path(path, name)
+        try:
+            with open(entry) as f:
+                data = json.load(f)
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        return data
+
+    def put(self, path, name, data):
+        _write_json(self._entry_path(path, name), data)
+        self.evict()
+
+    def _remove(self, full):
+        # Batch workers share the cache and may evict the same entry.
+        try:
+            os.remove(full)
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """
+        Drop entries older than max_age, then the least recently used over
+        max_bytes, and forget the digests of files with no entries left.
+        """
+        now = time.time()
+        entries = []
+        evicted = False
+        for name in os.listdir(self.directory):
+            if name == self.INDEX or not name.endswith(".json"):
+                continue
+            full = os.path.join(self.directory, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            if now - st.st_mtime > self.max_age:
+                self._remove(full)
+                evicted = True
+                continue
+            entries.append((st.st_mtime, st.st_size, full))
+
+        total = sum(size for _, size, _ in entries)
+        kept = []
+        for _, size, full in sorted(entries):
+            if total <= self.max_bytes:
+                kept.append(full)
+                continue
+            self._remove(full)
+            evicted = True
+            total -= size
+
+        if evicted:
+            self._prune_index(kept)
+
+    def _prune_index(self, kept):
+        """Drop index records whose digest names none of the kept entries."""
+        digests = {os.path.basename(full).split("-", 1)[0] for full in kept}
+        index = self._load_index()
+        pruned = {path: known for path, known in index.items() if known["digest"] in digests}
+        if len(pruned) < len(index):
+            _write_json(os.path.join(self.directory, self.INDEX), pruned)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
@@ -1,52 +1,59 @@
 import pandas as pd
 import numpy as np
 
+from dqcheck.duplicates import FingerprintCounter
+from dqcheck.issues import Issue
+from dqcheck.profile import profile_dataframe
+from dqcheck.sketches import sketch_series, sketch_fences, distinct_up_to_two, near_threshold
+
+# Every check takes an optional DatasetProfile.  run_all_checks builds one
+# and shares it, so each column is scanned once for all checks; called on
+# their own, checks profile just the columns they read.
+
+# Column dtypes the cardinality check treats as categorical text: plain
+# object columns plus the categorical and string dtypes typed ingestion
+# produces.
+TEXT_DTYPES = ["object", "category", "string"]
+
 # -----------------------------
 # STRUCTURAL CHECKS
 # -----------------------------
 
-def check_missing_values(df: pd.DataFrame):
+def check_missing_values(df: pd.DataFrame, profile=None):
+    profile = profile or profile_dataframe(df)
     results = []
     for col in df.columns:
-        missing_pct = (
-            df[col]
-            .replace(r"^\s*$", np.nan, regex=True)
-            .isnull()
-            .mean() * 100
-        )
-
-        if missing_pct > 0:
-            results.append({
-                "column": col,
-                "issue": "missing_values",
-                "missing_pct": round(missing_pct, 2),
-                "severity": "high" if missing_pct > 30 else "medium"
-            })
+        issue = missing_issue(col, profile[col].missing_pct)
+        if issue:
+            results.append(issue)
     return results
 
 
-def check_duplicate_rows(df: pd.DataFrame):
-    dup_count = df.duplicated().sum()
-    if dup_count > 0:
-        return {
-            "issue": "duplicate_rows",
-            "duplicate_count": int(dup_count),
-            "severity": "medium"
-        }
-    return None
+def check_duplicate_rows(df: pd.DataFrame, top=0, spill_dir=None):
+    """
+    Count duplicate rows from 64-bit row fingerprints.  With top > 0 the
+    issue also lists the most repeated fingerprints with example rows.
+    """
+    counter = FingerprintCounter(spill_dir=spill_dir).update(df)
+    try:
+        dup_count, top_duplicates = counter.result(top=top)
+    finally:
+        counter.close()
+    return duplicate_issue(dup_count, top_duplicates=top_duplicates)
 
 
-def check_constant_columns(df: pd.DataFrame):
+def check_constant_columns(df: pd.DataFrame, profile=None):
     results = []
     for col in df.columns:
-        unique_vals = df[col].nunique(dropna=False)
-        if unique_vals <= 1:
-            results.append({
-                "column": col,
-                "issue": "constant_column",
-                "unique_values": int(unique_vals),
-                "severity": "high"
-            })
+        # Without a shared profile, stop scanning a column as soon as a
+        # second distinct value shows up.
+        if profile is None:
+            unique_vals = distinct_up_to_two(df[col])
+        else:
+            unique_vals = profile[col].distinct_with_nan
+        issue = constant_issue(col, unique_vals)
+        if issue:
+            results.append(issue)
     return results
 
 
@@ -65,30 +72,50 @@ def check_data_types(df: pd.DataFrame):
 # STATISTICAL CHECKS
 # -----------------------------
 
-def check_outliers_iqr(df: pd.DataFrame):
+def check_outliers_iqr(df: pd.DataFrame, profile=None, quantile_error=None):
+    """
+    IQR outlier check.  With quantile_error set, the fences come from a
+    mergeable quantile sketch with that normalized rank error instead of
+    exact quartiles, and are reported with the error bound.
+    """
+    if quantile_error:
+        return _check_outliers_sketch(df, quantile_error)
+
+    profile = profile or profile_dataframe(df)
     results = []
     numeric_cols = df.select_dtypes(include=np.number).columns
 
     for col in numeric_cols:
-        q1 = df[col].quantile(0.25)
-        q3 = df[col].quantile(0.75)
-        iqr = q3 - q1
+        column = profile[col]
 
-        if iqr == 0:
+        if column.iqr == 0:
             continue
 
-        lower = q1 - 1.5 * iqr
-        upper = q3 + 1.5 * iqr
+        issue = outlier_issue(col, column.outlier_pct)
+        if issue:
+            results.append(issue)
+
+    return results
+
+
+def _check_outliers_sketch(df, quantile_error):
+    results = []
+    numeric_cols = df.select_dtypes(include=np.number).columns
+
+    for col in numeric_cols:
+        sketch = sketch_series(df[col], quantile_error)
+        lower, upper, iqr = sketch_fences(sketch)
+
+        if iqr == 0:
+            continue
 
         outlier_pct = ((df[col] < lower) | (df[col] > upper)).mean() * 100
 
-        if outlier_pct > 0:
-            results.append({
-                "column": col,
-                "issue": "outliers",
-                "outlier_pct": round(outlier_pct, 2),
-                "severity": "high" if outlier_pct > 10 else "low"
-            })
+        issue = outlier_issue(
+            col, outlier_pct, fences=(lower, upper), quantile_error=sketch.error_bound
+        )
+        if issue:
+            results.append(issue)
 
     return results
 
@@ -98,28 +125,93 @@ def check_class_imbalance(df, target):
         return None
 
     value_counts = df[target].value_counts(normalize=True)
-    max_ratio = value_counts.max()
-
-    if max_ratio > 0.65:
-        return {
-            "issue": "class_imbalance",
-            "target": target,
-            "dominant_class_ratio": round(max_ratio * 100, 2),
-            "severity": "high"
-        }
-    return None
+    return imbalance_issue(target, value_counts.max())
 
 
-def check_high_cardinality(df, threshold=50):
+def check_high_cardinality(df, threshold=50, profile=None, hll_precision=None):
+    """
+    Flag object columns with more than `threshold` distinct values.  With
+    hll_precision set (or a sketched profile), counts are HyperLogLog
+    estimates; an exact nunique() is only run for columns whose estimate
+    lands within the sketch's error band around the threshold.
+    """
+    profile = profile or profile_dataframe(df, hll_precision=hll_precision)
     results = []
-    for col in df.select_dtypes(include="object").columns:
+    for col in df.select_dtypes(include=TEXT_DTYPES).columns:
         if col.lower().endswith("id"):
             continue
-        if df[col].nunique() > threshold:
-            results.append({
-                "column": col,
-                "issue": "high_cardinality",
-                "unique_values": df[col].nunique(),
-                "severity": "medium"
-            })
+        column = profile[col]
+        unique_count, approximate = column.distinct, column.distinct_is_estimate
+        if approximate and near_threshold(
+            unique_count, threshold, column.distinct_sketch.relative_error
+        ):
+            unique_count, approximate = df[col].nunique(), False
+        issue = cardinality_issue(col, unique_count, threshold, approximate=approximate)
+        if issue:
+            results.append(issue)
     return results
+
+
+# -----------------------------
+# ISSUE BUILDERS
+# -----------------------------
+# Shared by the in-memory checks above and the chunk accumulators in
+# dqcheck.accumulators, so both paths agree on thresholds and rounding.
+# They return dqcheck.issues.Issue objects (or None).
+# Percentages are rounded as NumPy floats, the type pandas reductions
+# return, so every path rounds the same way.
+
+def missing_issue(col, missing_pct):
+    if missing_pct > 0:
+        return Issue(
+            "missing_values", col,
+            severity="high" if missing_pct > 30 else "medium",
+            value=round(np.float64(missing_pct), 2)
+        )
+    return None
+
+
+def duplicate_issue(dup_count, top_duplicates=None):
+    if dup_count > 0:
+        extra = {"top_duplicates": top_duplicates} if top_duplicates else None
+        return Issue("duplicate_rows", severity="medium", value=int(dup_count), extra=extra)
+    return None
+
+
+def constant_issue(col, unique_vals):
+    if unique_vals <= 1:
+        return Issue("constant_column", col, severity="high", value=int(unique_vals))
+    return None
+
+
+def outlier_issue(col, outlier_pct, fences=None, quantile_error=None):
+    if outlier_pct > 0:
+        extra = {}
+        if fences is not None:
+            extra["lower_fence"] = float(fences[0])
+            extra["upper_fence"] = float(fences[1])
+        if quantile_error is not None:
+            extra["quantile_error"] = quantile_error
+        return Issue(
+            "outliers", col,
+            severity="high" if outlier_pct > 10 else "low",
+            value=round(np.float64(outlier_pct), 2),
+            extra=extra
+        )
+    return None
+
+
+def imbalance_issue(target, max_ratio):
+    if max_ratio > 0.65:
+        return Issue(
+            "class_imbalance", target, severity="high",
+            value=round(np.float64(max_ratio) * 100, 2)
+        )
+    return None
+
+
+def cardinality_issue(col, unique_count, threshold=50, approximate=False):
+    if unique_count > threshold:
+        extra = {"approximate": True} if approximate else None
+        return Issue("high_cardinality", col, severity="medium", value=unique_count, extra=extra)
+    return None
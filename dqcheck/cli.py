@@ -1,8 +1,15 @@
+import os
+
 import rich_click as click
-import pandas as pd
-from dqcheck.analyzer import run_all_checks
-from dqcheck.report import save_json_report, save_html_report
-from dqcheck.fixer import fix_missing_values,fix_outliers,fix_errors,fix_high_cardinality
+
+# -----------------------------
+# STARTUP
+# -----------------------------
+# Every invocation pays for what this module imports, `dqcheck -h`
+# included, so only click is imported here.  pandas, pyarrow, jinja2 and
+# the dqcheck modules built on them are imported inside the commands and
+# branches that use them: help and usage errors never load them, and fix
+# never loads the report renderer.  benchmarks/startup.py measures this.
 
 
 @click.group(
@@ -11,6 +18,7 @@ from dqcheck.fixer import fix_missing_values,fix_outliers,fix_errors,fix_high_ca
 dqcheck – Data Quality Intelligence Tool
 
 Analyze and fix data quality issues before machine learning training.
+Reads CSV, Parquet (.parquet) and Feather / Arrow IPC (.feather, .arrow).
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 COMMANDS
@@ -28,6 +36,21 @@ analyze
         dqcheck analyze data.csv --report=html
         dqcheck analyze data.csv --report=json
         dqcheck analyze data.csv --target=label --report=both
+        dqcheck analyze big.csv --chunksize=1000000
+        dqcheck analyze events.parquet --target=label
+        dqcheck analyze data.csv --engine=pyarrow --compact
+        dqcheck analyze events.csv --incremental
+        dqcheck analyze huge.csv --sample=100000 --ci-width=1 --target=label --stratify
+        dqcheck analyze data.csv --profile
+
+batch
+    Analyze every data file in a directory (or matching a glob) on a
+    pool of worker processes.  Writes one report per file and a summary
+    ranking the files by dataset score.
+
+    Usage:
+        dqcheck batch partitions/ --output-dir=reports --workers=8
+        dqcheck batch "landing/2024-*/*.parquet" --target=label --report=both
 
 fix
     Fix specific data quality issues.
@@ -61,13 +84,44 @@ fix
         group_rare       Group rare categories into "Other"
         frequency_encode Encode categories by frequency
         target_encode    Encode using target mean
-        hashing          Hash categories into fixed bins
+        hashing          Hash categories into fixed bins (--value=bins[:seed])
+        hashing_sparse   One sparse indicator column per hash bin
         extract_features Derive simpler features
 
     Usage:
         dqcheck fix data.csv --issue=missing_values --method=median
-        dqcheck fix data.csv --issue=outliers --method=cap
+        dqcheck fix data.csv --issue=outliers --method=cap --output=clean.parquet
         dqcheck fix data.csv --issue=high_cardinality --method=group_rare --value=20
+        dqcheck fix data.csv --issue=outliers --method=cap --profile
+
+    fix reuses column statistics cached by an earlier analyze of the same
+    file (see --no-cache; the cache lives in $DQCHECK_CACHE_DIR or
+    ~/.cache/dqcheck).
+
+pipeline
+    Run an ordered list of fixes from a JSON / YAML spec with a single
+    load and a single write.
+
+    Usage:
+        dqcheck pipeline data.csv --spec=clean.yaml
+
+apply
+    Apply fixes learned by fix / pipeline --save-fitted to new data,
+    chunk by chunk, without recomputing any statistics.
+
+    Usage:
+        dqcheck fix sample.csv --issue=outliers --method=cap --save-fitted=fix.json.gz
+        dqcheck apply full.csv --fitted=fix.json.gz
+
+serve
+    Keep warm worker processes and answer analyze / fix jobs over local
+    HTTP (or a Unix socket), for many small files or repeated runs.
+
+    Usage:
+        dqcheck serve --workers=4
+        dqcheck serve --socket=/tmp/dqcheck.sock
+        curl -H "Content-Type: application/json" -d '{"path": "data.csv"}' \
+            http://127.0.0.1:8765/analyze
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
@@ -78,6 +132,132 @@ def cli():
 
 
 
+def ingestion_options(command):
+    """CSV ingestion options shared by analyze and fix."""
+    command = click.option(
+        "--compact",
+        is_flag=True,
+        default=False,
+        help="Infer a compact schema from a sample: categoricals, Arrow strings, downcast numbers"
+    )(command)
+    command = click.option(
+        "--schema",
+        "schema_path",
+        default=None,
+        type=click.Path(exists=True, dir_okay=False),
+        help="JSON file mapping CSV columns to dtypes"
+    )(command)
+    command = click.option(
+        "--engine",
+        default=None,
+        type=click.Choice(["auto", "c", "pyarrow"]),
+        help="CSV parser (auto = pyarrow's multithreaded reader when installed)"
+    )(command)
+    return command
+
+
+def output_options(default):
+    """--output / --compression for commands that write cleaned data."""
+    def decorate(command):
+        command = click.option(
+            "--compression",
+            default=None,
+            type=click.Choice(["none", "snappy", "gzip", "zstd", "lz4"]),
+            help="Output codec (CSV: gzip/zstd, Parquet: snappy/gzip/zstd, Arrow: lz4/zstd)"
+        )(command)
+        command = click.option(
+            "--output",
+            "output_path",
+            default=default,
+            show_default=default is not None,
+            type=click.Path(dir_okay=False),
+            help="Cleaned data path; .csv[.gz|.zst], .parquet or .feather/.arrow"
+        )(command)
+        return command
+    return decorate
+
+
+def check_output(output_path, compression):
+    """Reject a --compression the output format cannot write before any work is done."""
+    from dqcheck.writer import check_compression
+    try:
+        check_compression(output_path, compression)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--compression")
+
+
+def cache_option(command):
+    return click.option(
+        "--no-cache",
+        is_flag=True,
+        default=False,
+        help="Neither read nor write the on-disk stats cache"
+    )(command)
+
+
+def open_cache(no_cache):
+    if no_cache:
+        return None
+    from dqcheck.cache import StatsCache
+    try:
+        return StatsCache()
+    except OSError as e:
+        click.echo(f"⚠ Stats cache disabled: {e}")
+        return None
+
+
+def profile_option(command):
+    return click.option(
+        "--profile",
+        "profiling",
+        is_flag=True,
+        default=False,
+        help="Record time, CPU, peak memory and throughput of every check / fix step"
+    )(command)
+
+
+def binary_option(command):
+    return click.option(
+        "--binary",
+        is_flag=True,
+        default=False,
+        help="Also write the report as Arrow IPC (data_quality_report.arrow) for machine consumers"
+    )(command)
+
+
+def html_gzip_option(command):
+    return click.option(
+        "--html-gzip",
+        is_flag=True,
+        default=False,
+        help="Write HTML reports gzip-compressed (.html.gz)"
+    )(command)
+
+
+def start_profiler(profiling):
+    if not profiling:
+        return None
+    from dqcheck.tracing import Profiler
+    return Profiler().start()
+
+
+def echo_performance(performance):
+    click.echo("\n⏱ Performance:")
+    for s in performance["spans"]:
+        indent = "   " if s["parent"] is None else "     "
+        memory = s["peak_memory_delta"]
+        memory = f"{memory / 2**20:+9.1f} MB" if memory is not None else ""
+        speed = f" {s['rows_per_sec']:>15,} rows/s" if s["rows_per_sec"] else ""
+        click.echo(f"{indent}{s['name']:<28} {s['wall_s']:9.3f}s  cpu {s['cpu_s']:8.3f}s"
+                   f"{memory}{speed}")
+
+
+def profiles_key(schema_path):
+    from dqcheck.cache import options_key
+    from dqcheck.readers import load_schema
+    return options_key("profiles", schema=load_schema(schema_path))
+
+
 @cli.command()
 @click.argument("data_path", type=click.Path(exists=True))
 @click.option("--target", default=None, help="Target column name (optional)")
@@ -87,64 +267,573 @@ def cli():
     type=click.Choice(["json", "html", "both"]),
     help="Report format to generate"
 )
-def analyze(data_path, target, report):
-    click.echo(f"Loading dataset: {data_path}")
+@click.option(
+    "--chunksize",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Stream the CSV in chunks of this many rows instead of loading it whole"
+)
+@click.option(
+    "--quantile-error",
+    default=None,
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    help="Use approximate quantile sketches with this rank error for outlier fences"
+)
+@click.option(
+    "--hll-precision",
+    default=None,
+    type=click.IntRange(4, 18),
+    help="Estimate distinct counts with a HyperLogLog sketch of this precision"
+)
+@click.option(
+    "--top-duplicates",
+    default=0,
+    type=click.IntRange(min=0),
+    help="List this many of the most repeated rows (by fingerprint) in the report"
+)
+@click.option(
+    "--spill-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="With --chunksize, partition duplicate fingerprints to disk under this directory"
+)
+@click.option(
+    "--no-duplicates",
+    is_flag=True,
+    default=False,
+    help="Skip the duplicate-row check; Parquet columns answered by footer stats are then not read"
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Run checks on this many processes, sharding columns and rows (in-memory mode)"
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Keep check state next to the report and only read rows appended since the last run"
+)
+@click.option(
+    "--sample",
+    "sample_size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Check a random sample of at most this many rows and report confidence intervals"
+)
+@click.option(
+    "--stratify",
+    is_flag=True,
+    default=False,
+    help="With --sample, stratify the sample by the --target column"
+)
+@click.option(
+    "--ci-width",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="With --sample, grow the sample only until every interval is at most this wide"
+)
+@click.option(
+    "--confidence",
+    default=0.95,
+    show_default=True,
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    help="Confidence level of the --sample intervals"
+)
+@click.option("--seed", default=None, type=int, help="Random seed for --sample")
+@html_gzip_option
+@binary_option
+@ingestion_options
+@cache_option
+@profile_option
+def analyze(data_path, target, report, chunksize, quantile_error, hll_precision,
+            top_duplicates, spill_dir, no_duplicates, workers, incremental, sample_size, stratify,
+            ci_width, confidence, seed, html_gzip, binary, engine, schema_path, compact, no_cache,
+            profiling):
+    from dqcheck.readers import iter_chunks, load_schema
+    from dqcheck.tracing import span
+
+    # Per-check spans come from the in-memory mode; the other modes are
+    # measured as a whole.
+    profiler = start_profiler(profiling)
+    if no_duplicates and (sample_size or incremental):
+        raise click.UsageError("--no-duplicates cannot be combined with --sample or --incremental")
+
+    if sample_size:
+        if stratify and not target:
+            raise click.UsageError("--stratify needs --target")
+        from dqcheck.incremental import DEFAULT_CHUNKSIZE
+        from dqcheck.sampling import run_sampled_checks
+        click.echo(f"Sampling dataset: {data_path} (up to {sample_size} rows)")
+        with span(profiler, "run_sampled_checks", kind="analysis") as s:
+            results = run_sampled_checks(
+                iter_chunks(data_path, chunksize or DEFAULT_CHUNKSIZE, schema=load_schema(schema_path)),
+                sample_size, target=target, stratify=stratify, confidence=confidence,
+                ci_width=ci_width, seed=seed, quantile_error=quantile_error,
+                hll_precision=hll_precision, top_duplicates=top_duplicates
+            )
+            s["rows"] = results["dataset"]["rows"]
+        lo, hi = results["sample"]["intervals"]["dataset_score"]
+        click.echo(
+            f"🔍 Checked {results['sample']['rows']} of {results['sample']['population_rows']} rows; "
+            f"dataset score {confidence:.0%} interval: {lo} – {hi}"
+        )
+        write_reports(results, report, profiler, html_gzip, binary)
+        return
+
+    if incremental:
+        if spill_dir or workers:
+            raise click.UsageError("--incremental cannot be combined with --spill-dir or --workers")
+        from dqcheck.incremental import run_incremental_checks, state_path_for
+        state_path = state_path_for("data_quality_report.json")
+        click.echo(f"Loading dataset incrementally: {data_path} (state: {state_path})")
+        with span(profiler, "run_incremental_checks", kind="analysis") as s:
+            results, rows_read = run_incremental_checks(
+                data_path, state_path, target=target, quantile_error=quantile_error,
+                hll_precision=hll_precision, top_duplicates=top_duplicates,
+                chunksize=chunksize, schema=load_schema(schema_path)
+            )
+            s["rows"] = rows_read
+        click.echo(f"🔍 Checked {rows_read} new rows ({results['dataset']['rows']} in total)")
+        write_reports(results, report, profiler, html_gzip, binary)
+        return
+
+    from dqcheck.analyzer import run_all_checks, run_columnar_checks, run_streaming_checks
+    from dqcheck.batch import report_key as batch_report_key
+    from dqcheck.profile import profile_dataframe
+    from dqcheck.readers import detect_format
+
+    cache = open_cache(no_cache)
+    # Shared with batch, so either command reuses the other's reports.
+    report_key = batch_report_key(
+        target=target, chunksize=chunksize, quantile_error=quantile_error,
+        hll_precision=hll_precision, top_duplicates=top_duplicates, schema=schema_path,
+        duplicates=not no_duplicates
+    )
+    # A profiled run always re-runs the checks it is meant to measure.
+    results = cache.get(data_path, report_key) if cache and not profiler else None
+    profile = None
+
+    if results is not None:
+        click.echo(f"♻ Using cached results for {data_path}")
+    elif chunksize:
+        click.echo(f"Loading dataset: {data_path}")
+        click.echo(f"🔍 Streaming data quality checks ({chunksize} rows per chunk)...")
+        with span(profiler, "run_streaming_checks", kind="analysis") as s:
+            results = run_streaming_checks(
+                iter_chunks(data_path, chunksize, schema=load_schema(schema_path)), target=target,
+                quantile_error=quantile_error, hll_precision=hll_precision,
+                top_duplicates=top_duplicates, spill_dir=spill_dir, duplicates=not no_duplicates
+            )
+            s["rows"] = results["dataset"]["rows"]
+    elif detect_format(data_path) != "csv" and not workers:
+        click.echo(f"Loading dataset: {data_path}")
+        click.echo("🔍 Running data quality checks column by column...")
+        with span(profiler, "run_columnar_checks", kind="analysis") as s:
+            results = run_columnar_checks(
+                data_path, target=target, quantile_error=quantile_error,
+                hll_precision=hll_precision, top_duplicates=top_duplicates,
+                duplicates=not no_duplicates
+            )
+            s["rows"] = results["dataset"]["rows"]
+    else:
+        click.echo(f"Loading dataset: {data_path}")
+        df = load_dataset(data_path, profiler, engine=engine, schema=schema_path, compact=compact)
+
+        click.echo("🔍 Running data quality checks...")
+        profile = profile_dataframe(df, hll_precision=hll_precision)
+        results = run_all_checks(
+            df, target=target, quantile_error=quantile_error, hll_precision=hll_precision,
+            top_duplicates=top_duplicates, workers=workers, profile=profile, profiler=profiler,
+            duplicates=not no_duplicates
+        )
+
+    if cache is not None:
+        cache.put(data_path, report_key, results)
+        if profile is not None and not hll_precision:
+            cache.put(data_path, profiles_key(schema_path), profile.to_records())
+
+    write_reports(results, report, profiler, html_gzip, binary)
 
-    df = pd.read_csv(data_path)
 
-    click.echo("🔍 Running data quality checks...")
-    results = run_all_checks(df, target=target)
+def load_dataset(data_path, profiler, **options):
+    """read_dataset as a "load" span; bytes scanned is the file size."""
+    from dqcheck.readers import read_dataset
+    from dqcheck.tracing import span
+
+    with span(profiler, "read_dataset", kind="load", nbytes=os.path.getsize(data_path)) as s:
+        df = read_dataset(data_path, **options)
+        s["rows"] = len(df)
+    return df
+
+
+def write_reports(results, report, profiler=None, html_gzip=False, binary=False):
+    if profiler is not None:
+        profiler.stop()
+        results["performance"] = profiler.report()
+        echo_performance(results["performance"])
 
     if report in ("json", "both"):
+        from dqcheck.report import save_json_report
         save_json_report(results, "data_quality_report.json")
         click.echo("JSON report saved: data_quality_report.json")
 
     if report in ("html", "both"):
-        save_html_report(results, "data_quality_report.html")
-        click.echo("HTML report saved: data_quality_report.html")
+        from dqcheck.report import save_html_report
+        html_path = "data_quality_report.html.gz" if html_gzip else "data_quality_report.html"
+        save_html_report(results, html_path)
+        click.echo(f"HTML report saved: {html_path}")
+
+    if binary:
+        from dqcheck.serialize import save_report
+        save_report(results, "data_quality_report.arrow")
+        click.echo("Arrow report saved: data_quality_report.arrow")
 
     click.echo("\nDataset Health Score:")
     click.echo(f"   {results['scores']['dataset_score']} / 100")
 
     click.echo("\n✔ Analysis complete.")
 
+@cli.command()
+@click.argument("source")
+@click.option(
+    "--output-dir",
+    default="dqcheck_reports",
+    show_default=True,
+    type=click.Path(file_okay=False),
+    help="Directory for the per-file reports and batch_summary.json"
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Files analyzed at once, each on its own process (default: CPU count)"
+)
+@click.option("--target", default=None, help="Target column name (optional)")
+@click.option(
+    "--report",
+    default="json",
+    type=click.Choice(["json", "html", "both"]),
+    help="Report format to generate for each file"
+)
+@click.option(
+    "--chunksize",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Stream each file in chunks of this many rows instead of loading it whole"
+)
+@click.option(
+    "--quantile-error",
+    default=None,
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    help="Use approximate quantile sketches with this rank error for outlier fences"
+)
+@click.option(
+    "--hll-precision",
+    default=None,
+    type=click.IntRange(4, 18),
+    help="Estimate distinct counts with a HyperLogLog sketch of this precision"
+)
+@click.option(
+    "--top-duplicates",
+    default=0,
+    type=click.IntRange(min=0),
+    help="List this many of the most repeated rows (by fingerprint) in each report"
+)
+@html_gzip_option
+@ingestion_options
+@cache_option
+def batch(source, output_dir, workers, target, report, chunksize, quantile_error, hll_precision,
+          top_duplicates, html_gzip, engine, schema_path, compact, no_cache):
+    """
+    Analyze many files concurrently and rank them by dataset score.
+    SOURCE is a directory (searched recursively) or a glob pattern.
+    """
+    from dqcheck.batch import find_files, run_batch
+
+    paths, root = find_files(source)
+    if not paths:
+        raise click.BadParameter(f"no data files found in {source}", param_hint="SOURCE")
+
+    click.echo(f"🔍 Analyzing {len(paths)} files (reports in {output_dir})")
+
+    def progress(entry, done, total):
+        if "error" in entry:
+            click.echo(f"   [{done}/{total}] ✖ {entry['file']}: {entry['error']}")
+        else:
+            click.echo(f"   [{done}/{total}] {entry['file']}: "
+                       f"{entry['dataset_score']} / 100 ({entry['seconds']}s)")
+
+    summary = run_batch(
+        paths, output_dir, root=root, workers=workers, report_format=report, html_gzip=html_gzip,
+        options=dict(
+            target=target, chunksize=chunksize, quantile_error=quantile_error,
+            hll_precision=hll_precision, top_duplicates=top_duplicates,
+            engine=engine, schema=schema_path, compact=compact,
+        ),
+        use_cache=not no_cache, on_result=progress
+    )
+
+    click.echo(f"\nLowest dataset scores ({summary['analyzed']} analyzed, "
+               f"{summary['failed']} failed, {summary['seconds']}s):")
+    for entry in summary["ranking"][:10]:
+        click.echo(f"   {entry['dataset_score']:>6} / 100  {entry['file']}")
+    click.echo(f"\n📋 Summary saved: {os.path.join(output_dir, 'batch_summary.json')}")
+
+
 @cli.command()
 @click.argument("data_path", type=click.Path(exists=True))
 @click.option("--issue", required=True,type=click.Choice(["missing_values", "outliers", "errors", "high_cardinality"]))
 @click.option("--method", required=True, help="Fixing method")
 @click.option("--value", default=None, help="Optional value for the method")
 @click.option("--target", default=None, help="Target column (required for target encoding)")
-def fix(data_path, issue, method, value, target):
-
+@click.option(
+    "--quantile-error",
+    default=None,
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    help="Use approximate quantile sketches with this rank error for outlier fences"
+)
+@click.option(
+    "--save-fitted",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Also save the learned fix parameters here, for dqcheck apply"
+)
+@output_options("cleaned_data.csv")
+@ingestion_options
+@cache_option
+@profile_option
+def fix(data_path, issue, method, value, target, quantile_error, save_fitted, output_path,
+        compression, engine, schema_path, compact, no_cache, profiling):
+    from dqcheck.fitted import FittedFixer
+    from dqcheck.pipeline import apply_step
+    from dqcheck.profile import profile_dataframe
+    from dqcheck.serialize import write_json
+    from dqcheck.tracing import span
+    from dqcheck.writer import write_frame
+
+    check_output(output_path, compression)
+    profiler = start_profiler(profiling)
     click.echo(f"🛠 Fixing issue: {issue}")
-    df = pd.read_csv(data_path)
+    df = load_dataset(data_path, profiler, engine=engine, schema=schema_path, compact=compact)
+
+    # Column statistics left behind by a previous analyze of the same data
+    profile = None
+    cache = open_cache(no_cache)
+    records = cache.get(data_path, profiles_key(schema_path)) if cache else None
+    if records is not None:
+        click.echo("♻ Reusing cached column statistics")
+        profile = profile_dataframe(df).restore(records)
 
     # Dispatch to correct fixer
-    if issue == "missing_values":
-        cleaned_df, log = fix_missing_values(df, method, value)
+    step = {"issue": issue, "method": method, "value": value, "quantile_error": quantile_error}
+    with span(profiler, f"{issue}.{method}", kind="fix", df=df):
+        if save_fitted:
+            fitter, cleaned_df, log = FittedFixer.fit_transform(df, [step], target=target,
+                                                                profile=profile)
+            log = log[0]["changes"]
+        else:
+            cleaned_df, log = apply_step(df, step, target=target, profile=profile)
+    if save_fitted:
+        fitter.save(save_fitted)
+        click.echo(f"💾 Fitted parameters saved as {save_fitted}")
 
-    elif issue == "outliers":
-        cleaned_df, log = fix_outliers(df, method, value)
+    # Save outputs
+    with span(profiler, "write_frame", kind="write", rows=len(cleaned_df)):
+        write_frame(cleaned_df, output_path, compression=compression)
 
-    elif issue == "errors":
-        cleaned_df, log = fix_errors(df, method, value)
+    if profiler is not None:
+        # The change log gains a performance section next to the changes.
+        profiler.stop()
+        log = {"changes": log, "performance": profiler.report()}
+        echo_performance(log["performance"])
 
-    elif issue == "high_cardinality":
-        cleaned_df, log = fix_high_cardinality(
-            df, method, value=value, target=target
-        )
+    write_json(log, "change_log.json")
 
+    click.echo(f"✅ Cleaned data saved as {output_path}")
+    click.echo("📜 Change log saved as change_log.json")
+
+
+
+@cli.command()
+@click.argument("data_path", type=click.Path(exists=True))
+@click.option(
+    "--spec",
+    "spec_path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Pipeline spec (JSON, or YAML with PyYAML) listing fix steps in order"
+)
+@click.option("--target", default=None, help="Target column (for target encoding steps)")
+@click.option(
+    "--save-fitted",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Also save the learned parameters of every step here, for dqcheck apply"
+)
+@output_options(None)
+@ingestion_options
+@cache_option
+def pipeline(data_path, spec_path, target, save_fitted, output_path, compression, engine,
+             schema_path, compact, no_cache):
+    """
+    Run several fix steps on one load of the data and write the result once.
+    """
+    from dqcheck.fitted import FittedFixer
+    from dqcheck.pipeline import load_pipeline, run_pipeline
+    from dqcheck.profile import profile_dataframe
+    from dqcheck.readers import read_dataset
+    from dqcheck.serialize import write_json
+    from dqcheck.writer import write_frame
+
+    try:
+        spec = load_pipeline(spec_path)
+    except (ValueError, ImportError) as e:
+        raise click.BadParameter(str(e), param_hint="--spec")
+
+    output_path = output_path or spec["output"]
+    compression = compression or spec.get("compression")
+    check_output(output_path, compression)
+    steps = spec["steps"]
+    click.echo(f"🛠 Running {len(steps)} fix steps from {spec_path}")
+    df = read_dataset(data_path, engine=engine, schema=schema_path, compact=compact)
+
+    profile = None
+    cache = open_cache(no_cache)
+    records = cache.get(data_path, profiles_key(schema_path)) if cache else None
+    if records is not None:
+        profile = profile_dataframe(df).restore(records)
+
+    target = target or spec.get("target")
+    if save_fitted:
+        fitter, cleaned_df, log = FittedFixer.fit_transform(df, steps, target=target,
+                                                            profile=profile)
+        fitter.save(save_fitted)
+        click.echo(f"💾 Fitted parameters saved as {save_fitted}")
     else:
-        click.echo("❌ Unsupported issue type.")
-        return
+        cleaned_df, log = run_pipeline(df, steps, target=target, profile=profile)
+    for entry in log:
+        click.echo(f"   {entry['step']}. {entry['issue']} / {entry['method']}: "
+                   f"{len(entry['changes'])} columns changed")
 
-    # Save outputs
-    cleaned_df.to_csv("cleaned_data.csv", index=False)
+    write_frame(cleaned_df, output_path, compression=compression)
 
-    import json
-    with open("change_log.json", "w") as f:
-        json.dump(log, f, indent=2)
+    write_json(log, spec["change_log"])
 
-    click.echo("✅ Cleaned data saved as cleaned_data.csv")
-    click.echo("📜 Change log saved as change_log.json")
+    click.echo(f"✅ Cleaned data saved as {output_path}")
+    click.echo(f"📜 Change log saved as {spec['change_log']}")
+
+
+@cli.command()
+@click.argument("data_path", type=click.Path(exists=True))
+@click.option(
+    "--fitted",
+    "fitted_path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Parameters saved by fix / pipeline --save-fitted"
+)
+@click.option(
+    "--chunksize",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Rows per chunk  [default: 100000]"
+)
+@click.option(
+    "--schema",
+    "schema_path",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON file mapping CSV columns to dtypes"
+)
+@output_options("cleaned_data.csv")
+def apply(data_path, fitted_path, chunksize, schema_path, output_path, compression):
+    """
+    Apply previously fitted fixes to a dataset chunk by chunk.
+    """
+    from dqcheck.fitted import FittedFixer
+    from dqcheck.incremental import DEFAULT_CHUNKSIZE
+    from dqcheck.readers import iter_chunks, load_schema
+    from dqcheck.writer import ChunkWriter
+
+    check_output(output_path, compression)
+    fitter = FittedFixer.load(fitted_path)
+    click.echo(f"🛠 Applying {len(fitter.steps)} fitted steps from {fitted_path}")
+
+    rows_in = 0
+    # Chunks are cleaned here while the writer thread encodes the last one.
+    with ChunkWriter(output_path, compression=compression) as writer:
+        for chunk in iter_chunks(data_path, chunksize or DEFAULT_CHUNKSIZE, schema=load_schema(schema_path)):
+            rows_in += len(chunk)
+            writer.write(fitter.transform(chunk))
+
+    click.echo(f"✅ {writer.rows} of {rows_in} rows saved as {output_path}")
 
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to listen on")
+@click.option("--port", default=8765, show_default=True, type=click.IntRange(0, 65535),
+              help="TCP port (0 picks a free one)")
+@click.option(
+    "--socket",
+    "socket_path",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Listen on this Unix socket instead of TCP"
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Warm worker processes, i.e. jobs run at once (default: CPU count)"
+)
+@click.option(
+    "--queue-size",
+    default=32,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Jobs allowed to wait for a worker; further jobs get 503 until one finishes"
+)
+@click.option(
+    "--cache-mb",
+    default=512,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Memory per worker for loaded frames and their profiles"
+)
+@click.option(
+    "--output-dir",
+    default=".",
+    show_default=True,
+    type=click.Path(file_okay=False),
+    help="Directory jobs may write outputs in; relative output paths are taken from it"
+)
+@click.option(
+    "--token",
+    default=None,
+    envvar="DQCHECK_SERVE_TOKEN",
+    help="Require 'Authorization: Bearer TOKEN' on every request (env: DQCHECK_SERVE_TOKEN)"
+)
+@cache_option
+def serve(host, port, socket_path, workers, queue_size, cache_mb, output_dir, token, no_cache):
+    """
+    Serve analyze and fix jobs from warm worker processes.
+    POST a JSON job to /analyze or /fix; GET /status for the queue.
+    """
+    import asyncio
+
+    from dqcheck.server import serve as run_server
+
+    def ready(address, server):
+        click.echo(f"🚀 Serving on {address} with {server.pool.workers} warm workers "
+                   f"(queue: {queue_size} jobs)")
+        click.echo(f"   Outputs are written under {server.output_dir}"
+                   + ("; requests need the bearer token" if token else ""))
+
+    asyncio.run(run_server(
+        host=host, port=port, socket_path=socket_path, workers=workers, queue_size=queue_size,
+        cache_bytes=cache_mb * 2**20, use_cache=not no_cache, output_dir=output_dir,
+        token=token, on_ready=ready
+    ))
+    click.echo("👋 Server stopped")
@@ -0,0 +1,223 @@
+import heapq
+import os
+import tempfile
+
+import pandas as pd
+import numpy as np
+
+from dqcheck.sketches import hash_values
+
+# -----------------------------
+# HASHED DUPLICATE DETECTION
+# -----------------------------
+# Rows are reduced to 64-bit fingerprints with a vectorized row hash and
+# duplicates are counted as rows minus distinct fingerprints, so no row
+# values are kept.  For each fingerprint only its count and the first two
+# row positions are retained, which is enough to point at an example of
+# every duplicated row.  With a spill directory, fingerprints are
+# appended to on-disk partition files (split on the top hash bits) and
+# counted one partition at a time, bounding memory by the largest
+# partition rather than by the number of distinct rows.
+
+_ENTRY = np.dtype([("fp", "<u8"), ("idx", "<i8"), ("cnt", "<i8")])
+
+
+def column_hash(series: pd.Series) -> np.ndarray:
+    """
+    64-bit hash per value, the same whatever dtype the column was parsed
+    as in this chunk (see sketches.hash_values).
+    """
+    return hash_values(series)
+
+
+class RowHasher:
+    """
+    Folds column hashes into row hashes one column at a time (the same
+    tuple-hash combination pandas' hash_pandas_object uses), so a row
+    fingerprint can be built without ever holding more than one column.
+    """
+
+    def __init__(self, num_columns: int):
+        self.num_columns = num_columns
+        self.added = 0
+        self.mult = np.uint64(1000003)
+        self.out = None
+
+    def add(self, hashes: np.ndarray):
+        if self.out is None:
+            self.out = np.zeros_like(hashes) + np.uint64(0x345678)
+        inverse_i = self.num_columns - self.added
+        self.out ^= hashes
+        self.out *= self.mult
+        self.mult += np.uint64(82520 + inverse_i + inverse_i)
+        self.added += 1
+        return self
+
+    def result(self) -> np.ndarray:
+        if self.added != self.num_columns:
+            raise ValueError(f"Expected {self.num_columns} columns, got {self.added}")
+        if self.out is None:
+            return np.array([], dtype="uint64")
+        return self.out + np.uint64(97531)
+
+
+def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash per row."""
+    hasher = RowHasher(df.shape[1])
+    for col in range(df.shape[1]):
+        hasher.add(column_hash(df.iloc[:, col]))
+    return hasher.result()
+
+
+def _entries(fps, idx, cnt):
+    out = np.empty(len(fps), dtype=_ENTRY)
+    out["fp"], out["idx"], out["cnt"] = fps, idx, cnt
+    return out
+
+
+def fold_entries(entries: np.ndarray) -> np.ndarray:
+    """
+    Collapse (fingerprint, row, count) entries to at most two per
+    fingerprint: the first row carrying the total count and, if the
+    fingerprint repeats, the second row with a count of zero.
+    """
+    if len(entries) == 0:
+        return entries
+    idx = entries["idx"]
+    if np.any(idx[1:] < idx[:-1]):
+        entries = entries[np.argsort(idx, kind="stable")]
+
+    # factorize numbers fingerprints in order of first appearance, so a
+    # row is a fingerprint's first occurrence exactly when its code exceeds
+    # every code before it.
+    codes, _ = pd.factorize(entries["fp"])
+    prev_max = np.r_[-1, np.maximum.accumulate(codes)[:-1]]
+    is_first = codes > prev_max
+
+    first = entries[is_first]
+    first["cnt"] = np.bincount(codes, weights=entries["cnt"]).astype("int64")
+
+    rest = np.flatnonzero(~is_first)
+    _, pos = np.unique(codes[rest], return_index=True)
+    second = entries[rest[pos]]
+    second["cnt"] = 0
+    return np.concatenate([first, second])
+
+
+class FingerprintCounter:
+    """
+    Counts distinct row fingerprints across chunks, in memory or spilled
+    to disk.  Rows are identified by their position in the stream, so
+    merge(other) assumes other's rows come after this counter's rows.
+    """
+
+    def __init__(self, spill_dir=None, partitions=64):
+        self.rows = 0
+        self.entries = []
+        self.pending = 0
+        self.state_size = 0
+        self.spill_dir = None
+        self.partition_bits = 0
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_dir = tempfile.mkdtemp(prefix="dqcheck-dups-", dir=spill_dir)
+            self.partition_bits = max(1, int(np.ceil(np.log2(partitions))))
+
+    # ---------- BUILDING ----------
+
+    def update(self, chunk: pd.DataFrame):
+        return self.add_fingerprints(row_fingerprints(chunk))
+
+    def add_fingerprints(self, fps: np.ndarray):
+        idx = np.arange(self.rows, self.rows + len(fps), dtype="int64")
+        self.rows += len(fps)
+        self._add(fold_entries(_entries(fps, idx, np.ones(len(fps), dtype="int64"))))
+        return self
+
+    def merge(self, other):
+        offset = self.rows
+        self.rows += other.rows
+        for part in other._parts():
+            part = part.copy()
+            part["idx"] += offset
+            self._add(part)
+        other.close()
+        return self
+
+    def _add(self, entries):
+        if self.spill_dir is not None:
+            self._spill(entries)
+            return
+        self.entries.append(entries)
+        self.pending += len(entries)
+        if self.pending > max(self.state_size, 1 << 16):
+            self._compact()
+
+    def _compact(self):
+        if len(self.entries) > 1:
+            self.entries = [fold_entries(np.concatenate(self.entries))]
+        self.pending = 0
+        self.state_size = len(self.entries[0]) if self.entries else 0
+
+    def _partition_path(self, part):
+        return os.path.join(self.spill_dir, f"part-{part:05d}.bin")
+
+    def _spill(self, entries):
+        shift = np.uint64(64 - self.partition_bits)
+        parts = (entries["fp"] >> shift).astype("int64")
+        order = np.argsort(parts, kind="stable")
+        entries, parts = entries[order], parts[order]
+        bounds = np.flatnonzero(np.r_[True, parts[1:] != parts[:-1], True])
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            with open(self._partition_path(int(parts[start])), "ab") as f:
+                entries[start:end].tofile(f)
+
+    def _parts(self):
+        """Folded entries, one array per partition (a single one in memory)."""
+        if self.spill_dir is None:
+            self._compact()
+            yield from self.entries
+            return
+        for name in sorted(os.listdir(self.spill_dir)):
+            yield fold_entries(np.fromfile(os.path.join(self.spill_dir, name), dtype=_ENTRY))
+
+    # ---------- RESULTS ----------
+
+    def result(self, top: int = 0):
+        """
+        (duplicate_count, top_duplicates) where top_duplicates lists the
+        `top` most repeated fingerprints with their count and the first
+        two row positions holding that row.
+        """
+        distinct = 0
+        best = []
+        for part in self._parts():
+            counted = part[part["cnt"] > 0]
+            distinct += len(counted)
+            if not top:
+                continue
+            repeated = counted[counted["cnt"] > 1]
+            repeated = repeated[np.lexsort((repeated["idx"], -repeated["cnt"]))[:top]]
+            seconds = part[part["cnt"] == 0]
+            second_of = dict(zip(seconds["fp"].tolist(), seconds["idx"].tolist()))
+            for fp, idx, cnt in repeated.tolist():
+                item = (cnt, -idx, fp, [idx, second_of.get(fp)])
+                if len(best) < top:
+                    heapq.heappush(best, item)
+                else:
+                    heapq.heappushpop(best, item)
+
+        top_duplicates = [
+            {"fingerprint": f"{fp:016x}", "count": int(cnt), "example_rows": rows}
+            for cnt, _, fp, rows in sorted(best, reverse=True)
+        ]
+        return self.rows - distinct, top_duplicates
+
+    def close(self):
+        if self.spill_dir is None:
+            self.entries = []
+            return
+        for name in os.listdir(self.spill_dir):
+            os.remove(os.path.join(self.spill_dir, name))
+        os.rmdir(self.spill_dir)
+        self.spill_dir = None
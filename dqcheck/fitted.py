@@ -0,0 +1,146 @@
+import gzip
+import json
+
+import pandas as pd
+
+from dqcheck.fixer import (
+    apply_high_cardinality, apply_missing_values, apply_outliers,
+    fit_high_cardinality, fit_missing_values, fit_outliers, fix_errors
+)
+from dqcheck.serialize import plain
+
+# -----------------------------
+# FITTED FIXERS
+# -----------------------------
+# The fixers in dqcheck.fixer learn their statistics (fill values, IQR
+# fences, top categories, frequency and target maps) from the data they
+# clean.  A FittedFixer learns them once -- e.g. on a sample -- and then
+# applies them to any number of chunks without looking at the data
+# again, so a stream is cleaned chunk by chunk and the serving path uses
+# exactly the parameters training did.  Fitting and applying are the
+# fixers' own fit_* / apply_* halves, so on the data it was fitted on,
+# transform() gives the same frame as running the fixers.
+#
+# Parameters are saved as JSON (gzip-compressed for a .gz path).  Maps
+# keyed by column or category are stored as key / value lists so
+# non-string keys survive; values are encoded like report values.
+
+FORMAT = "dqcheck-fitted"
+VERSION = 2
+
+# Parameters keyed by column name.
+COLUMN_MAPS = ("fill", "columns")
+
+
+def _encode(params):
+    return {
+        key: {"keys": list(entry), "values": list(entry.values())}
+        if key in COLUMN_MAPS and isinstance(entry, dict) else entry
+        for key, entry in params.items()
+    }
+
+
+def _decode(params):
+    # The column list of missing-value drops stays a list.
+    return {
+        key: dict(zip(entry["keys"], entry["values"]))
+        if key in COLUMN_MAPS and isinstance(entry, dict) else entry
+        for key, entry in params.items()
+    }
+
+
+# ---------- FITTED FIXER ----------
+
+class FittedFixer:
+    """Fix steps with their learned parameters."""
+
+    def __init__(self, steps, target=None):
+        self.steps = steps
+        self.target = target
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, steps, target=None):
+        """
+        Learn every step's parameters from df.  Steps are fitted in order,
+        each on df as transformed by the steps before it (as in a pipeline).
+        """
+        return cls.fit_transform(df, steps, target=target)[0]
+
+    @classmethod
+    def fit_transform(cls, df: pd.DataFrame, steps, target=None, profile=None):
+        """
+        Fit the steps on df and apply them as they are fitted.  A profile
+        describes df as given, so only the first step reads from it.
+        Returns (fitter, cleaned_df, log), the last two as
+        dqcheck.pipeline.run_pipeline gives them.
+        """
+        fitter = cls([], target=target)
+        df = df.copy(deep=False)
+        change_log = []
+        for i, step in enumerate(steps, start=1):
+            issue, method, value = step["issue"], step["method"], step.get("value")
+            step_profile = profile if i == 1 else None
+            if issue == "missing_values":
+                params, log = fit_missing_values(df, method, value, profile=step_profile)
+            elif issue == "outliers":
+                params, log = fit_outliers(df, method, value, step.get("quantile_error"),
+                                           profile=step_profile)
+            elif issue == "errors":
+                params = {}
+            else:
+                params, log = fit_high_cardinality(df, method, value, step.get("target", target))
+            fitted = {"issue": issue, "method": method, "value": value, "params": params}
+            fitter.steps.append(fitted)
+            if issue == "errors":
+                df, log = fix_errors(df, method, value, copy=False)
+            else:
+                df = fitter._apply_step(df, fitted)
+            change_log.append({"step": i, "issue": issue, "method": method, "changes": log})
+        return fitter, df, change_log
+
+    def _apply_step(self, df, step):
+        issue, method, params = step["issue"], step["method"], step["params"]
+        if issue == "missing_values":
+            return apply_missing_values(df, method, params, copy=False)
+        if issue == "outliers":
+            return apply_outliers(df, method, params, copy=False)
+        if issue == "errors":
+            return fix_errors(df, method, step["value"], copy=False)[0]
+        return apply_high_cardinality(df, method, params, copy=False)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Apply the fitted steps to df (not modified) without re-learning anything."""
+        df = df.copy(deep=False)
+        for step in self.steps:
+            df = self._apply_step(df, step)
+        return df
+
+    def transform_chunks(self, chunks):
+        for chunk in chunks:
+            yield self.transform(chunk)
+
+    # ---------- SERIALIZATION ----------
+
+    def to_dict(self):
+        steps = [dict(step, params=_encode(step["params"])) for step in self.steps]
+        return {"format": FORMAT, "version": VERSION, "target": self.target, "steps": steps}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("format") != FORMAT or data.get("version") not in (1, VERSION):
+            raise ValueError("Not a dqcheck fitted fixer file (or an unsupported version)")
+        steps = data["steps"]
+        if data["version"] > 1:
+            steps = [dict(step, params=_decode(step["params"])) for step in steps]
+        return cls(steps, target=data.get("target"))
+
+    def save(self, path):
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "wt") as f:
+            json.dump(self.to_dict(), f, default=plain)
+
+    @classmethod
+    def load(cls, path):
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rt") as f:
+            return cls.from_dict(json.load(f))
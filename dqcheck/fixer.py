@@ -1,21 +1,83 @@
 import pandas as pd
 import numpy as np
 
+from pandas.util import hash_array
 
-def fix_missing_values(df: pd.DataFrame, method: str, value=None):
-    """
-    Fix missing values using a specified method.
-    Returns cleaned dataframe and change log.
-    """
-    cleaned_df = df.copy()
-    change_log = []
+from dqcheck.blanks import normalize_blanks
+from dqcheck.sketches import sketch_series, sketch_fences
+
+
+# Fixers never write into the arrays of the frame they are given: they
+# start from a shallow copy and replace whole columns, so the input's
+# columns are shared until a fix touches them (copy-on-write by column).
+# Row removals across columns are collected in one boolean keep-mask that
+# is applied once at the end, instead of re-slicing the frame per column;
+# statistics for each column are computed over the rows still kept, so
+# results match removing rows column by column.
+#
+# Each fixer is a fit / apply pair: fit_* learns the parameters (fill
+# values, fences, category maps) and the change log from a frame, and
+# apply_* applies parameters to any frame without looking at its
+# statistics.  fix_* runs both on the same frame; dqcheck.fitted keeps
+# the parameters to apply them to later data.  For fix_* the fit only
+# covers the columns the fix changes; fitted fixers (flagged_only=False)
+# also keep parameters that do nothing here but may apply to later data.
+
+
+def _start(df, copy):
+    return df.copy(deep=False) if copy else df
+
+
+def _kept(series, keep):
+    return series if keep is None else series[keep]
+
+
+def _drop_rows(keep, mask):
+    """Fold a removal mask into the keep-mask (None = every row kept)."""
+    return ~mask if keep is None else keep & ~mask
 
-    # Normalize blanks to NaN
-    cleaned_df.replace(r"^\s*$", np.nan, regex=True, inplace=True)
 
-    for col in cleaned_df.columns:
-        missing_count = cleaned_df[col].isnull().sum()
-        if missing_count == 0:
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _pairs(series: pd.Series) -> dict:
+    # Parallel key / value lists rather than a dict, so non-string keys
+    # survive a JSON round trip.
+    return {
+        "keys": [_plain(k) for k in series.index],
+        "values": [_plain(v) for v in series.to_numpy()],
+    }
+
+
+def _mapping(pairs) -> dict:
+    return dict(zip(pairs["keys"], pairs["values"]))
+
+
+def _normalized(df, profile=None):
+    blank_columns = None
+    if profile is not None:
+        blank_columns = [col for col in df.columns if profile[col].blank_count]
+    return normalize_blanks(df, columns=blank_columns)
+
+
+def _fit_missing(df, method, value, profile, flagged_only):
+    change_log = []
+    keep = None
+    fill = {}
+
+    for col in df.columns:
+        # Cached statistics describe the full dataset; once rows have been
+        # dropped, later columns are counted on what is left.
+        if profile is not None and keep is None:
+            missing = None
+            missing_count = profile[col].null_count + profile[col].blank_count
+        else:
+            missing = df[col].isnull().to_numpy()
+            if keep is not None:
+                missing &= keep
+            missing_count = missing.sum()
+        if missing_count == 0 and (flagged_only or method == "drop"):
             continue
 
         entry = {
@@ -24,54 +86,97 @@ def fix_missing_values(df: pd.DataFrame, method: str, value=None):
             "method": method
         }
 
-        # Numeric columns
-        if pd.api.types.is_numeric_dtype(cleaned_df[col]):
-            if method == "mean":
-                fill_value = cleaned_df[col].mean()
-            elif method == "median":
-                fill_value = cleaned_df[col].median()
-            elif method == "drop":
-                cleaned_df = cleaned_df.dropna(subset=[col])
-                entry["rows_dropped"] = int(missing_count)
-                change_log.append(entry)
-                continue
-            elif method == "constant":
-                fill_value = value
-            else:
-                continue
+        if method == "drop":
+            if missing is None:
+                missing = df[col].isnull().to_numpy()
+            keep = _drop_rows(keep, missing)
+            entry["rows_dropped"] = int(missing_count)
+            change_log.append(entry)
+            continue
 
+        column = df[col]
+        numeric = pd.api.types.is_numeric_dtype(column)
+        if method == "constant":
+            fill_value = value
+        # Numeric columns
+        elif numeric and method == "mean":
+            fill_value = column.mean()
+        elif numeric and method == "median":
+            fill_value = column.median()
         # Categorical columns
-        else:
-            if method == "mode":
-                fill_value = cleaned_df[col].mode().iloc[0]
-            elif method == "constant":
-                fill_value = value
-            elif method == "drop":
-                cleaned_df = cleaned_df.dropna(subset=[col])
-                entry["rows_dropped"] = int(missing_count)
-                change_log.append(entry)
-                continue
-            else:
+        elif not numeric and method == "mode":
+            mode = column.mode()
+            if mode.empty:
                 continue
+            fill_value = mode.iloc[0]
+        else:
+            continue
 
-        cleaned_df[col].fillna(fill_value, inplace=True)
-        entry["fill_value"] = fill_value
-        change_log.append(entry)
+        fill[col] = _plain(fill_value)
+        if missing_count:
+            entry["fill_value"] = fill_value
+            change_log.append(entry)
+
+    if method == "drop":
+        return {"columns": list(df.columns)}, change_log
+    return {"fill": fill}, change_log
+
+
+def _apply_missing(df, method, params):
+    if method == "drop":
+        missing = np.zeros(len(df), dtype=bool)
+        for col in params["columns"]:
+            if col in df.columns:
+                missing |= df[col].isnull().to_numpy()
+        return df[~missing] if missing.any() else df
+    for col, fill_value in params["fill"].items():
+        if col in df.columns:
+            df[col] = df[col].fillna(fill_value)
+    return df
 
-    return cleaned_df, change_log
 
-def fix_outliers(df: pd.DataFrame, method: str, value=None):
+def fit_missing_values(df: pd.DataFrame, method: str, value=None, profile=None,
+                       flagged_only=False):
     """
-    Fix outliers in numeric columns using specified method.
+    Learn fix_missing_values' parameters from df (not modified).
+    Returns (params, change_log) -- the change log fix_missing_values
+    would give for df.
+    """
+    return _fit_missing(_normalized(df, profile), method, value, profile, flagged_only)
+
+
+def apply_missing_values(df: pd.DataFrame, method: str, params, copy=True):
+    """Apply parameters from fit_missing_values to df; returns the cleaned frame."""
+    return _apply_missing(normalize_blanks(_start(df, copy)), method, params)
+
+
+def fix_missing_values(df: pd.DataFrame, method: str, value=None, profile=None, copy=True):
+    """
+    Fix missing values using a specified method.
+    With a DatasetProfile (e.g. from the stats cache), missing counts are
+    read from it instead of rescanning each column.  copy=False lets the
+    fixer modify df itself (see dqcheck.pipeline).
     Returns cleaned dataframe and change log.
     """
-    cleaned_df = df.copy()
+    # Normalize blanks to NaN
+    cleaned_df = _normalized(_start(df, copy), profile)
+    params, change_log = _fit_missing(cleaned_df, method, value, profile, flagged_only=True)
+    return _apply_missing(cleaned_df, method, params), change_log
+
+def _fit_outliers(df, method, value, quantile_error, profile, flagged_only):
+    columns = {}
     change_log = []
+    keep = None
 
-    numeric_cols = cleaned_df.select_dtypes(include=np.number).columns
+    for col in df.select_dtypes(include=np.number).columns:
+        cached = None
+        if not quantile_error and profile is not None and keep is None:
+            cached = profile[col]
+            if cached.outlier_count == 0 and flagged_only:
+                continue
 
-    for col in numeric_cols:
-        series = cleaned_df[col].dropna()
+        column = df[col]
+        series = _kept(column, keep).dropna()
 
         if series.empty:
             continue
@@ -79,16 +184,28 @@ def fix_outliers(df: pd.DataFrame, method: str, value=None):
         entry = {"column": col, "method": method}
 
         # IQR calculation
-        q1 = series.quantile(0.25)
-        q3 = series.quantile(0.75)
-        iqr = q3 - q1
-        lower = q1 - 1.5 * iqr
-        upper = q3 + 1.5 * iqr
-
-        outlier_mask = (cleaned_df[col] < lower) | (cleaned_df[col] > upper)
+        if cached is not None:
+            lower, upper = cached.fences()
+        elif quantile_error:
+            lower, upper, _ = sketch_fences(sketch_series(series, quantile_error))
+            entry["quantile_error"] = quantile_error
+        else:
+            q1 = series.quantile(0.25)
+            q3 = series.quantile(0.75)
+            iqr = q3 - q1
+            lower = q1 - 1.5 * iqr
+            upper = q3 + 1.5 * iqr
+
+        outlier_mask = ((column < lower) | (column > upper)).to_numpy()
+        if keep is not None:
+            outlier_mask &= keep
         outlier_count = int(outlier_mask.sum())
 
         if outlier_count == 0:
+            # cap and remove are harmless where nothing lies outside the
+            # fences and still apply to later data.
+            if not flagged_only and method in ("cap", "remove"):
+                columns[col] = {"lower": _plain(lower), "upper": _plain(upper)}
             continue
 
         entry["outliers_before"] = outlier_count
@@ -96,32 +213,34 @@ def fix_outliers(df: pd.DataFrame, method: str, value=None):
         # ---------- METHODS ----------
 
         if method == "cap":
-            cleaned_df.loc[cleaned_df[col] < lower, col] = lower
-            cleaned_df.loc[cleaned_df[col] > upper, col] = upper
+            columns[col] = {"lower": _plain(lower), "upper": _plain(upper)}
             entry["cap_lower"] = lower
             entry["cap_upper"] = upper
 
         elif method == "remove":
-            cleaned_df = cleaned_df[~outlier_mask]
+            columns[col] = {"lower": _plain(lower), "upper": _plain(upper)}
+            keep = _drop_rows(keep, outlier_mask)
             entry["rows_removed"] = outlier_count
 
         elif method == "log":
-            cleaned_df[col] = np.log1p(cleaned_df[col])
+            columns[col] = {}
             entry["transform"] = "log1p"
 
         elif method == "clip_percentile":
             low_p = float(value.split(",")[0])
             high_p = float(value.split(",")[1])
-            low_val = series.quantile(low_p)
-            high_val = series.quantile(high_p)
-            cleaned_df[col] = cleaned_df[col].clip(low_val, high_val)
+            columns[col] = {"lower": _plain(series.quantile(low_p)),
+                            "upper": _plain(series.quantile(high_p))}
             entry["clip_range"] = f"{low_p}-{high_p}"
 
         elif method == "zscore":
             mean = series.mean()
             std = series.std()
-            z_mask = ((cleaned_df[col] - mean).abs() / std) > 3
-            cleaned_df = cleaned_df[~z_mask]
+            columns[col] = {"mean": _plain(mean), "std": _plain(std)}
+            z_mask = (((column - mean).abs() / std) > 3).to_numpy()
+            if keep is not None:
+                z_mask &= keep
+            keep = _drop_rows(keep, z_mask)
             entry["rows_removed"] = int(z_mask.sum())
 
         else:
@@ -129,15 +248,65 @@ def fix_outliers(df: pd.DataFrame, method: str, value=None):
 
         change_log.append(entry)
 
-    return cleaned_df, change_log
+    return {"columns": columns}, change_log
 
 
-def fix_errors(df: pd.DataFrame, method: str, value=None):
+def _apply_outliers(df, method, params):
+    drop = np.zeros(len(df), dtype=bool)
+    for col, p in params["columns"].items():
+        if col not in df.columns:
+            continue
+        column = df[col]
+        if method in ("cap", "clip_percentile"):
+            df[col] = column.clip(p["lower"], p["upper"])
+        elif method == "log":
+            df[col] = np.log1p(column)
+        elif method == "remove":
+            drop |= ((column < p["lower"]) | (column > p["upper"])).to_numpy()
+        elif method == "zscore":
+            drop |= (((column - p["mean"]).abs() / p["std"]) > 3).to_numpy()
+    # A row outside any column's fences goes, which is what removing rows
+    # column by column over the rows still kept amounts to.
+    return df[~drop] if drop.any() else df
+
+
+def fit_outliers(df: pd.DataFrame, method: str, value=None, quantile_error=None, profile=None,
+                 flagged_only=False):
+    """
+    Learn fix_outliers' parameters from df (not modified).
+    Returns (params, change_log) -- the change log fix_outliers would give
+    for df.
+    """
+    return _fit_outliers(df, method, value, quantile_error, profile, flagged_only)
+
+
+def apply_outliers(df: pd.DataFrame, method: str, params, copy=True):
+    """Apply parameters from fit_outliers to df; returns the cleaned frame."""
+    return _apply_outliers(_start(df, copy), method, params)
+
+
+def fix_outliers(df: pd.DataFrame, method: str, value=None, quantile_error=None, profile=None,
+                 copy=True):
+    """
+    Fix outliers in numeric columns using specified method.
+    With quantile_error set, IQR fences come from an approximate quantile
+    sketch with that rank error instead of exact quartiles.  With a
+    DatasetProfile, exact fences and outlier counts are read from it.
+    Returns cleaned dataframe and change log.
+    """
+    cleaned_df = _start(df, copy)
+    params, change_log = _fit_outliers(
+        cleaned_df, method, value, quantile_error, profile, flagged_only=True
+    )
+    return _apply_outliers(cleaned_df, method, params), change_log
+
+
+def fix_errors(df: pd.DataFrame, method: str, value=None, copy=True):
     """
     Fix invalid / inconsistent data values.
     Returns cleaned dataframe and change log.
     """
-    cleaned_df = df.copy()
+    cleaned_df = _start(df, copy)
     change_log = []
 
     # ---------- METHOD: RANGE CLIP ----------
@@ -149,8 +318,7 @@ def fix_errors(df: pd.DataFrame, method: str, value=None):
         invalid_mask = (cleaned_df[col] < min_val) | (cleaned_df[col] > max_val)
         count = int(invalid_mask.sum())
 
-        cleaned_df.loc[cleaned_df[col] < min_val, col] = min_val
-        cleaned_df.loc[cleaned_df[col] > max_val, col] = max_val
+        cleaned_df[col] = cleaned_df[col].clip(min_val, max_val)
 
         change_log.append({
             "column": col,
@@ -241,18 +409,55 @@ def fix_errors(df: pd.DataFrame, method: str, value=None):
     return cleaned_df, change_log
 
 
-def fix_high_cardinality(df: pd.DataFrame, method: str, value=None, target=None):
-    """
-    Fix high-cardinality categorical features using explicit user-selected methods.
-    Returns cleaned dataframe and change log.
-    """
-    cleaned_df = df.copy()
-    change_log = []
+# -----------------------------
+# FEATURE HASHING
+# -----------------------------
+# Buckets come from pandas' stable 64-bit hash (SipHash with a fixed key)
+# of each distinct value, mapped back to rows through factorize codes.
+# Unlike Python's hash() this does not depend on PYTHONHASHSEED, so the
+# same value lands in the same bucket in every process, chunk and run.
+
+DEFAULT_HASH_BINS = 16
+
+
+def _hash_key(seed: int = 0) -> str:
+    # hash_array keys are 16 characters; seed 0 keeps pandas' default key.
+    return "0123456789123456" if not seed else f"{seed:016x}"[-16:]
+
+
+def hash_buckets(series: pd.Series, bins: int, seed: int = 0) -> np.ndarray:
+    """Stable bucket in [0, bins) per value; nulls share one bucket."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    hashes = hash_array(np.asarray(uniques, dtype=object), categorize=False,
+                        hash_key=_hash_key(seed))
+    return (hashes % np.uint64(bins)).astype("int64")[codes]
+
 
-    categorical_cols = cleaned_df.select_dtypes(include="object").columns
+def hashed_features(series: pd.Series, bins: int, seed: int = 0) -> pd.DataFrame:
+    """One sparse 0/1 indicator column per bucket, named <column>_hash_<i>."""
+    buckets = hash_buckets(series, bins, seed)
+    return pd.DataFrame({
+        f"{series.name}_hash_{b}": pd.arrays.SparseArray(
+            (buckets == b).astype("uint8"), fill_value=0
+        )
+        for b in range(bins)
+    }, index=series.index)
 
-    for col in categorical_cols:
-        unique_count = cleaned_df[col].nunique()
+
+def parse_hashing(value):
+    # value format: bins or bins:seed
+    if not value:
+        return DEFAULT_HASH_BINS, 0
+    bins, _, seed = str(value).partition(":")
+    return int(bins), int(seed or 0)
+
+
+def _fit_cardinality(df, method, value, target):
+    columns = {}
+    change_log = []
+
+    for col in df.select_dtypes(include="object").columns:
+        unique_count = df[col].nunique()
 
         # Skip low-cardinality columns
         if unique_count < 20:
@@ -266,46 +471,51 @@ def fix_high_cardinality(df: pd.DataFrame, method: str, value=None, target=None)
 
         # ---------- METHOD: DROP ----------
         if method == "drop":
-            cleaned_df.drop(columns=[col], inplace=True)
+            columns[col] = {}
             entry["action"] = "column_dropped"
 
         # ---------- METHOD: GROUP RARE ----------
         elif method == "group_rare":
             top_k = int(value) if value else 20
-            top_values = cleaned_df[col].value_counts().nlargest(top_k).index
-            cleaned_df[col] = cleaned_df[col].where(
-                cleaned_df[col].isin(top_values), "Other"
-            )
+            top_values = df[col].value_counts().nlargest(top_k).index
+            columns[col] = {"keep": [_plain(v) for v in top_values]}
+            # Every kept category occurs; everything else, nulls included,
+            # becomes "Other".
+            grouped = not df[col].isin(top_values).all() and "Other" not in top_values
             entry["kept_categories"] = top_k
-            entry["unique_after"] = cleaned_df[col].nunique()
+            entry["unique_after"] = len(top_values) + int(grouped)
 
         # ---------- METHOD: FREQUENCY ENCODE ----------
         elif method == "frequency_encode":
-            freq_map = cleaned_df[col].value_counts()
-            cleaned_df[col] = cleaned_df[col].map(freq_map)
+            columns[col] = _pairs(df[col].value_counts())
             entry["encoding"] = "frequency"
 
         # ---------- METHOD: TARGET ENCODE ----------
         elif method == "target_encode":
-            if target is None or target not in cleaned_df.columns:
+            if target is None or target not in df.columns:
                 continue
-            mean_map = cleaned_df.groupby(col)[target].mean()
-            cleaned_df[col] = cleaned_df[col].map(mean_map)
+            columns[col] = _pairs(df.groupby(col)[target].mean())
             entry["encoding"] = "target_mean"
 
         # ---------- METHOD: HASHING ----------
         elif method == "hashing":
-            bins = int(value) if value else 16
-            cleaned_df[col] = cleaned_df[col].apply(
-                lambda x: hash(x) % bins
-            )
+            bins, seed = parse_hashing(value)
+            columns[col] = {}
+            entry["bins"] = bins
+            entry["seed"] = seed
+
+        # ---------- METHOD: SPARSE HASHED FEATURES ----------
+        elif method == "hashing_sparse":
+            bins, seed = parse_hashing(value)
+            columns[col] = {}
             entry["bins"] = bins
+            entry["seed"] = seed
+            entry["features"] = [f"{col}_hash_{b}" for b in range(bins)]
 
         # ---------- METHOD: EXTRACT FEATURES ----------
         elif method == "extract_features":
             # Works well for dates / codes
-            cleaned_df[f"{col}_length"] = cleaned_df[col].astype(str).str.len()
-            cleaned_df.drop(columns=[col], inplace=True)
+            columns[col] = {}
             entry["extracted"] = f"{col}_length"
 
         else:
@@ -313,4 +523,55 @@ def fix_high_cardinality(df: pd.DataFrame, method: str, value=None, target=None)
 
         change_log.append(entry)
 
-    return cleaned_df, change_log
+    params = {"columns": columns}
+    if method in ("hashing", "hashing_sparse"):
+        params["bins"], params["seed"] = parse_hashing(value)
+    return params, change_log
+
+
+def _apply_cardinality(df, method, params):
+    for col, p in params["columns"].items():
+        if col not in df.columns:
+            continue
+        if method == "drop":
+            df = df.drop(columns=[col])
+        elif method == "group_rare":
+            df[col] = df[col].where(df[col].isin(p["keep"]), "Other")
+        elif method in ("frequency_encode", "target_encode"):
+            df[col] = df[col].map(_mapping(p))
+        elif method == "hashing":
+            df[col] = hash_buckets(df[col], params["bins"], params["seed"])
+        elif method == "hashing_sparse":
+            features = hashed_features(df[col], params["bins"], params["seed"])
+            position = df.columns.get_loc(col)
+            df = df.drop(columns=[col])
+            for offset, name in enumerate(features.columns):
+                df.insert(position + offset, name, features[name])
+        elif method == "extract_features":
+            df[f"{col}_length"] = df[col].astype(str).str.len()
+            df = df.drop(columns=[col])
+    return df
+
+
+def fit_high_cardinality(df: pd.DataFrame, method: str, value=None, target=None):
+    """
+    Learn fix_high_cardinality's parameters from df (not modified).
+    Returns (params, change_log) -- the change log fix_high_cardinality
+    would give for df.
+    """
+    return _fit_cardinality(df, method, value, target)
+
+
+def apply_high_cardinality(df: pd.DataFrame, method: str, params, copy=True):
+    """Apply parameters from fit_high_cardinality to df; returns the cleaned frame."""
+    return _apply_cardinality(_start(df, copy), method, params)
+
+
+def fix_high_cardinality(df: pd.DataFrame, method: str, value=None, target=None, copy=True):
+    """
+    Fix high-cardinality categorical features using explicit user-selected methods.
+    Returns cleaned dataframe and change log.
+    """
+    cleaned_df = _start(df, copy)
+    params, change_log = _fit_cardinality(cleaned_df, method, value, target)
+    return _apply_cardinality(cleaned_df, method, params), change_log
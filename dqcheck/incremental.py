@@ -0,0 +1,93 @@
+import os
+import pickle
+
+from dqcheck.analyzer import StreamingChecks
+from dqcheck.readers import data_position, is_append_of, iter_chunks_between
+
+# -----------------------------
+# INCREMENTAL ANALYSIS
+# -----------------------------
+# For append-only datasets the streaming accumulators (value counts,
+# sketches, row fingerprints, class counts) are pickled next to the report
+# together with the position the data had reached.  The next run restores
+# them, reads only what was appended since and folds it in, so the report
+# costs time proportional to the new rows.  Whenever the saved state does
+# not match -- different file or options, or the file was rewritten rather
+# than appended to -- the dataset is analyzed from scratch.
+
+STATE_VERSION = 3
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def state_path_for(report_path) -> str:
+    return os.path.splitext(str(report_path))[0] + ".state.pkl"
+
+
+def load_state(state_path):
+    """The saved state dict, or None.  Only load state files you wrote: they are pickles."""
+    try:
+        with open(state_path, "rb") as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state_path, state):
+    tmp = f"{state_path}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, state_path)
+
+
+def run_incremental_checks(
+    path,
+    state_path,
+    target: str | None = None,
+    quantile_error: float | None = None,
+    hll_precision: int | None = None,
+    top_duplicates: int = 0,
+    chunksize: int | None = None,
+    schema=None,
+):
+    """
+    Same report as run_streaming_checks over the whole of path, reading
+    only the data appended since the state in state_path was saved.
+    Returns (report, rows_read).
+    """
+    options = {
+        "target": target,
+        "quantile_error": quantile_error,
+        "hll_precision": hll_precision,
+        "top_duplicates": top_duplicates,
+        "schema": schema,
+    }
+    path = os.path.abspath(path)
+    end = data_position(path)
+
+    state = load_state(state_path)
+    if (state is None or state["path"] != path or state["options"] != options
+            or not is_append_of(path, state["position"])):
+        state = {
+            "version": STATE_VERSION,
+            "path": path,
+            "options": options,
+            "position": None,
+            "checks": StreamingChecks(
+                target=target, quantile_error=quantile_error,
+                hll_precision=hll_precision, top_duplicates=top_duplicates
+            ),
+        }
+
+    checks = state["checks"]
+    rows_before = checks.rows
+    for chunk in iter_chunks_between(path, state["position"], end,
+                                     chunksize or DEFAULT_CHUNKSIZE, schema=schema):
+        checks.update(chunk)
+
+    state["position"] = end
+    report = checks.report()
+    save_state(state_path, state)
+    return report, checks.rows - rows_before
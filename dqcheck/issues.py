@@ -0,0 +1,186 @@
+# -----------------------------
+# ISSUE STORE
+# -----------------------------
+# Every check reports its findings as Issue objects collected in an
+# IssueStore.  An Issue keeps its type, subject column, severity and main
+# measure in __slots__, with anything rarer (fences, sketch error bounds,
+# top duplicates) in a small dict only when present, which is far
+# smaller than one dict per issue on tables with tens of thousands of
+# columns.  It still reads like the dict it replaces -- issue["issue"],
+# issue.get("column"), "missing_pct" in issue -- and to_dict() gives the
+# same keys in the same order, so report files do not change.
+#
+# The store keeps issues in the order they were added and indexes them
+# by column and by issue type as they arrive, so scoring looks up each
+# column's issues instead of scanning the whole list per column.
+
+# Per issue type: the key naming the column the issue is about (None
+# for dataset-level issues) and the key of its main measure.
+LAYOUT = {
+    "missing_values": ("column", "missing_pct"),
+    "duplicate_rows": (None, "duplicate_count"),
+    "constant_column": ("column", "unique_values"),
+    "outliers": ("column", "outlier_pct"),
+    "class_imbalance": ("target", "dominant_class_ratio"),
+    "high_cardinality": ("column", "unique_values"),
+}
+
+
+class Issue:
+    """One finding; behaves as a read-only mapping of its report fields."""
+
+    __slots__ = ("issue", "column", "severity", "value", "extra")
+
+    def __init__(self, issue, column=None, severity=None, value=None, extra=None):
+        self.issue = issue
+        self.column = column
+        self.severity = severity
+        self.value = value
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data):
+        """An Issue from its dict form (e.g. a report loaded from JSON)."""
+        if isinstance(data, Issue):
+            return data
+        data = dict(data)
+        issue = data.pop("issue", None)
+        column_key, measure = LAYOUT.get(issue, ("column", None))
+        column = data.pop(column_key, None) if column_key else None
+        value = data.pop(measure, None) if measure else None
+        severity = data.pop("severity", None)
+        return cls(issue, column, severity, value, data)
+
+    def to_dict(self) -> dict:
+        column_key, measure = LAYOUT.get(self.issue, ("column", None))
+        data = {}
+        if column_key == "column" and self.column is not None:
+            data["column"] = self.column
+        data["issue"] = self.issue
+        if column_key == "target":
+            data["target"] = self.column
+        if measure is not None:
+            data[measure] = self.value
+        if self.severity is not None:
+            data["severity"] = self.severity
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # ---------- MAPPING ACCESS ----------
+
+    def get(self, key, default=None):
+        column_key, measure = LAYOUT.get(self.issue, ("column", None))
+        if key == "issue":
+            return self.issue
+        if key == "severity":
+            return default if self.severity is None else self.severity
+        if key == column_key:
+            return default if self.column is None else self.column
+        if key == measure:
+            return self.value
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __eq__(self, other):
+        if isinstance(other, (Issue, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, Issue) else other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Issue({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (Issue, (self.issue, self.column, self.severity, self.value, self.extra))
+
+
+_MISSING = object()
+
+
+class IssueStore:
+    """Issues in report order, indexed by column and by issue type."""
+
+    __slots__ = ("_issues", "_by_column", "_by_type")
+
+    def __init__(self, issues=()):
+        self._issues = []
+        self._by_column = {}
+        self._by_type = {}
+        self.extend(issues)
+
+    @classmethod
+    def of(cls, issues):
+        """issues itself if it is a store, else a store built from it."""
+        return issues if isinstance(issues, IssueStore) else cls(issues)
+
+    def append(self, issue):
+        issue = Issue.from_dict(issue)
+        self._issues.append(issue)
+        self._by_type.setdefault(issue.issue, []).append(issue)
+        if issue.column is not None and LAYOUT.get(issue.issue, ("column",))[0] == "column":
+            self._by_column.setdefault(issue.column, []).append(issue)
+
+    def extend(self, issues):
+        for issue in issues:
+            self.append(issue)
+
+    def for_column(self, column) -> list:
+        """Issues about one column, in report order."""
+        return self._by_column.get(column, [])
+
+    def of_type(self, issue_type) -> list:
+        return self._by_type.get(issue_type, [])
+
+    def count(self, issue_type) -> int:
+        return len(self._by_type.get(issue_type, ()))
+
+    def without(self, issue_type) -> "IssueStore":
+        """A new store holding every issue not of issue_type."""
+        return IssueStore(issue for issue in self._issues if issue.issue != issue_type)
+
+    def to_list(self) -> list:
+        return [issue.to_dict() for issue in self._issues]
+
+    def __iter__(self):
+        return iter(self._issues)
+
+    def __len__(self):
+        return len(self._issues)
+
+    def __getitem__(self, index):
+        return self._issues[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (IssueStore, list)):
+            return list(self._issues) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"IssueStore({self._issues!r})"
+
+    def __reduce__(self):
+        return (IssueStore, (self._issues,))
+
@@ -0,0 +1,154 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from dqcheck import checks
+from dqcheck.duplicates import FingerprintCounter
+from dqcheck.profile import profile_dataframe
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+# -----------------------------
+# PARALLEL EXECUTION
+# -----------------------------
+# Per-column checks are sharded by column and duplicate detection by row
+# range across a process pool.  The DataFrame is written once to an
+# uncompressed Arrow IPC file (on /dev/shm when available) that every
+# worker memory-maps, so workers read only their own columns or rows
+# instead of receiving a pickled copy of the frame.  Without pyarrow, or
+# for columns Arrow cannot represent, each worker is sent just its shard.
+# Shards are addressed by column position, and each worker is also sent
+# the empty frame of its columns, whose labels and dtypes it restores:
+# Arrow stores labels as strings and reads an object column of ints back
+# as int64.
+
+SHARDS_PER_WORKER = 4
+
+
+def _shared_dir():
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _write_arrow(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_arrow(path, template, columns=None, rows=None):
+    # Buffers stay backed by the mapping; it is released with the table.
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if columns is not None:
+        table = table.select(list(range(*columns)))
+    if rows is not None:
+        table = table.slice(rows[0], rows[1] - rows[0])
+    df = table.to_pandas()
+    df.columns = template.columns
+    for i, dtype in enumerate(template.dtypes):
+        if dtype == object and df.dtypes.iloc[i] != object:
+            df.isetitem(i, df.iloc[:, i].astype(object))
+    return df
+
+
+def _load(source, template, columns=None, rows=None):
+    """
+    A worker's view of the data: a path to the shared file (read back as
+    `template`, the shard's empty frame) or the shard itself.
+    """
+    if isinstance(source, str):
+        return _read_arrow(source, template, columns=columns, rows=rows)
+    return source
+
+
+def _column_shard(source, template, columns, quantile_error, hll_precision):
+    df = _load(source, template, columns=columns)
+    profile = profile_dataframe(df, hll_precision=hll_precision).compute()
+    return {
+        "profiles": profile.columns,
+        "missing": checks.check_missing_values(df, profile=profile),
+        "constant": checks.check_constant_columns(df, profile=profile),
+        "outliers": checks.check_outliers_iqr(
+            df, profile=profile, quantile_error=quantile_error
+        ),
+        "cardinality": checks.check_high_cardinality(df, profile=profile),
+    }
+
+
+def _row_shard(source, template, rows):
+    return FingerprintCounter().update(_load(source, template, rows=rows))
+
+
+def _split(n, parts):
+    parts = max(1, min(parts, n))
+    step, extra = divmod(n, parts)
+    bounds = [0]
+    for i in range(parts):
+        bounds.append(bounds[-1] + step + (1 if i < extra else 0))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def run_sharded_checks(df: pd.DataFrame, workers: int, quantile_error=None,
+                       hll_precision=None, top_duplicates=0, duplicates=True, profile=None):
+    """
+    Structural and statistical issues for df, computed on `workers`
+    processes, in the same order run_all_checks produces them.  A
+    DatasetProfile passed as `profile` is filled with the shards' column
+    statistics.
+    """
+    column_shards = _split(df.shape[1], workers * SHARDS_PER_WORKER)
+    row_shards = _split(len(df), workers) if duplicates else []
+
+    with tempfile.TemporaryDirectory(prefix="dqcheck-", dir=_shared_dir()) as tmp:
+        shared = None
+        if pa is not None:
+            shared = os.path.join(tmp, "data.arrow")
+            try:
+                _write_arrow(df, shared)
+            except (ValueError, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                # ArrowInvalid is a ValueError, as is pandas' refusal of
+                # duplicate column labels.
+                shared = None
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            column_jobs = [
+                pool.submit(
+                    _column_shard, shared or df.iloc[:, a:b], df.iloc[:0, a:b],
+                    (a, b) if shared else None, quantile_error, hll_precision
+                )
+                for a, b in column_shards
+            ]
+            row_jobs = [
+                pool.submit(_row_shard, shared or df.iloc[a:b], df.iloc[:0],
+                            (a, b) if shared else None)
+                for a, b in row_shards
+            ]
+            column_results = [job.result() for job in column_jobs]
+            counters = [job.result() for job in row_jobs]
+
+    fingerprints = FingerprintCounter()
+    for counter in counters:
+        fingerprints.merge(counter)
+    dup_count, top = fingerprints.result(top=top_duplicates)
+
+    def gather(key):
+        return [issue for result in column_results for issue in result[key]]
+
+    if profile is not None:
+        for result in column_results:
+            profile.columns.update(result["profiles"])
+
+    issues = gather("missing")
+    dup = checks.duplicate_issue(dup_count, top_duplicates=top) if duplicates else None
+    if dup:
+        issues.append(dup)
+    issues.extend(gather("constant"))
+    issues.extend(gather("outliers"))
+    issues.extend(gather("cardinality"))
+    return issues
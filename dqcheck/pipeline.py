@@ -0,0 +1,112 @@
+import json
+import os
+
+from dqcheck import tracing
+from dqcheck.fixer import fix_missing_values, fix_outliers, fix_errors, fix_high_cardinality
+
+# -----------------------------
+# FIX PIPELINES
+# -----------------------------
+# A pipeline spec lists fix steps to run in order against one loaded
+# frame.  Steps hand the frame to the next one directly (fixers run with
+# copy=False), the change logs are combined, and the result is written
+# once.  Specs are JSON, or YAML when PyYAML is installed:
+#
+#     output: cleaned.csv
+#     target: label
+#     steps:
+#       - {issue: missing_values, method: median}
+#       - {issue: outliers, method: cap}
+#       - {issue: high_cardinality, method: group_rare, value: 20}
+
+METHODS = {
+    "missing_values": ["drop", "mean", "median", "mode", "constant"],
+    "outliers": ["cap", "remove", "log", "clip_percentile", "zscore"],
+    "errors": ["range_clip", "drop_invalid", "cast_type", "standardize_text",
+               "replace_map", "regex_clean"],
+    "high_cardinality": ["drop", "group_rare", "frequency_encode", "target_encode",
+                         "hashing", "hashing_sparse", "extract_features"],
+}
+
+STEP_KEYS = {"issue", "method", "value", "target", "quantile_error"}
+
+DEFAULT_OUTPUT = "cleaned_data.csv"
+DEFAULT_CHANGE_LOG = "change_log.json"
+
+
+def validate_step(step, position=None):
+    where = f"step {position}" if position is not None else "fix"
+    if not isinstance(step, dict):
+        raise ValueError(f"{where}: expected a mapping, got {step!r}")
+    unknown = set(step) - STEP_KEYS
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+    issue = step.get("issue")
+    if issue not in METHODS:
+        raise ValueError(f"{where}: unknown issue {issue!r} (expected one of {list(METHODS)})")
+    if step.get("method") not in METHODS[issue]:
+        raise ValueError(f"{where}: {issue} supports methods {METHODS[issue]}, "
+                         f"got {step.get('method')!r}")
+    return step
+
+
+def load_pipeline(path) -> dict:
+    """Read and validate a pipeline spec (.json, or .yaml/.yml with PyYAML)."""
+    with open(path) as f:
+        if os.path.splitext(str(path))[1].lower() in (".yaml", ".yml"):
+            # Imported here so that fix, which shares this module, never loads it
+            try:
+                import yaml
+            except ImportError:  # pragma: no cover - optional dependency
+                raise ImportError("YAML pipeline specs require PyYAML (pip install pyyaml)")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+
+    if not isinstance(spec, dict) or not isinstance(spec.get("steps"), list) or not spec["steps"]:
+        raise ValueError(f"{path}: a pipeline needs a non-empty 'steps' list")
+    for i, step in enumerate(spec["steps"], start=1):
+        validate_step(step, i)
+    spec.setdefault("output", DEFAULT_OUTPUT)
+    spec.setdefault("change_log", DEFAULT_CHANGE_LOG)
+    return spec
+
+
+def apply_step(df, step, target=None, profile=None, copy=True):
+    """Run one fix step; returns (cleaned_df, change_log)."""
+    issue, method, value = step["issue"], step["method"], step.get("value")
+    target = step.get("target", target)
+
+    if issue == "missing_values":
+        return fix_missing_values(df, method, value, profile=profile, copy=copy)
+    if issue == "outliers":
+        return fix_outliers(
+            df, method, value, quantile_error=step.get("quantile_error"),
+            profile=profile, copy=copy
+        )
+    if issue == "errors":
+        return fix_errors(df, method, value, copy=copy)
+    return fix_high_cardinality(df, method, value=value, target=target, copy=copy)
+
+
+def run_pipeline(df, steps, target=None, profile=None, profiler=None):
+    """
+    Apply steps in order to df, which is modified and should not be used
+    afterwards.  A profile (from the stats cache) describes df as loaded,
+    so only the first step may read from it.  Each step runs as a span
+    (see dqcheck.tracing).  Returns (cleaned_df, log) where log holds one
+    entry per step.
+    """
+    tracer = tracing.tracer_for(profiler)
+    change_log = []
+    for i, step in enumerate(steps, start=1):
+        with tracing.span(tracer, f"{i}. {step['issue']}.{step['method']}", kind="fix", df=df):
+            df, log = apply_step(df, step, target=target,
+                                 profile=profile if i == 1 else None, copy=False)
+        change_log.append({
+            "step": i,
+            "issue": step["issue"],
+            "method": step["method"],
+            "changes": log,
+        })
+    return df, change_log
@@ -0,0 +1,204 @@
+import pandas as pd
+import numpy as np
+
+from dqcheck.blanks import blank_mask, blank_values, can_hold_blanks
+from dqcheck.sketches import HyperLogLog, distinct_up_to_two, weighted_quantile
+
+try:
+    import pyarrow.types as pa_types
+except ImportError:  # pragma: no cover - optional dependency
+    pa_types = None
+
+# -----------------------------
+# COLUMN PROFILES
+# -----------------------------
+# One value_counts(dropna=False) per column is enough to answer every
+# per-column check: null and blank counts, distinct counts with and
+# without NaN, and (for numeric columns) exact quartiles and the number
+# of values outside the IQR fences.  Checks read from a DatasetProfile
+# instead of re-scanning the column.
+#
+# With hll_precision set, no per-column hash set is built at all: distinct
+# counts come from a HyperLogLog sketch, the NaN-inclusive distinct count
+# is only resolved up to 2 (all the constant-column check needs), and
+# quartiles are taken directly from the column.
+
+
+class ColumnProfile:
+    """Per-column statistics derived from a single value_counts pass."""
+
+    def __init__(self, series: pd.Series, numeric: bool, hll_precision=None):
+        self.name = series.name
+        self.rows = len(series)
+        self.numeric = numeric
+        self.object = pd.api.types.is_object_dtype(series)
+        self.distinct_sketch = None
+
+        if hll_precision:
+            self._profile_sketched(series, hll_precision)
+            return
+
+        counts = series.value_counts(dropna=False, sort=False)
+        # categoricals report unobserved categories with a zero count
+        counts = counts[counts > 0]
+        null_mask = counts.index.isna()
+
+        self.null_count = int(counts[null_mask].sum())
+        self.blank_count = 0
+        if can_hold_blanks(series):
+            present = counts[~null_mask]
+            self.blank_count = int(present[blank_values(present.index)].sum())
+
+        self.distinct_with_nan = int(len(counts))
+        self.distinct = int((~null_mask).sum())
+
+        self.q1 = self.q3 = np.nan
+        self.outlier_count = 0
+        if numeric:
+            present = counts[~null_mask].sort_index()
+            values = present.index.to_numpy(dtype="float64")
+            weights = present.to_numpy(dtype="int64")
+            self.q1 = weighted_quantile(values, weights, 0.25)
+            self.q3 = weighted_quantile(values, weights, 0.75)
+            lower, upper = self.fences()
+            self.outlier_count = int(weights[(values < lower) | (values > upper)].sum())
+
+    def _profile_sketched(self, series, hll_precision):
+        self.null_count = int(series.isnull().sum())
+        self.blank_count = int(blank_mask(series).sum())
+
+        self.distinct_with_nan = distinct_up_to_two(series)
+        self.distinct_sketch = HyperLogLog(hll_precision).update(series.dropna().to_numpy())
+        self.distinct = int(round(self.distinct_sketch.estimate()))
+
+        self.q1 = self.q3 = np.nan
+        self.outlier_count = 0
+        if self.numeric:
+            self.q1 = series.quantile(0.25)
+            self.q3 = series.quantile(0.75)
+            lower, upper = self.fences()
+            self.outlier_count = int(((series < lower) | (series > upper)).sum())
+
+    @property
+    def distinct_is_estimate(self):
+        return self.distinct_sketch is not None
+
+    @property
+    def iqr(self):
+        return self.q3 - self.q1
+
+    def fences(self):
+        return self.q1 - 1.5 * self.iqr, self.q3 + 1.5 * self.iqr
+
+    @property
+    def missing_pct(self):
+        if not self.rows:
+            return np.nan
+        return (self.null_count + self.blank_count) / self.rows * 100
+
+    @property
+    def outlier_pct(self):
+        if not self.rows:
+            return np.nan
+        return self.outlier_count / self.rows * 100
+
+    # ---------- SERIALIZATION ----------
+
+    FIELDS = ("rows", "numeric", "object", "null_count", "blank_count",
+              "distinct_with_nan", "distinct", "q1", "q3", "outlier_count")
+
+    def to_dict(self):
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["q1"], data["q3"] = float(self.q1), float(self.q3)
+        return data
+
+    @classmethod
+    def from_dict(cls, name, data):
+        """A profile restored from to_dict() (exact profiles only; sketches are not kept)."""
+        profile = cls.__new__(cls)
+        profile.name = name
+        profile.distinct_sketch = None
+        for field in cls.FIELDS:
+            setattr(profile, field, data[field])
+        return profile
+
+
+def profile_from_stats(name, rows, stats):
+    """
+    A ColumnProfile built from Parquet footer statistics alone, or None
+    when they cannot answer every per-column check.  That is the case for
+    all-null and single-valued columns of any non-string type, and for
+    bool and timestamp columns, which no check needs values for.  Float
+    columns are never answered from stats: NaN is neither a null nor
+    part of min/max in Parquet statistics.
+    """
+    if stats is None or stats["physical_type"] in ("FLOAT", "DOUBLE", "BYTE_ARRAY",
+                                                   "FIXED_LEN_BYTE_ARRAY"):
+        return None
+    arrow_type = stats["arrow_type"]
+    null_count = stats["null_count"]
+    all_null = null_count == rows
+    single = not all_null and stats["min"] == stats["max"]
+    if not (all_null or single or pa_types.is_boolean(arrow_type)
+            or pa_types.is_timestamp(arrow_type)):
+        return None
+
+    profile = ColumnProfile.__new__(ColumnProfile)
+    profile.name = name
+    profile.rows = rows
+    profile.numeric = pa_types.is_integer(arrow_type)
+    profile.object = False
+    profile.distinct_sketch = None
+    profile.null_count = null_count
+    profile.blank_count = 0
+    if all_null:
+        profile.distinct_with_nan = 1 if rows else 0
+    elif single:
+        profile.distinct_with_nan = 1 + (null_count > 0)
+    else:
+        profile.distinct_with_nan = 2
+    profile.distinct = 0 if all_null else 1 if single else 2
+    profile.q1 = profile.q3 = stats["min"] if single and profile.numeric else np.nan
+    profile.outlier_count = 0
+    return profile
+
+
+class DatasetProfile:
+    """
+    Lazily profiles columns of a DataFrame on first access and caches the
+    result, so a column is scanned once no matter how many checks read it.
+    """
+
+    def __init__(self, df: pd.DataFrame, hll_precision=None):
+        self.df = df
+        self.hll_precision = hll_precision
+        self.numeric_columns = set(df.select_dtypes(include=np.number).columns)
+        self.columns = {}
+
+    def __getitem__(self, col) -> ColumnProfile:
+        if col not in self.columns:
+            self.columns[col] = ColumnProfile(
+                self.df[col], col in self.numeric_columns, hll_precision=self.hll_precision
+            )
+        return self.columns[col]
+
+    def compute(self):
+        for col in self.df.columns:
+            self[col]
+        return self
+
+    def to_records(self):
+        """[name, stats] pairs for every profiled column, for the stats cache."""
+        return [[col, profile.to_dict()] for col, profile in self.columns.items()
+                if not profile.distinct_is_estimate]
+
+    def restore(self, records):
+        """Pre-fill columns from to_records() output; other columns still profile lazily."""
+        for col, data in records:
+            if col in self.df.columns:
+                self.columns[col] = ColumnProfile.from_dict(col, data)
+        return self
+
+
+def profile_dataframe(df: pd.DataFrame, hll_precision=None) -> DatasetProfile:
+    return DatasetProfile(df, hll_precision=hll_precision)
@@ -0,0 +1,458 @@
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+# -----------------------------
+# DATASET READERS
+# -----------------------------
+# CSV goes through pandas; Parquet and Feather / Arrow IPC go through
+# pyarrow.  Columnar files are opened as a ColumnarSource so a check can
+# read just the columns it needs and, for Parquet, consult the footer's
+# row-group statistics before touching any data pages.
+
+PARQUET_SUFFIXES = (".parquet", ".pq", ".parq")
+ARROW_SUFFIXES = (".feather", ".arrow", ".ipc")
+
+
+def detect_format(path) -> str:
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in ARROW_SUFFIXES:
+        return "arrow"
+    return "csv"
+
+
+def _require_pyarrow(fmt):
+    if pa is None:
+        raise ImportError(f"Reading {fmt} files requires pyarrow (pip install pyarrow)")
+
+
+def read_dataset(path, columns=None, engine=None, schema=None, compact=False) -> pd.DataFrame:
+    """
+    Load a dataset whatever its format.  For CSV, `engine`, `schema` and
+    `compact` select the typed ingestion path (see read_csv_typed).
+    """
+    fmt = detect_format(path)
+    if fmt == "csv":
+        if engine is None and schema is None and not compact:
+            return pd.read_csv(path, usecols=columns)
+        return read_csv_typed(path, columns=columns, engine=engine, schema=schema,
+                              compact=compact)
+    return open_columnar(path).read(columns)
+
+
+def iter_chunks(path, chunksize: int, columns=None, schema=None):
+    """DataFrame chunks of up to `chunksize` rows, whatever the format."""
+    fmt = detect_format(path)
+    if fmt == "csv":
+        dtype, parse_dates = _parse_args(load_schema(schema))
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns,
+                               dtype=dtype, parse_dates=parse_dates)
+        return
+    _require_pyarrow(fmt)
+    if fmt == "parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+    table = open_columnar(path).table
+    if columns is not None:
+        table = table.select(columns)
+    for batch in table.to_batches(max_chunksize=chunksize):
+        yield batch.to_pandas()
+
+
+def open_columnar(path):
+    fmt = detect_format(path)
+    _require_pyarrow(fmt)
+    if fmt == "parquet":
+        return ParquetSource(path)
+    if fmt == "arrow":
+        return ArrowSource(path)
+    raise ValueError(f"{path} is not a columnar file")
+
+
+class ArrowSource:
+    """Feather v2 / Arrow IPC file, memory-mapped; reading a column is zero-copy."""
+
+    def __init__(self, path):
+        self.path = path
+        self.table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        self.columns = self.table.column_names
+        self.num_rows = self.table.num_rows
+
+    def read(self, columns=None) -> pd.DataFrame:
+        table = self.table if columns is None else self.table.select(columns)
+        return table.to_pandas()
+
+    def read_column(self, col) -> pd.Series:
+        return self.read([col])[col]
+
+    def empty_frame(self, columns=None) -> pd.DataFrame:
+        table = self.table.schema.empty_table()
+        return (table if columns is None else table.select(columns)).to_pandas()
+
+    def arrow_type(self, col):
+        return self.table.schema.field(col).type
+
+    def column_stats(self, col):
+        # IPC files carry no statistics
+        return None
+
+
+class ParquetSource:
+    """Parquet file; columns are read individually and stats come from the footer."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = pq.ParquetFile(path)
+        self.columns = self.file.schema_arrow.names
+        self.num_rows = self.file.metadata.num_rows
+
+    def read(self, columns=None) -> pd.DataFrame:
+        return self.file.read(columns=columns).to_pandas()
+
+    def read_column(self, col) -> pd.Series:
+        return self.read([col])[col]
+
+    def empty_frame(self, columns=None) -> pd.DataFrame:
+        table = self.file.schema_arrow.empty_table()
+        return (table if columns is None else table.select(columns)).to_pandas()
+
+    def arrow_type(self, col):
+        return self.file.schema_arrow.field(col).type
+
+    def column_stats(self, col):
+        """
+        Footer statistics for a top-level column aggregated over all row
+        groups: {"null_count", "min", "max", "physical_type", "arrow_type"},
+        or None when any row group lacks them.
+        """
+        meta = self.file.metadata
+        leaf = None
+        for i in range(meta.num_columns):
+            if meta.schema.column(i).path == col:
+                leaf = i
+                break
+        if leaf is None:
+            return None
+
+        null_count, lo, hi = 0, None, None
+        physical_type = meta.schema.column(leaf).physical_type
+        for rg in range(meta.num_row_groups):
+            chunk = meta.row_group(rg).column(leaf)
+            stats = chunk.statistics
+            if stats is None or not stats.has_null_count:
+                return None
+            null_count += stats.null_count
+            if chunk.num_values == stats.null_count:
+                continue
+            if not stats.has_min_max:
+                return None
+            lo = stats.min if lo is None else min(lo, stats.min)
+            hi = stats.max if hi is None else max(hi, stats.max)
+        return {
+            "null_count": null_count,
+            "min": lo,
+            "max": hi,
+            "physical_type": physical_type,
+            "arrow_type": self.arrow_type(col),
+        }
+
+
+# -----------------------------
+# TYPED CSV INGESTION
+# -----------------------------
+# The default read_csv leaves every string column as Python objects and
+# every number as int64/float64.  The typed path can parse with pyarrow's
+# multithreaded CSV reader, takes explicit dtypes from a --schema file,
+# and with compact=True infers a schema from a sample of rows: low
+# cardinality strings become categoricals, other strings Arrow-backed
+# strings, and numeric columns are downcast after parsing wherever that
+# is lossless.
+
+SCHEMA_DTYPES = {
+    "int8", "int16", "int32", "int64", "uint8", "uint16", "uint32", "uint64",
+    "Int8", "Int16", "Int32", "Int64", "float32", "float64", "bool", "boolean",
+    "category", "string", "object", "datetime",
+}
+
+CATEGORY_MAX_UNIQUE = 1000
+CATEGORY_MAX_RATIO = 0.5
+
+
+def load_schema(schema):
+    """
+    A {column: dtype} mapping, or the contents of a JSON file holding one.
+    Allowed dtypes are listed in SCHEMA_DTYPES; "string" is Arrow-backed
+    when pyarrow is installed and "datetime" parses dates.
+    """
+    if schema is None or isinstance(schema, dict):
+        return schema
+    with open(schema) as f:
+        mapping = json.load(f)
+    unknown = {col: dtype for col, dtype in mapping.items() if dtype not in SCHEMA_DTYPES}
+    if unknown:
+        raise ValueError(f"Unsupported dtypes in schema {schema}: {unknown}")
+    return mapping
+
+
+def _string_dtype():
+    return "string[pyarrow]" if pa is not None else "string"
+
+
+def _parse_args(schema):
+    if not schema:
+        return None, None
+    dtype, parse_dates = {}, []
+    for col, kind in schema.items():
+        if kind == "datetime":
+            parse_dates.append(col)
+        elif kind == "string":
+            dtype[col] = _string_dtype()
+        else:
+            dtype[col] = kind
+    return dtype or None, parse_dates or None
+
+
+def infer_schema(path, sample_rows: int = 100_000, columns=None) -> dict:
+    """
+    Parse-time dtypes for string columns, inferred from the first
+    `sample_rows` rows.  Numeric columns are left to compact_frame, since
+    a sample cannot prove a narrower type holds for the whole file.
+    """
+    sample = pd.read_csv(path, nrows=sample_rows, usecols=columns)
+    schema = {}
+    for col in sample.select_dtypes(include="object").columns:
+        unique = sample[col].nunique()
+        if unique <= CATEGORY_MAX_UNIQUE and unique <= CATEGORY_MAX_RATIO * max(len(sample), 1):
+            schema[col] = "category"
+        else:
+            schema[col] = "string"
+    return schema
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast numeric columns in place of df where no value changes."""
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            kind = "unsigned" if len(series) and series.min() >= 0 else "integer"
+            df[col] = pd.to_numeric(series, downcast=kind)
+        elif pd.api.types.is_float_dtype(series) and series.dtype != "float32":
+            narrow = series.astype("float32")
+            if ((narrow.astype("float64") == series) | series.isna()).all():
+                df[col] = narrow
+    return df
+
+
+def read_csv_typed(path, columns=None, engine=None, schema=None, compact=False,
+                   sample_rows: int = 100_000) -> pd.DataFrame:
+    """
+    CSV load through the typed ingestion path.  engine is "c", "pyarrow"
+    or None/"auto" (pyarrow when installed).  Explicit schema entries win
+    over inferred ones.
+    """
+    if engine in (None, "auto"):
+        engine = "pyarrow" if pa is not None else "c"
+    if engine == "pyarrow":
+        _require_pyarrow("CSV with the pyarrow engine")
+
+    dtypes = infer_schema(path, sample_rows=sample_rows, columns=columns) if compact else {}
+    dtypes.update(load_schema(schema) or {})
+    dtype, parse_dates = _parse_args(dtypes)
+
+    df = pd.read_csv(path, usecols=columns, engine=engine, dtype=dtype, parse_dates=parse_dates)
+    return compact_frame(df) if compact else df
+
+
+# -----------------------------
+# APPEND TRACKING
+# -----------------------------
+# Incremental analysis needs to know where the data it has already seen
+# ends and to read only what was appended after that.  A position is a
+# byte offset for CSV and a row-group (Parquet) or record-batch (Arrow
+# IPC) count for columnar files, together with enough of a fingerprint
+# of the prefix to tell an append from a rewrite: the leading and
+# trailing bytes of a CSV file, and for columnar files the schema, the
+# row count and a digest of the leading and trailing bytes of every
+# row group / record batch already seen.
+
+PREFIX_PROBE = 1 << 16
+
+
+def _probe_digest(f, start, end):
+    f.seek(start)
+    return hashlib.blake2b(f.read(end - start), digest_size=16).hexdigest()
+
+
+def _row_group_span(row_group):
+    """Byte range [start, end) of a Parquet row group's column chunks."""
+    start, end = None, 0
+    for j in range(row_group.num_columns):
+        chunk = row_group.column(j)
+        first = chunk.data_page_offset
+        if chunk.has_dictionary_page and chunk.dictionary_page_offset:
+            first = min(first, chunk.dictionary_page_offset)
+        start = first if start is None else min(start, first)
+        end = max(end, first + chunk.total_compressed_size)
+    return start or 0, end
+
+
+def _columnar_layout(path, fmt):
+    """(row groups or record batches, arrow schema) of a columnar file."""
+    if fmt == "parquet":
+        parquet_file = pq.ParquetFile(path)
+        parts = parquet_file.metadata.num_row_groups
+        schema = parquet_file.schema_arrow
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+        parts = reader.num_record_batches
+        schema = reader.schema
+    return parts, schema
+
+
+def _parts_fingerprint(path, fmt, parts):
+    """(rows, digest) of the first `parts` row groups or record batches."""
+    digest = hashlib.blake2b(digest_size=16)
+    rows = 0
+    if fmt == "parquet":
+        meta = pq.ParquetFile(path).metadata
+        with open(path, "rb") as f:
+            for i in range(parts):
+                row_group = meta.row_group(i)
+                rows += row_group.num_rows
+                start, end = _row_group_span(row_group)
+                digest.update(_probe_digest(f, start, min(end, start + PREFIX_PROBE)).encode())
+                digest.update(_probe_digest(f, max(start, end - PREFIX_PROBE), end).encode())
+        return rows, digest.hexdigest()
+
+    reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+    for i in range(parts):
+        batch = reader.get_batch(i)
+        rows += batch.num_rows
+        for column in batch.columns:
+            for buf in column.buffers():
+                if buf is not None:
+                    digest.update(buf.slice(0, min(buf.size, PREFIX_PROBE)))
+                    digest.update(buf.slice(max(0, buf.size - PREFIX_PROBE)))
+    return rows, digest.hexdigest()
+
+
+def data_position(path) -> dict:
+    """Where the data in path currently ends."""
+    fmt = detect_format(path)
+    if fmt == "csv":
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            position = {
+                "format": fmt,
+                "offset": size,
+                "head": _probe_digest(f, 0, min(size, PREFIX_PROBE)),
+                "tail": _probe_digest(f, max(0, size - PREFIX_PROBE), size),
+            }
+            f.seek(max(0, size - 1))
+            # Appends can only be picked up after a complete line.
+            position["line_end"] = size == 0 or f.read(1) == b"\n"
+        return position
+
+    _require_pyarrow(fmt)
+    parts, schema = _columnar_layout(path, fmt)
+    rows, digest = _parts_fingerprint(path, fmt, parts)
+    return {
+        "format": fmt,
+        "parts": parts,
+        "rows": rows,
+        "digest": digest,
+        "schema": schema.to_string(),
+    }
+
+
+def is_append_of(path, position) -> bool:
+    """True when path still starts with the data `position` was taken from."""
+    fmt = detect_format(path)
+    if fmt != position["format"]:
+        return False
+    if fmt == "csv":
+        offset = position["offset"]
+        size = os.path.getsize(path)
+        if size < offset or (size > offset and not position["line_end"]):
+            return False
+        with open(path, "rb") as f:
+            return (
+                _probe_digest(f, 0, min(offset, PREFIX_PROBE)) == position["head"]
+                and _probe_digest(f, max(0, offset - PREFIX_PROBE), offset) == position["tail"]
+            )
+    _require_pyarrow(fmt)
+    parts, schema = _columnar_layout(path, fmt)
+    return (
+        schema.to_string() == position["schema"]
+        and parts >= position["parts"]
+        and _parts_fingerprint(path, fmt, position["parts"]) == (position["rows"],
+                                                                 position.get("digest"))
+    )
+
+
+class _Window(io.RawIOBase):
+    """Read-only view of bytes [start, end) of an open binary file."""
+
+    def __init__(self, f, start, end):
+        self.f = f
+        self.end = end
+        f.seek(start)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self.end - self.f.tell())
+        if n <= 0:
+            return 0
+        data = self.f.read(n)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def iter_chunks_between(path, start, end, chunksize: int, schema=None):
+    """
+    Chunks of the data between two positions from data_position(); a
+    start of None reads from the beginning.  Data appended after `end`
+    is not read, even if it arrives while reading.
+    """
+    fmt = end["format"]
+    if fmt == "csv":
+        dtype, parse_dates = _parse_args(load_schema(schema))
+        kwargs = dict(chunksize=chunksize, dtype=dtype, parse_dates=parse_dates)
+        if start is not None:
+            if start["offset"] == end["offset"]:
+                return
+            kwargs.update(header=None, names=list(pd.read_csv(path, nrows=0).columns))
+        with open(path, "rb") as f:
+            window = io.BufferedReader(_Window(f, start["offset"] if start else 0, end["offset"]))
+            yield from pd.read_csv(window, **kwargs)
+        return
+
+    first = start["parts"] if start else 0
+    if fmt == "parquet":
+        groups = list(range(first, end["parts"]))
+        if groups:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, row_groups=groups):
+                yield batch.to_pandas()
+        return
+    reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+    for i in range(first, end["parts"]):
+        batch = reader.get_batch(i)
+        for offset in range(0, batch.num_rows, chunksize):
+            yield batch.slice(offset, chunksize).to_pandas()
@@ -1,34 +1,33 @@
+import gzip
 import json
+from itertools import islice
 from pathlib import Path
-from jinja2 import Template
 
-def normalize_issue(issue: dict):
+from dqcheck.issues import Issue
+from dqcheck.serialize import write_json
+
+PCT_ISSUES = ("missing_values", "outliers", "class_imbalance")
+
+def normalize_issue(issue):
     """
     Normalize issue details for HTML rendering:
     - % for missing / outliers / imbalance
     - unique count for high cardinality
     """
+    issue = Issue.from_dict(issue)
     clean = {}
 
-    clean["issue"] = issue.get("issue")
+    clean["issue"] = issue.issue
     clean["column"] = issue.get("column")
-    clean["severity"] = issue.get("severity")
+    clean["severity"] = issue.severity
 
     # Handle high cardinality separately
-    if issue.get("issue") == "high_cardinality":
-        clean["pct"] = f'{issue.get("unique_values")} unique'
-
-    # Missing values
-    elif "missing_pct" in issue:
-        clean["pct"] = f'{round(issue["missing_pct"], 2)} %'
+    if issue.issue == "high_cardinality":
+        clean["pct"] = f'{issue.value} unique'
 
-    # Outliers
-    elif "outlier_pct" in issue:
-        clean["pct"] = f'{round(issue["outlier_pct"], 2)} %'
-
-    # Class imbalance
-    elif "dominant_class_ratio" in issue:
-        clean["pct"] = f'{round(issue["dominant_class_ratio"], 2)} %'
+    # Missing values, outliers and class imbalance (dominant class share)
+    elif issue.issue in PCT_ISSUES:
+        clean["pct"] = f'{round(issue.value, 2)} %'
 
     else:
         clean["pct"] = "-"
@@ -36,88 +35,221 @@ def normalize_issue(issue: dict):
     return clean
 
 
-
-
-def save_json_report(report: dict, output_path: str):
-    path = Path(output_path)
-    with open(path, "w") as f:
-        json.dump(report, f, indent=2)
-
-
-def save_html_report(report: dict, output_path: str):
-    html_template = """
-    <html>
-    <head>
-        <title>Data Quality Report</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; }
-            h1 { color: #2c3e50; }
-            .score { font-size: 22px; font-weight: bold; }
-            table { border-collapse: collapse; width: 100%; margin-top: 20px; }
-            th, td { border: 1px solid #ddd; padding: 8px; }
-            th { background-color: #f4f4f4; }
-            .high { color: red; }
-            .medium { color: orange; }
-            .low { color: green; }
-        </style>
-    </head>
-    <body>
-        <h1>Data Quality Report</h1>
-
-        <p><b>Rows:</b> {{ rows }} | <b>Columns:</b> {{ cols }}</p>
-
-        <p class="score">
-            Dataset Health Score: {{ dataset_score }} / 100
-        </p>
-
-        <h2>Column Quality Scores</h2>
-        <table>
-            <tr>
-                <th>Column</th>
-                <th>Score</th>
-            </tr>
-            {% for col, score in column_scores.items() %}
-            <tr>
-                <td>{{ col }}</td>
-                <td>{{ score }}</td>
-            </tr>
-            {% endfor %}
-        </table>
-
-        <h2>Detected Issues</h2>
-        <table>
-            <tr>
-                <th>Issue</th>
-                <th>Column</th>
-                <th>Severity</th>
-                <th>Impact</th>
-            </tr>
-            {% for issue in issues %}
-            <tr>
-                <td>{{ issue.issue }}</td>
-                <td>{{ issue.column if issue.column else '-' }}</td>
-                <td class="{{ issue.severity }}">{{ issue.severity }}</td>
-                <td>{{ issue.pct }}</td>
-            </tr>
-            {% endfor %}
-        </table>
-    </body>
-    </html>
+def save_json_report(report: dict, output_path: str, indent=2):
+    """Stream the report as JSON, one issue at a time (see dqcheck.serialize)."""
+    write_json(report, Path(output_path), indent=indent)
+
+
+# -----------------------------
+# HTML REPORT
+# -----------------------------
+# The template is compiled once per process and rendered with
+# generate(), so the page is written to the file piece by piece rather
+# than built as one string.  Column scores and issues are embedded as
+# compact JSON arrays and shown a page at a time by a few lines of
+# script (with a filter box), so a report on tens of thousands of
+# columns opens instantly; the first page is also rendered as plain HTML
+# for readers without script.  A .gz path (or gzip=True) writes the page
+# gzip-compressed.
+
+PAGE_SIZE = 100
+JSON_BATCH = 1000
+
+HTML_TEMPLATE = """
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Data Quality Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        h1 { color: #2c3e50; }
+        .score { font-size: 22px; font-weight: bold; }
+        table { border-collapse: collapse; width: 100%; margin-top: 20px; }
+        th, td { border: 1px solid #ddd; padding: 8px; }
+        th { background-color: #f4f4f4; }
+        .high { color: red; }
+        .medium { color: orange; }
+        .low { color: green; }
+        .pager { margin-top: 10px; }
+        .pager button { margin: 0 4px; }
+    </style>
+</head>
+<body>
+    <h1>Data Quality Report</h1>
+
+    <p><b>Rows:</b> {{ rows }} | <b>Columns:</b> {{ cols }}</p>
+
+    <p class="score">
+        Dataset Health Score: {{ dataset_score }} / 100
+    </p>
+
+    <h2>Column Quality Scores</h2>
+    <div class="pager" data-table="column-table" data-source="column-data">
+        <input type="search" placeholder="Filter columns">
+        <button data-step="-1">&lsaquo; Prev</button><span></span><button data-step="1">Next &rsaquo;</button>
+    </div>
+    <table id="column-table">
+        <thead>
+        <tr>
+            <th>Column</th>
+            <th>Score</th>
+        </tr>
+        </thead>
+        <tbody>
+        {% for col, score in first_columns %}
+        <tr>
+            <td>{{ col|e }}</td>
+            <td>{{ score }}</td>
+        </tr>
+        {% endfor %}
+        </tbody>
+    </table>
+    <script type="application/json" id="column-data">{% for chunk in column_data %}{{ chunk }}{% endfor %}</script>
+
+    <h2>Detected Issues</h2>
+    <div class="pager" data-table="issue-table" data-source="issue-data">
+        <input type="search" placeholder="Filter issues">
+        <button data-step="-1">&lsaquo; Prev</button><span></span><button data-step="1">Next &rsaquo;</button>
+    </div>
+    <table id="issue-table">
+        <thead>
+        <tr>
+            <th>Issue</th>
+            <th>Column</th>
+            <th>Severity</th>
+            <th>Impact</th>
+        </tr>
+        </thead>
+        <tbody>
+        {% for issue in first_issues %}
+        <tr>
+            <td>{{ issue.issue }}</td>
+            <td>{{ issue.column|e if issue.column is not none else '-' }}</td>
+            <td class="{{ issue.severity }}">{{ issue.severity }}</td>
+            <td>{{ issue.pct }}</td>
+        </tr>
+        {% endfor %}
+        </tbody>
+    </table>
+    <script type="application/json" id="issue-data">{% for chunk in issue_data %}{{ chunk }}{% endfor %}</script>
+
+    {% if performance %}
+    <h2>Performance</h2>
+    <table>
+        <tr>
+            <th>Step</th>
+            <th>Kind</th>
+            <th>Wall (s)</th>
+            <th>CPU (s)</th>
+            <th>Peak memory (MB)</th>
+            <th>Rows / s</th>
+            <th>Bytes scanned</th>
+        </tr>
+        {% for span in performance.spans %}
+        <tr>
+            <td>{{ '&nbsp;&nbsp;&nbsp;&nbsp;' if span.parent }}{{ span.name }}</td>
+            <td>{{ span.kind }}</td>
+            <td>{{ "%.4f"|format(span.wall_s) }}</td>
+            <td>{{ "%.4f"|format(span.cpu_s) }}</td>
+            <td>{{ "%.1f"|format(span.peak_memory_delta / 1048576) if span.peak_memory_delta is not none else '-' }}</td>
+            <td>{{ "{:,}".format(span.rows_per_sec) if span.rows_per_sec else '-' }}</td>
+            <td>{{ "{:,}".format(span.bytes_scanned) if span.bytes_scanned is not none else '-' }}</td>
+        </tr>
+        {% endfor %}
+    </table>
+    {% endif %}
+
+    <script>
+    // Rows are [cell, ...]; on issue rows the third cell is the severity.
+    document.querySelectorAll(".pager").forEach(function (pager) {
+        var rows = JSON.parse(document.getElementById(pager.dataset.source).textContent);
+        var body = document.querySelector("#" + pager.dataset.table + " tbody");
+        var label = pager.querySelector("span");
+        var shown = rows, page = 0, size = {{ page_size }};
+        function render() {
+            var pages = Math.max(1, Math.ceil(shown.length / size));
+            page = Math.min(Math.max(page, 0), pages - 1);
+            body.textContent = "";
+            shown.slice(page * size, (page + 1) * size).forEach(function (row) {
+                var tr = body.insertRow();
+                row.forEach(function (value, i) {
+                    var td = tr.insertCell();
+                    td.textContent = value === null ? "-" : value;
+                    if (row.length === 4 && i === 2) td.className = value;
+                });
+            });
+            label.textContent = " Page " + (page + 1) + " of " + pages + " (" + shown.length + " rows) ";
+        }
+        pager.querySelectorAll("button").forEach(function (button) {
+            button.onclick = function () { page += Number(button.dataset.step); render(); };
+        });
+        pager.querySelector("input").oninput = function () {
+            var needle = this.value.toLowerCase();
+            shown = rows.filter(function (row) {
+                return row.some(function (value) { return String(value).toLowerCase().indexOf(needle) >= 0; });
+            });
+            page = 0;
+            render();
+        };
+        render();
+    });
+    </script>
+</body>
+</html>
+"""
+
+_template = None
+
+
+def html_template():
+    """The compiled report template (compiled on first use)."""
+    global _template
+    if _template is None:
+        # jinja2 is only imported once an HTML report is actually written
+        from jinja2 import Template
+        _template = Template(HTML_TEMPLATE)
+    return _template
+
+
+def _json_rows(rows):
+    """A compact JSON array of rows, yielded in pieces, safe inside <script>."""
+    rows = iter(rows)
+    yield "["
+    sep = ""
+    while batch := list(islice(rows, JSON_BATCH)):
+        text = json.dumps(batch, separators=(",", ":"), default=str)[1:-1]
+        yield sep + text.replace("</", "<\\/")
+        sep = ","
+    yield "]"
+
+
+def _issue_row(issue):
+    clean = normalize_issue(issue)
+    return [clean["issue"], clean["column"], clean["severity"], clean["pct"]]
+
+
+def save_html_report(report: dict, output_path: str, gzip_output=None):
     """
+    Stream the HTML report to output_path; gzip-compressed when
+    gzip_output is set or, by default, when the path ends in .gz.
+    """
+    column_scores = report["scores"]["column_scores"]
+    issues = report["issues"]
 
-    template = Template(html_template)
-
-    clean_issues = [normalize_issue(i) for i in report["issues"]]
-
-    html = template.render(
+    html = html_template().generate(
         rows=report["dataset"]["rows"],
         cols=report["dataset"]["columns"],
         dataset_score=report["scores"]["dataset_score"],
-        column_scores=report["scores"]["column_scores"],
-        issues=clean_issues
+        first_columns=islice(column_scores.items(), PAGE_SIZE),
+        column_data=_json_rows([col, score] for col, score in column_scores.items()),
+        first_issues=(normalize_issue(i) for i in islice(issues, PAGE_SIZE)),
+        issue_data=_json_rows(_issue_row(i) for i in issues),
+        performance=report.get("performance"),
+        page_size=PAGE_SIZE,
     )
 
-
-    path = Path(output_path)
-    with open(path, "w") as f:
-        f.write(html)
+    if gzip_output is None:
+        gzip_output = str(output_path).endswith(".gz")
+    opener = gzip.open if gzip_output else open
+    with opener(Path(output_path), "wt", encoding="utf-8") as f:
+        f.writelines(html)
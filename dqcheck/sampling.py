@@ -0,0 +1,307 @@
+import math
+from statistics import NormalDist
+
+import pandas as pd
+import numpy as np
+
+from dqcheck import checks
+from dqcheck.analyzer import run_all_checks
+from dqcheck.profile import profile_dataframe
+from dqcheck.scoring import score_dataset
+
+# -----------------------------
+# SAMPLERS
+# -----------------------------
+# Both samplers make one pass over a stream of chunks.  Every row gets a
+# uniform random priority and a sampler keeps the rows with the smallest
+# priorities, which makes any prefix of its sample (in priority order) a
+# uniform random sample too.  Adaptive runs grow the sample along that
+# prefix without re-reading the data.
+#
+# The stratified sampler keeps one such reservoir, STRATA_OVERSAMPLE
+# times the sample size, rather than one per stratum: memory stays
+# bounded however many values the column has.  The rows of each stratum
+# in it are a uniform sample of that stratum, so the draw takes each
+# stratum's allocation from them; a stratum with too few rows leaves its
+# share to the next rows in priority order.
+
+STRATA_OVERSAMPLE = 2
+
+
+class ReservoirSampler:
+    """Uniform sample of up to `size` rows from a stream of chunks."""
+
+    def __init__(self, size: int, seed=None):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.rows = 0
+        self.keys = np.empty(0, dtype="float64")
+        self.sample = None
+
+    def update(self, chunk: pd.DataFrame, keys=None):
+        if keys is None:
+            keys = self.rng.random(len(chunk))
+        self.rows += len(chunk)
+        if len(self.keys) >= self.size:
+            # Only rows that beat the current worst priority can enter.
+            enter = keys < self.keys[-1]
+            chunk, keys = chunk[enter], keys[enter]
+        if len(chunk) == 0:
+            return self
+        merged = chunk if self.sample is None else pd.concat([self.sample, chunk])
+        keys = np.concatenate([self.keys, keys])
+        order = np.argsort(keys, kind="stable")[:self.size]
+        self.sample, self.keys = merged.iloc[order], keys[order]
+        return self
+
+    def draw(self, n=None) -> pd.DataFrame:
+        """The n highest-priority rows (all of them by default)."""
+        if self.sample is None:
+            return pd.DataFrame()
+        return self.sample.iloc[:n].reset_index(drop=True)
+
+
+class StratifiedSampler:
+    """
+    Proportionally allocated sample stratified by a column (usually the
+    target).  Stratum sizes are counted exactly over the whole stream, so
+    the class balance itself is known without sampling error.
+    """
+
+    def __init__(self, column: str, size: int, seed=None):
+        self.column = column
+        self.size = size
+        self.reservoir = ReservoirSampler(size * STRATA_OVERSAMPLE, seed)
+        self.class_counts = {}
+
+    @property
+    def rows(self):
+        return self.reservoir.rows
+
+    def update(self, chunk: pd.DataFrame):
+        for value, count in chunk[self.column].value_counts(dropna=False).items():
+            value = None if pd.isna(value) else value
+            self.class_counts[value] = self.class_counts.get(value, 0) + int(count)
+        self.reservoir.update(chunk)
+        return self
+
+    def counts(self) -> dict:
+        return dict(self.class_counts)
+
+    def allocate(self, n: int) -> dict:
+        """Largest-remainder proportional allocation of n rows to strata."""
+        if not self.rows:
+            return {}
+        shares = {value: n * count / self.rows for value, count in self.counts().items()}
+        alloc = {value: int(share) for value, share in shares.items()}
+        by_remainder = sorted(shares, key=lambda value: alloc[value] - shares[value])
+        for value in by_remainder[:n - sum(alloc.values())]:
+            alloc[value] += 1
+        return alloc
+
+    def _strata(self, sample):
+        """Positions of each stratum's rows in sample, in priority order."""
+        codes, uniques = pd.factorize(sample[self.column], use_na_sentinel=False)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        strata = {}
+        for positions in np.split(order, bounds):
+            value = uniques[codes[positions[0]]]
+            value = None if pd.isna(value) else value
+            if value in strata:
+                # NaN and None are one stratum
+                positions = np.sort(np.concatenate([strata[value], positions]))
+            strata[value] = positions
+        return strata
+
+    def draw(self, n=None) -> pd.DataFrame:
+        sample = self.reservoir.sample
+        if sample is None:
+            return pd.DataFrame()
+        n = min(n or self.size, self.size, self.rows)
+        strata = self._strata(sample)
+        taken = np.zeros(len(sample), dtype=bool)
+        for value, k in self.allocate(n).items():
+            if k and value in strata:
+                taken[strata[value][:k]] = True
+        short = n - int(taken.sum())
+        if short > 0:
+            taken[np.flatnonzero(~taken)[:short]] = True
+        return sample[taken].reset_index(drop=True)
+
+
+# -----------------------------
+# CONFIDENCE INTERVALS
+# -----------------------------
+# Proportions (missing, outlier and dominant-class shares) get Wilson
+# score intervals with a finite population correction, so a sample that
+# covers the whole dataset has zero width.  Outlier intervals treat the
+# sample's fences as fixed.  Scores only ever fall as missing and outlier
+# shares rise, so their bounds are the scores re-computed with every
+# share at the opposite end of its interval.
+
+
+def wilson_interval(successes, n, population, confidence=0.95):
+    """(low, high) bounds on a proportion, both in [0, 1]."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    fpc = (population - n) / (population - 1) if population > 1 else 0.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2) * math.sqrt(max(fpc, 0.0))
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def dominant_ratio(class_counts) -> float:
+    counts = [count for value, count in class_counts.items() if value is not None]
+    return max(counts) / sum(counts) if counts else np.nan
+
+
+def _pct(bounds):
+    return [round(bounds[0] * 100, 2), round(bounds[1] * 100, 2)]
+
+
+def _scores_at(df, issues, missing, outliers, end):
+    """Scores with every share set to one end (0 = low, 1 = high) of its interval."""
+    kept = [issue for issue in issues
+            if issue.get("issue") not in ("missing_values", "outliers", "class_imbalance")]
+    bounded = []
+    for col in df.columns:
+        if col in missing:
+            bounded.append(checks.missing_issue(col, missing[col][end]))
+        if col in outliers:
+            bounded.append(checks.outlier_issue(col, outliers[col][end]))
+    return score_dataset(df, [issue for issue in bounded if issue] + kept)
+
+
+def sample_intervals(sample, profile, issues, population, confidence=0.95,
+                     target=None, class_counts=None):
+    n = len(sample)
+
+    missing = {}
+    outliers = {}
+    for col in sample.columns:
+        column = profile[col]
+        missing[col] = _pct(wilson_interval(
+            column.null_count + column.blank_count, n, population, confidence
+        ))
+        # Same columns check_outliers_iqr looks at
+        if column.numeric and not (pd.isna(column.iqr) or column.iqr == 0):
+            outliers[col] = _pct(wilson_interval(column.outlier_count, n, population, confidence))
+
+    intervals = {"missing_pct": missing, "outlier_pct": outliers}
+
+    if target is not None and target in sample.columns:
+        if class_counts is not None:
+            # Stratified: the class balance was counted over every row.
+            ratio = dominant_ratio(class_counts)
+            intervals["dominant_class_ratio"] = _pct((ratio, ratio))
+        else:
+            counts = sample[target].value_counts()
+            if len(counts):
+                intervals["dominant_class_ratio"] = _pct(wilson_interval(
+                    counts.max(), counts.sum(), population, confidence
+                ))
+
+    best = _scores_at(sample, issues, missing, outliers, 0)
+    worst = _scores_at(sample, issues, missing, outliers, 1)
+    intervals["column_scores"] = {
+        col: [worst["column_scores"][col], best["column_scores"][col]]
+        for col in sample.columns
+    }
+    intervals["dataset_score"] = [worst["dataset_score"], best["dataset_score"]]
+    return intervals
+
+
+def max_width(intervals) -> float:
+    widths = [hi - lo for key in ("missing_pct", "outlier_pct", "column_scores")
+              for lo, hi in intervals[key].values()]
+    for key in ("dominant_class_ratio", "dataset_score"):
+        if key in intervals:
+            lo, hi = intervals[key]
+            widths.append(hi - lo)
+    return max(widths, default=0.0)
+
+
+# -----------------------------
+# SAMPLED ANALYSIS
+# -----------------------------
+
+ADAPTIVE_START = 1000
+
+
+def _sample_sizes(size, ci_width):
+    if ci_width is None:
+        return [size]
+    sizes = []
+    n = min(ADAPTIVE_START, size)
+    while n < size:
+        sizes.append(n)
+        n *= 2
+    return sizes + [size]
+
+
+def run_sampled_checks(
+    chunks,
+    size: int,
+    target: str | None = None,
+    stratify: bool = False,
+    confidence: float = 0.95,
+    ci_width: float | None = None,
+    seed=None,
+    quantile_error: float | None = None,
+    hll_precision: int | None = None,
+    top_duplicates: int = 0,
+):
+    """
+    run_all_checks on a random sample of up to `size` rows drawn in one
+    pass over `chunks`, plus confidence intervals under report["sample"].
+    With ci_width (in percentage / score points), the checks start on a
+    small prefix of the sample and double it until every interval is at
+    most that wide.  Duplicate and cardinality findings describe the
+    sample only.
+    """
+    if stratify and target is None:
+        raise ValueError("Stratified sampling needs a target column")
+    sampler = StratifiedSampler(target, size, seed) if stratify else ReservoirSampler(size, seed)
+    for chunk in chunks:
+        sampler.update(chunk)
+    if not sampler.rows:
+        raise ValueError("No data to analyze")
+    class_counts = sampler.counts() if stratify else None
+
+    for n in _sample_sizes(size, ci_width):
+        sample = sampler.draw(n)
+        profile = profile_dataframe(sample, hll_precision=hll_precision)
+        report = run_all_checks(
+            sample, target=target, quantile_error=quantile_error,
+            hll_precision=hll_precision, top_duplicates=top_duplicates, profile=profile
+        )
+        intervals = sample_intervals(
+            sample, profile, report["issues"], sampler.rows, confidence,
+            target=target, class_counts=class_counts
+        )
+        if ci_width is None or max_width(intervals) <= ci_width:
+            break
+
+    if class_counts is not None:
+        # Replace the sample's class balance with the exact one.
+        report["issues"] = report["issues"].without("class_imbalance")
+        imbalance = checks.imbalance_issue(target, dominant_ratio(class_counts))
+        if imbalance:
+            report["issues"].append(imbalance)
+
+    report["dataset"]["rows"] = sampler.rows
+    report["sample"] = {
+        "method": "stratified" if stratify else "reservoir",
+        "rows": len(sample),
+        "population_rows": sampler.rows,
+        "confidence": confidence,
+        "intervals": intervals,
+    }
+    if ci_width is not None:
+        report["sample"]["target_width"] = ci_width
+        report["sample"]["width"] = round(max_width(intervals), 2)
+    return report
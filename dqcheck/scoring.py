@@ -1,21 +1,22 @@
+from dqcheck.issues import IssueStore
+
+
 def score_column(column_name, issues):
     """
     Start with score 100 and deduct points based on issues.
     """
     score = 100
 
-    for issue in issues:
-        if issue.get("column") != column_name:
-            continue
-
-        if issue["issue"] == "missing_values":
-            score -= issue["missing_pct"] * 1.5
+    # Only this column's issues, looked up in the store's column index
+    for issue in IssueStore.of(issues).for_column(column_name):
+        if issue.issue == "missing_values":
+            score -= issue.value * 1.5
 
-        elif issue["issue"] == "constant_column":
+        elif issue.issue == "constant_column":
             score -= 50
 
-        elif issue["issue"] == "outliers":
-            score -= issue["outlier_pct"] * 1.0
+        elif issue.issue == "outliers":
+            score -= issue.value * 1.0
 
     return max(round(score, 2), 0)
 
@@ -25,6 +26,7 @@ def score_dataset(df, issues):
     Dataset score = average of column scores,
     penalized by dataset-level issues.
     """
+    issues = IssueStore.of(issues)
     column_scores = {}
 
     # Column-level scoring
@@ -35,13 +37,13 @@ def score_dataset(df, issues):
 
     # Dataset-level penalties
     for issue in issues:
-        if issue.get("issue") == "duplicate_rows":
+        if issue.issue == "duplicate_rows":
             dataset_score -= 5
 
-        elif issue.get("issue") == "class_imbalance":
+        elif issue.issue == "class_imbalance":
             dataset_score -= 15
 
-        elif issue.get("issue") == "high_cardinality":
+        elif issue.issue == "high_cardinality":
             dataset_score -= 5
 
     return {
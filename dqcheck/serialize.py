@@ -0,0 +1,281 @@
+import datetime
+import decimal
+import gzip
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+from dqcheck.issues import Issue, IssueStore
+
+# -----------------------------
+# TYPE-AWARE ENCODING
+# -----------------------------
+# Reports and change logs carry whatever the checks and fixers produced:
+# NumPy scalars and arrays, pandas timestamps and missing-value markers,
+# Issue objects and stores.  plain() turns each into the JSON value it
+# stands for, and is used as the default= hook of every JSON writer.
+
+
+def plain(obj):
+    """JSON-ready equivalent of obj (json default= hook)."""
+    if isinstance(obj, IssueStore):
+        return list(obj)
+    if isinstance(obj, Issue):
+        return obj.to_dict()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (pd.Timestamp, datetime.datetime, datetime.date)):
+        return None if obj is pd.NaT else obj.isoformat()
+    if isinstance(obj, pd.Timedelta):
+        return obj.isoformat()
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# -----------------------------
+# STREAMING JSON
+# -----------------------------
+# write_json() writes the top two levels of a report itself -- the
+# report's keys and the elements of each section, e.g. one issue at a
+# time -- and encodes everything below with the json module.  No string
+# of the whole document is ever built.  With indent=2 the bytes are
+# exactly those of json.dump(..., indent=2); with indent=None the output
+# is compact and every element is encoded by json's C encoder, which is
+# several times faster.
+
+STREAM_DEPTH = 2
+
+
+class _JsonStream:
+    def __init__(self, f, indent):
+        self.f = f
+        self.indent = indent
+        if indent is None:
+            self.encoder = json.JSONEncoder(separators=(",", ":"), default=plain)
+        else:
+            self.encoder = json.JSONEncoder(indent=indent, default=plain)
+
+    def _leaf(self, value, level):
+        text = self.encoder.encode(value)
+        if self.indent is not None and level:
+            text = text.replace("\n", "\n" + " " * (self.indent * level))
+        self.f.write(text)
+
+    def _key(self, key):
+        if isinstance(key, np.generic):
+            key = key.item()
+        if isinstance(key, str):
+            return self.encoder.encode(key)
+        if key is True or key is False or key is None:
+            return f'"{json.dumps(key)}"'
+        if isinstance(key, (int, float)):
+            return f'"{self.encoder.encode(key)}"'
+        raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+    def write(self, value, level=0):
+        if isinstance(value, (Issue, IssueStore)):
+            value = plain(value)
+        if level >= STREAM_DEPTH or not isinstance(value, (dict, list)) or not value:
+            self._leaf(value, level)
+            return
+
+        items = value.items() if isinstance(value, dict) else value
+        if self.indent is None:
+            open_sep, sep, close = "", ",", ""
+        else:
+            inner = "\n" + " " * (self.indent * (level + 1))
+            open_sep, sep, close = inner, "," + inner, "\n" + " " * (self.indent * level)
+        colon = ":" if self.indent is None else ": "
+
+        self.f.write("{" if isinstance(value, dict) else "[")
+        self.f.write(open_sep)
+        for i, item in enumerate(items):
+            if i:
+                self.f.write(sep)
+            if isinstance(value, dict):
+                key, item = item
+                self.f.write(self._key(key) + colon)
+            self.write(item, level + 1)
+        self.f.write(close)
+        self.f.write("}" if isinstance(value, dict) else "]")
+
+
+def _open_text(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_json(data, path_or_file, indent=2):
+    """Stream data (a report or change log) as JSON to a path (.gz compressed) or text file."""
+    if hasattr(path_or_file, "write"):
+        _JsonStream(path_or_file, indent).write(data)
+        return
+    with _open_text(path_or_file, "w") as f:
+        _JsonStream(f, indent).write(data)
+
+
+# -----------------------------
+# ARROW REPORTS
+# -----------------------------
+# The binary report is one Arrow IPC file holding a single table: a row
+# per issue and a row per column score, told apart by `kind`.  Issue
+# type, subject column, severity and main measure are real columns (so a
+# consumer can filter and aggregate without parsing anything); rarer
+# issue fields are a JSON string, and every other report section is
+# JSON in the schema metadata.  Measures are float64 with a flag marking
+# the ones that were integers (counts, untouched 100 scores), so a
+# loaded report writes the same JSON as the original.  Column names are
+# stored as strings.
+
+ARROW_SUFFIXES = (".arrow", ".ipc", ".feather")
+ARROW_MAGIC = b"ARROW1"
+METADATA_KEY = b"dqcheck.report"
+
+_schema = None
+
+
+def _arrow_schema():
+    global _schema
+    if _schema is None:
+        _schema = pa.schema([
+            ("kind", pa.dictionary(pa.int8(), pa.string())),
+            ("issue", pa.dictionary(pa.int8(), pa.string())),
+            ("column", pa.string()),
+            ("severity", pa.dictionary(pa.int8(), pa.string())),
+            ("value", pa.float64()),
+            ("integer", pa.bool_()),
+            ("extra", pa.string()),
+        ])
+    return _schema
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Arrow reports require pyarrow (pip install pyarrow)")
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def _is_int(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def write_arrow_report(report: dict, path, compression="zstd"):
+    _require_pyarrow()
+    issues = IssueStore.of(report.get("issues", []))
+    scores = report.get("scores", {})
+    column_scores = scores.get("column_scores", {})
+
+    kind = ["issue"] * len(issues) + ["column_score"] * len(column_scores)
+    values = [i.value for i in issues] + list(column_scores.values())
+    columns = {
+        "kind": kind,
+        "issue": [i.issue for i in issues] + [None] * len(column_scores),
+        "column": [_text(i.column) for i in issues] + [str(c) for c in column_scores],
+        "severity": [i.severity for i in issues] + [None] * len(column_scores),
+        "value": [None if v is None else float(v) for v in values],
+        "integer": [_is_int(v) for v in values],
+        "extra": [json.dumps(i.extra, default=plain) if i.extra else None for i in issues]
+                 + [None] * len(column_scores),
+    }
+    table = pa.table(columns, schema=_arrow_schema())
+
+    # Everything but the issues and column scores, in report order
+    rest = {key: value for key, value in report.items() if key != "issues"}
+    if "scores" in rest:
+        rest["scores"] = {k: v for k, v in scores.items() if k != "column_scores"}
+    meta = {"keys": list(report), "report": rest}
+    table = table.replace_schema_metadata(
+        {METADATA_KEY: json.dumps(meta, default=plain).encode()}
+    )
+
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(str(path), table.schema, options=options) as writer:
+        writer.write_table(table)
+
+
+def read_arrow_report(path) -> dict:
+    _require_pyarrow()
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        meta = json.loads(table.schema.metadata[METADATA_KEY])
+        data = table.to_pydict()
+
+    issues = IssueStore()
+    column_scores = {}
+    for kind, issue, column, severity, value, integer, extra in zip(
+        data["kind"], data["issue"], data["column"], data["severity"], data["value"],
+        data["integer"], data["extra"]
+    ):
+        if integer:
+            value = int(value)
+        if kind == "column_score":
+            column_scores[column] = value
+            continue
+        issues.append(Issue(issue, column, severity, value, json.loads(extra) if extra else None))
+
+    rest = meta["report"]
+    report = {}
+    for key in meta["keys"]:
+        if key == "issues":
+            report[key] = issues
+        elif key == "scores":
+            report[key] = dict(rest["scores"], column_scores=column_scores)
+        else:
+            report[key] = rest[key]
+    return report
+
+
+# -----------------------------
+# SAVE / LOAD
+# -----------------------------
+
+def report_format(path) -> str:
+    """"arrow" or "json", from the path's suffix."""
+    name = str(path).lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return "arrow" if os.path.splitext(name)[1] in ARROW_SUFFIXES else "json"
+
+
+def save_report(report: dict, path, indent=2):
+    """Write a report as JSON (.json, .json.gz) or Arrow (.arrow / .ipc / .feather)."""
+    if report_format(path) == "arrow":
+        write_arrow_report(report, path)
+    else:
+        write_json(report, path, indent=indent)
+
+
+def load_report(path) -> dict:
+    """
+    Read a report written by any dqcheck writer (JSON, gzip JSON or
+    Arrow, told apart by content) with its issues as an IssueStore.
+    """
+    with open(path, "rb") as f:
+        head = f.read(len(ARROW_MAGIC))
+    if head == ARROW_MAGIC:
+        return read_arrow_report(path)
+    opener = gzip.open if head[:2] == b"\x1f\x8b" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        report = json.load(f)
+    if isinstance(report, dict) and isinstance(report.get("issues"), list):
+        report["issues"] = IssueStore(report["issues"])
+    return report
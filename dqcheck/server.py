@@ -0,0 +1,602 @@
+import asyncio
+import hmac
+import io
+import json
+import os
+import signal
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# -----------------------------
+# ANALYSIS SERVER
+# -----------------------------
+# `dqcheck serve` answers analyze and fix jobs over local HTTP (TCP or a
+# Unix socket) so that many small files do not each pay for a new
+# interpreter and pandas import.  Jobs run on warm worker processes that
+# import everything a job needs when they start.  Each worker keeps the
+# frames it has loaded, with their column profiles and reports, in an
+# in-process cache keyed by path, size and mtime, so a fix after an
+# analyze of the same file (or a repeated analyze) neither re-reads nor
+# re-profiles it.  A path always goes to the same worker when that worker
+# is free, so those hits are likely.
+#
+# At most `workers` jobs run at once and at most `queue_size` more wait
+# for a worker; beyond that a job is refused with 503 and Retry-After, so
+# a burst of clients slows down instead of piling up unbounded work.
+#
+#     POST /analyze  {"path": "data.csv", "target": "label", "output": "r.json"}
+#     POST /fix      {"path": "data.csv", "issue": "outliers", "method": "cap",
+#                     "output": "clean.parquet"}
+#     GET  /status
+#
+# Responses are JSON; a job's report or change log is in its response.
+# Input paths are resolved by the server, so relative paths are relative
+# to the directory it was started in.  Everything a job writes (output,
+# save_fitted) must lie inside the server's output directory, and
+# relative write paths are taken relative to it.  This module itself
+# does not import pandas: only the workers do.
+#
+# The server is meant for local clients.  Jobs must be sent as
+# Content-Type: application/json, which a web page cannot do across
+# origins without a preflight, and on TCP the Host header must name the
+# address the server listens on (or a loopback name), which defeats DNS
+# rebinding.  With a token, every request must carry
+# "Authorization: Bearer <token>" instead of passing the Host check.
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_CACHE_BYTES = 512 * 2**20
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1 * 2**20
+READ_TIMEOUT = 30
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+           404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           415: "Unsupported Media Type", 421: "Misdirected Request",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+READ_OPTIONS = ("engine", "schema", "compact")
+ANALYZE_OPTIONS = ("target", "chunksize", "quantile_error", "hll_precision", "top_duplicates",
+                   "output") + READ_OPTIONS
+FIX_OPTIONS = ("issue", "method", "value", "target", "quantile_error", "output", "compression",
+               "save_fitted") + READ_OPTIONS
+WRITE_OPTIONS = ("output", "save_fitted")
+
+
+def _is_int(low, high=None):
+    def check(value):
+        return (isinstance(value, int) and not isinstance(value, bool) and value >= low
+                and (high is None or value <= high))
+    return check
+
+
+def _one_of(*choices):
+    return lambda value: value in choices
+
+
+def _is_str(value):
+    return isinstance(value, str)
+
+
+# Per job option: (check, what the check wants).  Options left out or
+# given as null take their defaults.
+OPTION_TYPES = {
+    "path": (_is_str, "a string"),
+    "target": (_is_str, "a string"),
+    "chunksize": (_is_int(1), "an integer >= 1"),
+    "quantile_error": (
+        lambda v: isinstance(v, (int, float)) and not isinstance(v, bool) and 0 < v < 1,
+        "a number between 0 and 1"
+    ),
+    "hll_precision": (_is_int(4, 18), "an integer from 4 to 18"),
+    "top_duplicates": (_is_int(0), "an integer >= 0"),
+    "output": (_is_str, "a string"),
+    "save_fitted": (_is_str, "a string"),
+    "engine": (_one_of("auto", "c", "pyarrow"), 'one of "auto", "c", "pyarrow"'),
+    "schema": (lambda v: isinstance(v, (str, dict)), "a path or a {column: dtype} object"),
+    "compact": (lambda v: isinstance(v, bool), "true or false"),
+    "issue": (
+        _one_of("missing_values", "outliers", "errors", "high_cardinality"),
+        'one of "missing_values", "outliers", "errors", "high_cardinality"'
+    ),
+    "method": (_is_str, "a string"),
+    "value": (lambda v: isinstance(v, (str, int, float)) and not isinstance(v, bool),
+              "a string or a number"),
+    "compression": (_one_of("none", "snappy", "gzip", "zstd", "lz4"),
+                    'one of "none", "snappy", "gzip", "zstd", "lz4"'),
+}
+
+
+class JobError(Exception):
+    """A job the server refuses or that failed; carries the HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -----------------------------
+# WORKER SIDE
+# -----------------------------
+
+class FrameCache:
+    """
+    Loaded frames with their profiles and reports, least recently used
+    first out once their in-memory size exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+
+    @staticmethod
+    def key(path, options):
+        st = os.stat(path)
+        read = tuple(str(options.get(name)) for name in READ_OPTIONS)
+        return (os.path.abspath(path), st.st_size, st.st_mtime_ns) + read
+
+    def peek(self, path, options):
+        """The cache entry for path as read with options, or None."""
+        key = self.key(path, options)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            entry["hits"] += 1
+        return entry
+
+    def get(self, path, options):
+        """The cache entry for path as read with options, loading it on a miss."""
+        from dqcheck.readers import read_dataset
+
+        entry = self.peek(path, options)
+        if entry is not None:
+            return entry
+
+        key = self.key(path, options)
+        df = read_dataset(path, engine=options.get("engine"), schema=options.get("schema"),
+                          compact=options.get("compact", False))
+        entry = {"df": df, "profiles": {}, "reports": {}, "hits": 0,
+                 "nbytes": int(df.memory_usage(index=True, deep=True).sum())}
+        # An older version of the same file is never asked for again.
+        for old in [k for k in self.entries if k[0] == key[0]]:
+            self._drop(old)
+        self.entries[key] = entry
+        self.nbytes += entry["nbytes"]
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            self._drop(next(iter(self.entries)))
+        return entry
+
+    def _drop(self, key):
+        self.nbytes -= self.entries.pop(key)["nbytes"]
+
+    @staticmethod
+    def profile(entry, hll_precision=None):
+        from dqcheck.profile import profile_dataframe
+
+        profiles = entry["profiles"]
+        if hll_precision not in profiles:
+            profiles[hll_precision] = profile_dataframe(entry["df"], hll_precision=hll_precision)
+        return profiles[hll_precision]
+
+
+_frames = None
+_stats_cache = None
+
+
+def _warm(cache_bytes, use_cache):
+    """Worker initializer: import what jobs use and set up the caches."""
+    global _frames, _stats_cache
+    # Ctrl-C reaches the whole process group; the server shuts workers down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import dqcheck.analyzer  # noqa: F401
+    import dqcheck.batch  # noqa: F401
+    import dqcheck.fitted  # noqa: F401
+    import dqcheck.pipeline  # noqa: F401
+    import dqcheck.writer  # noqa: F401
+    from dqcheck.cache import StatsCache
+    from dqcheck.report import html_template
+
+    html_template()
+    _frames = FrameCache(cache_bytes)
+    _stats_cache = None
+    if use_cache:
+        try:
+            _stats_cache = StatsCache()
+        except OSError:
+            pass
+
+
+def _ping():
+    return os.getpid()
+
+
+def _encode(data) -> bytes:
+    from dqcheck.serialize import write_json
+
+    buf = io.StringIO()
+    write_json(data, buf, indent=None)
+    return buf.getvalue().encode()
+
+
+def _save(report, output):
+    from dqcheck.report import save_html_report
+    from dqcheck.serialize import save_report
+
+    name = output.lower()
+    if name.endswith((".html", ".html.gz")):
+        save_html_report(report, output)
+    else:
+        save_report(report, output)
+
+
+def analyze_job(job) -> bytes:
+    from dqcheck.analyzer import run_all_checks
+    from dqcheck.batch import _run_checks, report_key
+    from dqcheck.cache import options_key
+    from dqcheck.readers import detect_format, load_schema
+
+    start = time.perf_counter()
+    path = job["path"]
+    key = report_key(job.get("target"), job.get("chunksize"), job.get("quantile_error"),
+                     job.get("hll_precision"), job.get("top_duplicates", 0), job.get("schema"))
+
+    if job.get("chunksize") or detect_format(path) != "csv":
+        # Streaming and columnar analysis never hold the whole frame.
+        results, cached = _run_checks(path, job, _stats_cache)
+        cached = "disk" if cached else False
+    else:
+        entry = _frames.peek(path, job)
+        results, cached = entry["reports"].get(key) if entry else None, "memory"
+        if results is None and _stats_cache is not None:
+            results, cached = _stats_cache.get(path, key), "disk"
+        if results is None:
+            entry = _frames.get(path, job)
+            hll_precision = job.get("hll_precision")
+            profile = FrameCache.profile(entry, hll_precision)
+            results, cached = run_all_checks(
+                entry["df"], target=job.get("target"), quantile_error=job.get("quantile_error"),
+                hll_precision=hll_precision, top_duplicates=job.get("top_duplicates", 0),
+                profile=profile
+            ), False
+            if _stats_cache is not None:
+                _stats_cache.put(path, key, results)
+                if not hll_precision:
+                    profiles = options_key("profiles", schema=load_schema(job.get("schema")))
+                    _stats_cache.put(path, profiles, profile.to_records())
+            entry["reports"][key] = results
+
+    if job.get("output"):
+        _save(results, job["output"])
+    return _encode({
+        "path": path,
+        "output": job.get("output"),
+        "cached": cached,
+        "worker": os.getpid(),
+        "seconds": round(time.perf_counter() - start, 6),
+        "dataset_score": results["scores"]["dataset_score"],
+        "report": results,
+    })
+
+
+def fix_job(job) -> bytes:
+    from dqcheck.cache import options_key
+    from dqcheck.fitted import FittedFixer
+    from dqcheck.pipeline import apply_step, validate_step
+    from dqcheck.readers import load_schema
+    from dqcheck.writer import check_compression, write_frame
+
+    start = time.perf_counter()
+    path = job["path"]
+    check_compression(job["output"], job.get("compression"))
+    step = validate_step({name: job[name] for name in ("issue", "method", "value", "quantile_error")
+                          if job.get(name) is not None})
+
+    entry = _frames.get(path, job)
+    df = entry["df"]
+    profile = entry["profiles"].get(None)
+    if profile is None:
+        profile = FrameCache.profile(entry)
+        records = None
+        if _stats_cache is not None:
+            records = _stats_cache.get(path, options_key("profiles",
+                                                         schema=load_schema(job.get("schema"))))
+        if records is not None:
+            profile.restore(records)
+
+    # Both copy, so the cached frame and its profile stay as loaded
+    if job.get("save_fitted"):
+        fitter, cleaned_df, log = FittedFixer.fit_transform(df, [step], target=job.get("target"),
+                                                            profile=profile)
+        fitter.save(job["save_fitted"])
+        log = log[0]["changes"]
+    else:
+        cleaned_df, log = apply_step(df, step, target=job.get("target"), profile=profile)
+    write_frame(cleaned_df, job["output"], compression=job.get("compression"))
+
+    return _encode({
+        "path": path,
+        "output": job["output"],
+        "rows": len(cleaned_df),
+        "cached": entry["hits"] > 0,
+        "worker": os.getpid(),
+        "seconds": round(time.perf_counter() - start, 6),
+        "changes": log,
+    })
+
+
+JOBS = {
+    "/analyze": (analyze_job, ANALYZE_OPTIONS, ()),
+    "/fix": (fix_job, FIX_OPTIONS, ("issue", "method", "output")),
+}
+
+
+# -----------------------------
+# SERVER SIDE
+# -----------------------------
+
+class WorkerPool:
+    """
+    Single-process executors, one per warm worker, so a job can be sent
+    to the worker whose cache already holds its file.
+    """
+
+    def __init__(self, workers, cache_bytes=DEFAULT_CACHE_BYTES, use_cache=True):
+        self.workers = workers
+        self.initargs = (cache_bytes, use_cache)
+        self.pools = [self._executor() for _ in range(workers)]
+        self.idle = list(range(workers))
+        self.available = asyncio.Condition()
+
+    def _executor(self):
+        return ProcessPoolExecutor(max_workers=1, initializer=_warm, initargs=self.initargs)
+
+    async def start(self):
+        """Start every worker and wait until all are warm."""
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(loop.run_in_executor(pool, _ping) for pool in self.pools))
+
+    async def run(self, fn, job):
+        """Run fn(job) on a free worker, preferring the one its path hashes to."""
+        preferred = zlib.crc32(job["path"].encode()) % self.workers
+        async with self.available:
+            await self.available.wait_for(lambda: self.idle)
+            worker = preferred if preferred in self.idle else self.idle[0]
+            self.idle.remove(worker)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pools[worker], fn, job)
+        except BrokenProcessPool:
+            # e.g. killed for running out of memory; replace it for the next job
+            self.pools[worker] = self._executor()
+            raise JobError(500, "worker process died while running the job")
+        finally:
+            async with self.available:
+                self.idle.append(worker)
+                self.available.notify()
+
+    def shutdown(self):
+        for pool in self.pools:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class AnalysisServer:
+    """
+    Jobs write only under output_dir.  allowed_hosts are the Host header
+    names accepted without a token (None: no Host check, for Unix
+    sockets); with a token every request must present it.
+    """
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                 cache_bytes=DEFAULT_CACHE_BYTES, use_cache=True, output_dir=".",
+                 token=None, allowed_hosts=LOOPBACK_HOSTS):
+        self.pool = WorkerPool(workers or os.cpu_count() or 1, cache_bytes, use_cache)
+        self.queue_size = queue_size
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = os.path.realpath(output_dir)
+        self.token = token
+        self.allowed_hosts = allowed_hosts
+        self.pending = 0
+        self.stats = {"completed": 0, "failed": 0, "rejected": 0}
+
+    def status(self) -> dict:
+        running = self.pool.workers - len(self.pool.idle)
+        return {
+            "workers": self.pool.workers,
+            "running": running,
+            "queued": self.pending - running,
+            "queue_size": self.queue_size,
+            **self.stats,
+        }
+
+    async def submit(self, route, job) -> bytes:
+        fn, allowed, required = JOBS[route]
+        job = self._validate(job, allowed, required)
+        if self.pending >= self.pool.workers + self.queue_size:
+            self.stats["rejected"] += 1
+            raise JobError(503, f"server busy: {self.pending} jobs running or queued")
+        self.pending += 1
+        try:
+            result = await self.pool.run(fn, job)
+        except JobError:
+            self.stats["failed"] += 1
+            raise
+        except FileNotFoundError as e:
+            self.stats["failed"] += 1
+            raise JobError(404, str(e))
+        except (ValueError, KeyError, TypeError) as e:
+            self.stats["failed"] += 1
+            raise JobError(400, f"{type(e).__name__}: {e}")
+        except Exception as e:
+            self.stats["failed"] += 1
+            raise JobError(500, f"{type(e).__name__}: {e}")
+        finally:
+            self.pending -= 1
+        self.stats["completed"] += 1
+        return result
+
+    def _validate(self, job, allowed, required):
+        if not isinstance(job, dict) or not isinstance(job.get("path"), str):
+            raise JobError(400, 'expected a JSON object with a "path" string')
+        unknown = set(job) - set(allowed) - {"path"}
+        if unknown:
+            raise JobError(400, f"unknown keys {sorted(unknown)}")
+        job = {name: value for name, value in job.items() if value is not None}
+        missing = [name for name in required if name not in job]
+        if missing:
+            raise JobError(400, f"missing keys {missing}")
+        for name, value in job.items():
+            check, wanted = OPTION_TYPES[name]
+            if not check(value):
+                raise JobError(400, f"{name} must be {wanted}, got {value!r}")
+
+        job["path"] = os.path.abspath(job["path"])
+        if not os.path.isfile(job["path"]):
+            raise JobError(404, f"no such file: {job['path']}")
+        if isinstance(job.get("schema"), str):
+            job["schema"] = os.path.abspath(job["schema"])
+        for name in WRITE_OPTIONS:
+            if name in job:
+                job[name] = self._write_path(name, job[name])
+        return job
+
+    def _write_path(self, name, path):
+        """path resolved against the output directory, which it must not leave."""
+        full = os.path.realpath(os.path.join(self.output_dir, path))
+        if os.path.commonpath([full, self.output_dir]) != self.output_dir or full == self.output_dir:
+            raise JobError(403, f"{name} must be a file inside the output directory "
+                                f"{self.output_dir}, got {path!r}")
+        return full
+
+    def _authorize(self, method, headers):
+        if self.token is not None:
+            scheme, _, presented = headers.get("authorization", "").partition(" ")
+            if scheme.lower() != "bearer" or not hmac.compare_digest(presented.strip(),
+                                                                      self.token):
+                raise JobError(401, "missing or wrong bearer token")
+        elif self.allowed_hosts is not None:
+            host = headers.get("host", "")
+            if _host_name(host) not in self.allowed_hosts:
+                raise JobError(421, f"unexpected Host header {host!r}")
+        if method == "POST":
+            media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            if media_type != "application/json":
+                raise JobError(415, "jobs must be sent as Content-Type: application/json")
+
+    # ---------- HTTP ----------
+
+    async def handle(self, reader, writer):
+        try:
+            method, route, headers, body = await asyncio.wait_for(_read_request(reader),
+                                                                  READ_TIMEOUT)
+            self._authorize(method, headers)
+            status, body = await self._dispatch(method, route, body)
+        except JobError as e:
+            status, body = e.status, _error(str(e))
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+
+        headers = [
+            f"HTTP/1.1 {status} {REASONS[status]}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _dispatch(self, method, route, body):
+        if route == "/status":
+            if method != "GET":
+                raise JobError(405, "use GET")
+            return 200, json.dumps(self.status()).encode()
+        if route not in JOBS:
+            raise JobError(404, f"no such endpoint: {route}")
+        if method != "POST":
+            raise JobError(405, "use POST")
+        try:
+            job = json.loads(body or b"null")
+        except ValueError:
+            raise JobError(400, "request body is not valid JSON")
+        return 200, await self.submit(route, job)
+
+
+async def _read_request(reader):
+    """(method, path, headers, body) of one HTTP/1.1 request."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise JobError(413, "request headers too large")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise JobError(400, "malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise JobError(400, "invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise JobError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], headers, body
+
+
+def _host_name(host) -> str:
+    """The name part of a Host header: "[::1]:8765" -> "::1", "localhost:8765" -> "localhost"."""
+    if host.startswith("["):
+        return host[1:].partition("]")[0].lower()
+    return host.partition(":")[0].lower()
+
+
+def _error(message) -> bytes:
+    return json.dumps({"error": message}).encode()
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, socket_path=None, workers=None,
+                queue_size=DEFAULT_QUEUE_SIZE, cache_bytes=DEFAULT_CACHE_BYTES, use_cache=True,
+                output_dir=".", token=None, on_ready=None):
+    """Run the server until SIGINT / SIGTERM; on_ready(address, server) is called once warm."""
+    # Browsers cannot reach a Unix socket, so there is no Host to check.
+    allowed_hosts = None if socket_path else LOOPBACK_HOSTS + (host.lower(),)
+    app = AnalysisServer(workers, queue_size, cache_bytes, use_cache, output_dir=output_dir,
+                         token=token, allowed_hosts=allowed_hosts)
+    try:
+        await app.pool.start()
+        if socket_path:
+            server = await asyncio.start_unix_server(app.handle, path=socket_path,
+                                                     limit=MAX_HEADER_BYTES)
+            address = socket_path
+        else:
+            server = await asyncio.start_server(app.handle, host, port, limit=MAX_HEADER_BYTES)
+            address = "http://{}:{}".format(*server.sockets[0].getsockname()[:2])
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        if on_ready is not None:
+            on_ready(address, app)
+        async with server:
+            await stop.wait()
+            server.close()
+            await server.wait_closed()
+    finally:
+        app.pool.shutdown()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
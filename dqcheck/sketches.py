@@ -0,0 +1,413 @@
+import math
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_array
+
+# -----------------------------
+# QUANTILE SKETCH
+# -----------------------------
+# A KLL-style sketch: a stack of compactors where level h holds items of
+# weight 2**h.  When a level overflows it is sorted and every other item
+# (random offset) is promoted to the next level.  Memory is O(k log(n/k))
+# and two sketches merge by concatenating their levels and compacting, so
+# sketches built on separate chunks, partitions or processes combine into
+# one with the same error guarantee.
+
+
+def k_for_error(error: float) -> int:
+    """
+    Compactor size giving the requested normalized rank error, using the
+    empirical fit published for the KLL sketch (~1.65% at k=200).
+    """
+    if not 0 < error < 1:
+        raise ValueError("quantile error must be between 0 and 1")
+    return max(8, int(math.ceil((2.296 / error) ** (1 / 0.9723))))
+
+
+class QuantileSketch:
+    """Mergeable approximate quantiles with a bounded rank error."""
+
+    DECAY = 2 / 3
+
+    def __init__(self, error: float = 0.01, seed: int = 0):
+        self.error = error
+        self.k = k_for_error(error)
+        self.levels = [np.empty(0, dtype="float64")]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+
+    # ---------- BUILDING ----------
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.DECAY ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.count += values.size
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def update_counts(self, values, counts):
+        """Add each of `values` `counts` times, e.g. from exact value counts."""
+        values = np.asarray(values, dtype="float64")
+        counts = np.asarray(counts, dtype="int64")
+        keep = ~np.isnan(values) & (counts > 0)
+        values, counts = values[keep], counts[keep]
+        if values.size == 0:
+            return self
+        self.count += int(counts.sum())
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        # A value seen n times is one item on each level h whose bit is
+        # set in n, since items on level h weigh 2**h.
+        level = 0
+        while counts.any():
+            if level == len(self.levels):
+                self.levels.append(np.empty(0, dtype="float64"))
+            self.levels[level] = np.concatenate([self.levels[level], values[counts & 1 == 1]])
+            counts = counts >> 1
+            level += 1
+        self._compress()
+        return self
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype="float64"))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self.capacity(level):
+                items = np.sort(items)
+                held = items[-1:] if items.size % 2 else items[:0]
+                pairs = items[:items.size - held.size]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.levels[level] = held
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype="float64"))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    # ---------- QUERIES ----------
+
+    def _weighted(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(items.size, 2 ** level, dtype="int64")
+            for level, items in enumerate(self.levels)
+        ])
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return np.nan
+        if q <= 0:
+            return float(self.min)
+        if q >= 1:
+            return float(self.max)
+        values, cum = self._weighted()
+        idx = np.searchsorted(cum, q * cum[-1], side="left")
+        return float(values[min(idx, values.size - 1)])
+
+    def rank(self, x: float, inclusive: bool = False) -> float:
+        """Estimated fraction of values < x (or <= x when inclusive)."""
+        if self.count == 0:
+            return np.nan
+        values, cum = self._weighted()
+        idx = np.searchsorted(values, x, side="right" if inclusive else "left")
+        return float(cum[idx - 1] / cum[-1]) if idx else 0.0
+
+    @property
+    def error_bound(self) -> float:
+        """Normalized rank error of quantile() and rank() answers."""
+        return self.error
+
+    def __len__(self):
+        return sum(items.size for items in self.levels)
+
+    # ---------- SERIALIZATION ----------
+
+    def to_dict(self):
+        return {
+            "error": self.error,
+            "count": int(self.count),
+            "min": float(self.min),
+            "max": float(self.max),
+            "levels": [items.tolist() for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data, seed: int = 0):
+        sketch = cls(error=data["error"], seed=seed)
+        sketch.count = data["count"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch.levels = [np.asarray(items, dtype="float64") for items in data["levels"]]
+        return sketch
+
+
+def weighted_quantile(values, counts, q):
+    """
+    Quantile of the multiset described by sorted `values` and `counts`,
+    matching Series.quantile(q) (numpy's "linear" method) bit for bit.
+    """
+    n = int(counts.sum())
+    if n == 0:
+        return np.nan
+    # numpy's "linear" method computes its virtual index literally as
+    # (n - 1) * q.  The general Hyndman & Fan form with alpha = beta = 1,
+    # n * q + (alpha + q * (1 - alpha - beta)) - 1, is equal in exact
+    # arithmetic but rounds differently; keep numpy's expression so the
+    # result matches to the bit.
+    # Series.quantile(q) calls np.percentile(q * 100), which divides by 100
+    # again; the round trip can move q by an ulp.
+    q = q * 100 / 100
+    virtual = (n - 1) * q
+    virtual = min(max(virtual, 0), n - 1)
+    lo = int(np.floor(virtual))
+    hi = min(lo + 1, n - 1)
+    gamma = virtual - lo
+    cum = np.cumsum(counts)
+    a = values[np.searchsorted(cum, lo, side="right")]
+    b = values[np.searchsorted(cum, hi, side="right")]
+    diff = b - a
+    if gamma >= 0.5:
+        return b - diff * (1 - gamma)
+    return a + diff * gamma
+
+
+def sketch_series(series, error: float) -> QuantileSketch:
+    return QuantileSketch(error=error).update(series.to_numpy(dtype="float64", na_value=np.nan))
+
+
+def sketch_fences(sketch: QuantileSketch):
+    """Approximate IQR fences from a sketch: (lower, upper, iqr)."""
+    q1 = sketch.quantile(0.25)
+    q3 = sketch.quantile(0.75)
+    iqr = q3 - q1
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr, iqr
+
+
+# -----------------------------
+# VALUE HASHING
+# -----------------------------
+# Stable 64-bit value hashes for row fingerprints and HyperLogLog.  The
+# same value must hash alike whatever dtype a chunk, file or shard
+# happened to be parsed as, and different values must not be merged:
+#
+#   - integers hash as int64, exactly, however large;
+#   - floats that are whole numbers within int64 range hash as that
+#     integer (so 3 and 3.0 agree, as they do in pandas), other floats
+#     as float64;
+#   - every missing value (None, NaN, NaT, pd.NA) hashes alike;
+#   - in object columns numbers hash as numbers, strings as strings, and
+#     any other value by its string form mixed with its type name, so
+#     "1" and 1 differ.
+
+_NA_HASH = hash_array(np.array([np.nan]))[0]
+# Keeps uint64 values above the int64 range apart from the negative
+# int64 values that share their bits.
+_UINT_SALT = np.uint64(0x9E3779B97F4A7C15)
+_INT64_LIMIT = 2.0**63
+
+
+def _hash_floats(values):
+    values = values.astype("float64", copy=False)
+    out = hash_array(values)
+    with np.errstate(invalid="ignore"):
+        whole = (np.floor(values) == values) & (np.abs(values) < _INT64_LIMIT)
+    if whole.any():
+        out[whole] = hash_array(values[whole].astype("int64"))
+    return out
+
+
+def _hash_numbers(values):
+    kind = values.dtype.kind
+    if kind == "f":
+        return _hash_floats(values)
+    if kind == "u":
+        out = hash_array(values.astype("int64"))
+        big = values > np.iinfo("int64").max
+        out[big] ^= _UINT_SALT
+        return out
+    return hash_array(values.astype("int64", copy=False))
+
+
+def _hash_objects(values, na):
+    # Strings (the common case) are hashed as such in one call.
+    out = hash_array(values, categorize=False)
+    if pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+        return out
+
+    ints, floats, other = [], [], []
+    for i, value in enumerate(values):
+        if na[i] or isinstance(value, str):
+            continue
+        if isinstance(value, (bool, int, np.bool_, np.integer)):
+            if -2**63 <= value < 2**63:
+                ints.append(i)
+                continue
+        elif isinstance(value, (float, np.floating)):
+            floats.append(i)
+            continue
+        other.append(i)
+    if ints:
+        out[ints] = hash_array(values[ints].astype("int64"))
+    if floats:
+        out[floats] = _hash_floats(values[floats].astype("float64"))
+    if other:
+        names = np.array([type(values[i]).__name__ for i in other], dtype=object)
+        out[other] ^= hash_array(names, categorize=False)
+    return out
+
+
+def hash_values(values) -> np.ndarray:
+    """Stable 64-bit hash per value (independent of PYTHONHASHSEED)."""
+    if isinstance(values, pd.Series):
+        values = values.array
+    dtype = getattr(values, "dtype", None)
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = np.asarray(values.codes)
+        out = hash_values(values.categories.to_numpy()).take(np.maximum(codes, 0))
+        out[codes < 0] = _NA_HASH
+        return out
+
+    na = np.asarray(pd.isna(values), dtype=bool)
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        target, fill = "int64", 0
+        if pd.api.types.is_unsigned_integer_dtype(dtype):
+            target = "uint64"
+        values = np.asarray(values.to_numpy(dtype=target, na_value=fill)
+                            if hasattr(values, "to_numpy") else values).astype(target)
+        out = _hash_numbers(values)
+    elif pd.api.types.is_float_dtype(dtype):
+        values = (values.to_numpy(dtype="float64", na_value=np.nan)
+                  if hasattr(values, "to_numpy") else np.asarray(values, dtype="float64"))
+        out = _hash_floats(values)
+    elif dtype is not None and dtype.kind in "mM":
+        out = hash_array(np.asarray(values))
+    else:
+        values = np.asarray(values, dtype=object)
+        out = _hash_objects(values, na)
+    out[na] = _NA_HASH
+    return out
+
+
+# -----------------------------
+# DISTINCT-COUNT SKETCH
+# -----------------------------
+# HyperLogLog over pandas' stable 64-bit value hashes.  2**precision
+# one-byte registers give a relative standard error of 1.04/sqrt(2**p);
+# merging two sketches is an element-wise max of their registers.
+
+
+def _bit_length(values):
+    """Vectorized int.bit_length() for uint64 arrays below 2**64."""
+    hi = (values >> np.uint64(32)).astype("float64")
+    lo = (values & np.uint64(0xFFFFFFFF)).astype("float64")
+    hi_len = np.frexp(hi)[1]
+    lo_len = np.frexp(lo)[1]
+    return np.where(hi > 0, 32 + hi_len, lo_len)
+
+
+class HyperLogLog:
+    """Mergeable distinct-count estimate with a configurable precision."""
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype="uint8")
+
+    def update_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype="uint64")
+        if hashes.size == 0:
+            return self
+        p = self.precision
+        idx = (hashes >> np.uint64(64 - p)).astype("int64")
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        rho = (64 - p) - _bit_length(rest) + 1
+        np.maximum.at(self.registers, idx, rho.astype("uint8"))
+        return self
+
+    def update(self, values):
+        return self.update_hashes(hash_values(values))
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype("int64")))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def to_dict(self):
+        return {"precision": self.precision, "registers": self.registers.tobytes().hex()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["precision"])
+        sketch.registers = np.frombuffer(bytes.fromhex(data["registers"]), dtype="uint8").copy()
+        return sketch
+
+
+def near_threshold(estimate: float, threshold: float, relative_error: float) -> bool:
+    """True when a sketch estimate is within 3 standard errors of threshold."""
+    return abs(estimate - threshold) <= 3 * relative_error * max(estimate, threshold)
+
+
+def distinct_up_to_two(series, block_size: int = 1 << 16) -> int:
+    """
+    0, 1 or 2 (meaning "two or more") distinct values, NaN counted as a
+    value.  Scans in blocks and stops at the first block that shows a
+    second value, so non-constant columns usually exit after one block.
+    """
+    if len(series) == 0:
+        return 0
+    values = series.to_numpy()
+    nulls = series.isnull().to_numpy()
+    first_null = bool(nulls[0])
+    first = values[0]
+    for start in range(0, len(values), block_size):
+        block_nulls = nulls[start:start + block_size]
+        if first_null:
+            if not block_nulls.all():
+                return 2
+            continue
+        if block_nulls.any():
+            return 2
+        if (values[start:start + block_size] != first).any():
+            return 2
+    return 1
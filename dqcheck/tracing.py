@@ -0,0 +1,226 @@
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# -----------------------------
+# SPANS
+# -----------------------------
+# run_all_checks, the fix commands and run_pipeline mark each check and
+# fix step as a span.  A Profiler records every span's wall time, process
+# CPU time, peak memory above the level at its start, rows/sec and the
+# in-memory bytes of the columns it reads (object columns counted by
+# their pointer arrays: sizing every string would cost as much as some
+# of the checks being measured).  Its report() becomes the
+# "performance" section of a report.
+#
+# Peak memory is the process's resident set high-water mark on Linux,
+# reset at every span boundary through /proc/self/clear_refs, which costs
+# nothing while the span runs and includes Arrow's allocations.
+# Elsewhere it falls back to tracemalloc, which only sees allocations
+# made through Python and numpy and slows allocation-heavy code (CSV
+# writing in particular) considerably.
+#
+# Span hooks receive the same spans as they start and end, for tracing
+# systems:
+#
+#     def hook(event, span):      # event is "start" or "end"
+#         ...
+#     add_span_hook(hook)
+#
+# With neither a Profiler nor a hook, spans are no-ops.
+
+_hooks = []
+
+
+def add_span_hook(hook):
+    """Call hook(event, span) for every span from now on; returns hook."""
+    _hooks.append(hook)
+    return hook
+
+
+def remove_span_hook(hook):
+    _hooks.remove(hook)
+
+
+def _emit(event, record):
+    for hook in list(_hooks):
+        hook(event, record)
+
+
+class _ResidentMemory:
+    """(current, peak) resident set size from /proc; reset() restarts the peak."""
+
+    name = "rss"
+
+    def __init__(self):
+        # Fails (OSError) where /proc or peak resetting is unavailable.
+        self.reset()
+        self.read()
+
+    def read(self):
+        with open("/proc/self/status") as f:
+            status = f.read()
+        rss = re.search(r"VmRSS:\s+(\d+) kB", status)
+        hwm = re.search(r"VmHWM:\s+(\d+) kB", status)
+        if not rss or not hwm:
+            raise OSError("no VmRSS / VmHWM in /proc/self/status")
+        return int(rss.group(1)) * 1024, int(hwm.group(1)) * 1024
+
+    def reset(self):
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+
+    def stop(self):
+        pass
+
+
+class _TracedMemory:
+    name = "tracemalloc"
+
+    def __init__(self):
+        self.owns = not tracemalloc.is_tracing()
+        if self.owns:
+            tracemalloc.start()
+
+    def read(self):
+        return tracemalloc.get_traced_memory()
+
+    def reset(self):
+        tracemalloc.reset_peak()
+
+    def stop(self):
+        if self.owns:
+            tracemalloc.stop()
+
+
+def _memory_meter():
+    try:
+        return _ResidentMemory()
+    except OSError:
+        return _TracedMemory()
+
+
+class Profiler:
+    """
+    Collects span measurements, with peak memory tracked from start() to
+    stop(); pass memory=False to record times only.
+    """
+
+    def __init__(self, memory=True, record=True):
+        self.memory = memory
+        self.record = record
+        self.spans = []
+        self._stack = []
+        self._column_bytes = {}
+        self._meter = None
+        self.memory_source = None
+
+    def start(self):
+        if self.memory and self._meter is None:
+            self._meter = _memory_meter()
+            self.memory_source = self._meter.name
+        return self
+
+    def stop(self):
+        if self._meter is not None:
+            self._meter.stop()
+            self._meter = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _bytes(self, df, columns):
+        """Shallow in-memory size of df[columns], memoized per column."""
+        total = 0
+        for col in df.columns if columns is None else columns:
+            key = (id(df), col)
+            if key not in self._column_bytes:
+                self._column_bytes[key] = int(df[col].memory_usage(index=False, deep=False))
+            total += self._column_bytes[key]
+        return total
+
+    @contextmanager
+    def span(self, name, kind="check", df=None, columns=None, rows=None, nbytes=None):
+        """
+        Measure the block as one span.  Rows and bytes scanned come from
+        df (restricted to columns) unless given; the yielded record may
+        also be updated inside the block, e.g. with rows once they are
+        known.
+        """
+        if df is not None:
+            rows = len(df) if rows is None else rows
+            if nbytes is None:
+                nbytes = self._bytes(df, columns) if self.record else None
+        record = {
+            "name": name,
+            "kind": kind,
+            "parent": self._stack[-1]["name"] if self._stack else None,
+            "rows": rows,
+            "bytes_scanned": nbytes,
+            "start": time.time(),
+        }
+        meter = self._meter
+        if meter is not None:
+            if self._stack:
+                # the outer span keeps the peak reached before this one started
+                parent = self._stack[-1]
+                parent["_peak"] = max(parent["_peak"], meter.read()[1])
+            meter.reset()
+            record["_base"] = record["_peak"] = meter.read()[0]
+        self._stack.append(record)
+        _emit("start", record)
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall, 6)
+            record["cpu_s"] = round(time.process_time() - cpu, 6)
+            self._stack.pop()
+            if meter is not None:
+                peak = max(record.pop("_peak"), meter.read()[1])
+                record["peak_memory_delta"] = peak - record.pop("_base")
+                if self._stack:
+                    self._stack[-1]["_peak"] = max(self._stack[-1]["_peak"], peak)
+            else:
+                record["peak_memory_delta"] = None
+            rows = record["rows"]
+            record["rows_per_sec"] = (
+                round(rows / record["wall_s"]) if rows is not None and record["wall_s"] else None
+            )
+            if self.record:
+                self.spans.append(record)
+            _emit("end", record)
+
+    def report(self) -> dict:
+        """The "performance" report section: every span, in the order they ended."""
+        top = [span for span in self.spans if span["parent"] is None]
+        return {
+            "memory": self.memory_source,
+            "total_wall_s": round(sum(span["wall_s"] for span in top), 6),
+            "total_cpu_s": round(sum(span["cpu_s"] for span in top), 6),
+            "spans": self.spans,
+        }
+
+
+def tracer_for(profiler=None):
+    """profiler itself, a time-only tracer if span hooks are registered, or None."""
+    if profiler is not None:
+        return profiler
+    if _hooks:
+        return Profiler(memory=False, record=False)
+    return None
+
+
+def span(tracer, name, kind="check", **measure):
+    """tracer.span(...), or a no-op when tracer is None."""
+    if tracer is None:
+        return nullcontext({})
+    return tracer.span(name, kind=kind, **measure)
@@ -0,0 +1,218 @@
+import gzip
+import os
+import queue
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+from dqcheck.readers import ARROW_SUFFIXES, PARQUET_SUFFIXES
+
+# -----------------------------
+# CHUNKED OUTPUT
+# -----------------------------
+# Cleaned data is written one chunk at a time instead of materializing a
+# whole output file from one frame: CSV (optionally gzip or zstd
+# compressed), Parquet (one row group per chunk) or Arrow IPC (one record
+# batch per chunk).  The format follows the output suffix.  Encoding and
+# compression run on a background thread fed through a small bounded
+# queue, so writing one chunk overlaps with producing the next while
+# never holding more than a couple of chunks in flight.
+
+DEFAULT_CHUNKSIZE = 100_000
+QUEUE_SIZE = 2
+
+CSV_COMPRESSION = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+# Codecs each output format can write.
+COMPRESSIONS = {
+    "csv": ("none", "gzip", "zstd"),
+    "parquet": ("none", "snappy", "gzip", "zstd", "lz4"),
+    "arrow": ("none", "lz4", "zstd"),
+}
+
+
+def output_format(path):
+    """(format, compression) implied by an output path."""
+    suffix = os.path.splitext(str(path).lower())[1]
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet", None
+    if suffix in ARROW_SUFFIXES:
+        return "arrow", None
+    if suffix in CSV_COMPRESSION:
+        return "csv", CSV_COMPRESSION[suffix]
+    return "csv", None
+
+
+def check_compression(path, compression):
+    """Raise ValueError unless the format of path can be written with compression."""
+    fmt, _ = output_format(path)
+    if compression is not None and compression not in COMPRESSIONS[fmt]:
+        raise ValueError(
+            f"{fmt} output supports {', '.join(COMPRESSIONS[fmt])} compression, not {compression}"
+        )
+
+
+def _require_pyarrow(what):
+    if pa is None:
+        raise ImportError(f"Writing {what} requires pyarrow (pip install pyarrow)")
+
+
+class _CsvSink:
+    def __init__(self, path, compression):
+        if compression == "gzip":
+            self.f = gzip.open(path, "wb")
+        elif compression == "zstd":
+            _require_pyarrow("zstd-compressed CSV")
+            self.f = pa.CompressedOutputStream(str(path), "zstd")
+        else:
+            self.f = open(path, "wb")
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.f, header=self.header, index=False, mode="wb")
+        self.header = False
+
+    def close(self):
+        self.f.close()
+
+
+class _ArrowSink:
+    """Parquet or Arrow IPC; the first chunk fixes the schema unless one is given."""
+
+    def __init__(self, path, fmt, compression, schema=None):
+        _require_pyarrow(f"{fmt} files")
+        self.path = str(path)
+        self.fmt = fmt
+        self.compression = compression
+        self.writer = None
+        self.schema = schema
+
+    def _open(self, schema):
+        self.schema = schema
+        if self.fmt == "parquet":
+            self.writer = pq.ParquetWriter(
+                self.path, schema, compression=self.compression or "snappy"
+            )
+        else:
+            codec = None if self.compression == "none" else self.compression
+            options = pa.ipc.IpcWriteOptions(compression=codec)
+            self.writer = pa.ipc.new_file(self.path, schema, options=options)
+
+    def write(self, df):
+        try:
+            table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(
+                f"Chunk does not match the output schema; "
+                f"pin column types with --schema ({e})"
+            ) from e
+        if self.writer is None:
+            self._open(table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class ChunkWriter:
+    """
+    Write DataFrame chunks to one output file.  Use as a context manager;
+    with background=True chunks are encoded on a writer thread, so a chunk
+    must not be modified after it has been passed to write().  A pyarrow
+    schema, if given, fixes the Parquet/Arrow column types instead of the
+    first chunk.
+    """
+
+    def __init__(self, path, compression=None, background=True, queue_size=QUEUE_SIZE,
+                 schema=None):
+        check_compression(path, compression)
+        fmt, implied = output_format(path)
+        self.path = path
+        self.format = fmt
+        if fmt == "csv":
+            compression = implied if compression is None else compression
+            self.sink = _CsvSink(path, None if compression == "none" else compression)
+        else:
+            self.sink = _ArrowSink(path, fmt, compression, schema=schema)
+        self.rows = 0
+        self.error = None
+        self.queue = None
+        self.thread = None
+        if background:
+            self.queue = queue.Queue(maxsize=queue_size)
+            self.thread = threading.Thread(target=self._drain, name="dqcheck-writer", daemon=True)
+            self.thread.start()
+
+    def _drain(self):
+        while True:
+            df = self.queue.get()
+            if df is None:
+                return
+            if self.error is None:
+                try:
+                    self.sink.write(df)
+                except BaseException as e:  # re-raised on the caller's thread
+                    self.error = e
+
+    def write(self, df: pd.DataFrame):
+        if self.error is not None:
+            raise self.error
+        self.rows += len(df)
+        if self.queue is None:
+            self.sink.write(df)
+        else:
+            self.queue.put(df)
+        return self
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self.sink.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # Already failing: stop the writer without masking the original error.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def write_chunks(chunks, path, compression=None, schema=None):
+    """Write an iterable of chunks to path; returns the number of rows written."""
+    with ChunkWriter(path, compression=compression, schema=schema) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.rows
+
+
+def write_frame(df: pd.DataFrame, path, compression=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Write a whole frame through ChunkWriter, chunksize rows at a time."""
+    schema = None
+    if output_format(path)[0] != "csv":
+        _require_pyarrow("Parquet/Arrow files")
+        # From the whole frame: a column that is all None in the first
+        # chunk must not fix its type as null for the rest.
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+    if len(df) == 0:
+        return write_chunks([df], path, compression=compression, schema=schema)
+    return write_chunks(
+        (df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize)),
+        path, compression=compression, schema=schema
+    )
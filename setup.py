@@ -7,9 +7,8 @@ setup(
     install_requires=[
         "pandas",
         "numpy",
-        "scipy",
-        "scikit-learn",
         "click",
+        "rich-click",
         "jinja2"
     ],
     entry_points={